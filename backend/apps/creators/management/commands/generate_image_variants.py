@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from apps.creators.models import CreatorProfile
+from apps.creators.services.image_service import CreatorImageService
+from apps.creators.tasks import generate_image_variants_task
+
+
+class Command(BaseCommand):
+    help = "Generate resized variants of creator images that have none yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queue", action="store_true", help="Queue Celery tasks instead of generating inline")
+
+    def handle(self, *args, **options):
+        generated = 0
+        for profile in CreatorProfile.objects.iterator():
+            for field in CreatorImageService.FIELDS:
+                if not getattr(profile, field) or profile.get_image_variants(field):
+                    continue
+                if options["queue"]:
+                    generate_image_variants_task.delay(profile.pk, field)
+                else:
+                    CreatorImageService.generate(profile.pk, field)
+                generated += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"Creator image variants {'queued' if options['queue'] else 'generated'}. Images={generated}"
+        ))
+
+# Usage
+# python manage.py generate_image_variants --queue
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from apps.creators.services.search_service import CreatorSearchService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the creator search index (search_text and search terms)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Profiles indexed per batch, default 1000")
+
+    def handle(self, *args, **options):
+        indexed = CreatorSearchService.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Creator search index rebuilt. Reindexed={indexed}"
+        ))
+
+# Usage
+# python manage.py rebuild_creator_search_index --batch-size 1000
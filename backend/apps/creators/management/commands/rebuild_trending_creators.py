@@ -0,0 +1,21 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.creators.services.trending_service import TrendingService
+
+
+class Command(BaseCommand):
+    help = "Rebuild trending creator scores from the CASH_IN ledger."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=10, help="Days of tips to replay, default 10")
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options["days"])
+        replayed = TrendingService.rebuild(since=since)
+        self.stdout.write(self.style.SUCCESS(
+            f"Trending creators rebuilt. Tips replayed={replayed}"
+        ))
+
+# Usage
+# python manage.py rebuild_trending_creators --days 10
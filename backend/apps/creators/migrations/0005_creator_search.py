@@ -0,0 +1,58 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+POSTGRES_INDEXES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS creators_profile_search_fts "
+    "ON creators_profile USING gin "
+    "(to_tsvector('simple'::regconfig, COALESCE(search_text, '')))",
+    "CREATE INDEX IF NOT EXISTS creators_profile_search_trgm "
+    "ON creators_profile USING gin (search_text gin_trgm_ops)",
+]
+
+
+def create_postgres_indexes(apps, schema_editor):
+    # Other databases search through CreatorSearchTerm instead
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for statement in POSTGRES_INDEXES:
+        schema_editor.execute(statement)
+
+
+def drop_postgres_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS creators_profile_search_fts")
+    schema_editor.execute("DROP INDEX IF EXISTS creators_profile_search_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creators', '0004_alter_creatorprofile_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='creatorprofile',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.CreateModel(
+            name='CreatorSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=50)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+                ('creator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='creators.creatorprofile')),
+            ],
+            options={
+                'db_table': 'creators_search_term',
+                'indexes': [models.Index(fields=['creator'], name='creators_se_creator_a4a0ab_idx')],
+                'constraints': [models.UniqueConstraint(fields=('term', 'creator'), name='unique_creator_search_term')],
+            },
+        ),
+        migrations.RunPython(create_postgres_indexes, drop_postgres_indexes),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 6.0.1 on 2026-10-18 14:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def count_creators(apps, schema_editor):
+    CreatorCategory = apps.get_model('creators', 'CreatorCategory')
+    for category in CreatorCategory.objects.all():
+        category.creators_count = category.creators.filter(
+            status='active', verified=True).count()
+        category.save(update_fields=['creators_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('creators', '0005_creator_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='creatorcategory',
+            name='creators_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        # The auto-created M2M table becomes an explicit model, unchanged
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='CreatorProfileCategory',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('creatorcategory', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='creators.creatorcategory')),
+                        ('creatorprofile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='creators.creatorprofile')),
+                    ],
+                    options={
+                        'db_table': 'creators_profile_categories',
+                        'unique_together': {('creatorprofile', 'creatorcategory')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='creatorprofile',
+                    name='categories',
+                    field=models.ManyToManyField(blank=True, related_name='creators', through='creators.CreatorProfileCategory', to='creators.creatorcategory'),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='creatorprofilecategory',
+            index=models.Index(fields=['creatorcategory', 'creatorprofile'], name='creators_pc_category_idx'),
+        ),
+        migrations.RunPython(count_creators, migrations.RunPython.noop),
+    ]
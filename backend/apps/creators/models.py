@@ -13,6 +13,8 @@ class CreatorCategory(models.Model):
     country_code = models.CharField(max_length=2, default="ZM")  # Zambia-first
     is_active = models.BooleanField(default=True)
     sort_order = models.PositiveIntegerField(default=100)
+    # Listed (active, verified) creators, maintained by signals
+    creators_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["sort_order", "name"]
@@ -56,7 +58,8 @@ class CreatorProfile(models.Model):
     categories = models.ManyToManyField(
         CreatorCategory,
         blank=True,
-        related_name="creators"
+        related_name="creators",
+        through='CreatorProfileCategory',
     )
     # Social media links
     x_profile = models.URLField(blank=True, validators=[URLValidator()], help_text='X (Twitter) profile URL')
@@ -65,7 +68,11 @@ class CreatorProfile(models.Model):
     tikTok_profile = models.URLField(blank=True, validators=[URLValidator()], help_text='TikTok profile URL')
     facebook_profile = models.URLField(blank=True, validators=[URLValidator()], help_text='Facebook profile URL')
     is_early_adopter = models.BooleanField(default=False, help_text='Flag for early adopters')
-   
+    # Username, names, categories and bio, maintained by the search index
+    search_text = models.TextField(blank=True, default='', editable=False)
+    # Resized copies of profile_image and cover_image, see CreatorImageService
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
+
 
     class Meta:
         db_table = 'creators_profile'
@@ -76,6 +83,31 @@ class CreatorProfile(models.Model):
     def __str__(self):
         return f"{self.user.get_full_name() or self.user.username} - Creator"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the post_save signal tell whether the listing changed
+        instance._loaded_listing = instance.listing_state()
+        return instance
+
+    def listing_state(self) -> dict:
+        """Loaded values of the fields deciding the creator's listing."""
+        return {
+            name: self.__dict__.get(name)
+            for name in ("status", "verified", "followers_count")
+        }
+
+    def get_image_variants(self, field) -> list:
+        """
+        Resized variants of an image field, or [] while they are missing or
+        were made from an earlier upload.
+        """
+        image = getattr(self, field)
+        entry = (self.image_variants or {}).get(field) or {}
+        if not image or entry.get("source") != image.name:
+            return []
+        return entry.get("variants", [])
+
     @property
     def is_verified(self):
         """Check if creator is verified."""
@@ -91,3 +123,51 @@ class CreatorProfile(models.Model):
         """Check if creator is banned."""
         return self.status == 'banned'
     
+
+
+class CreatorProfileCategory(models.Model):
+    """Membership of a creator in a category (the categories M2M table)."""
+
+    creatorprofile = models.ForeignKey(CreatorProfile, on_delete=models.CASCADE)
+    creatorcategory = models.ForeignKey(CreatorCategory, on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = 'creators_profile_categories'
+        unique_together = [('creatorprofile', 'creatorcategory')]
+        indexes = [
+            # Creators of a category, without touching the table
+            models.Index(
+                fields=['creatorcategory', 'creatorprofile'],
+                name='creators_pc_category_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.creatorprofile_id} in {self.creatorcategory_id}"
+
+
+class CreatorSearchTerm(models.Model):
+    """
+    Inverted index of creator search terms, used for search on databases
+    without PostgreSQL full-text and trigram support. One row per
+    (term, creator) with the weight of the best field the term occurs in.
+    """
+
+    term = models.CharField(max_length=50)
+    creator = models.ForeignKey(
+        CreatorProfile, on_delete=models.CASCADE, related_name='search_terms')
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        db_table = 'creators_search_term'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['term', 'creator'], name='unique_creator_search_term'
+            )
+        ]
+        indexes = [
+            models.Index(fields=['creator']),
+        ]
+
+    def __str__(self):
+        return f"{self.term} -> {self.creator_id}"
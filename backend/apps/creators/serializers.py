@@ -92,6 +92,40 @@ class UpdateCreatorProfileSerializer(serializers.ModelSerializer):
 
         return instance
 
+class ImageVariantsField(serializers.Field):
+    """
+    srcset strings per format of an image's resized variants, plus the
+    smallest JPEG as a fallback src. None until the variants are made.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        kwargs.update(source="*", read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, profile):
+        variants = profile.get_image_variants(self.image_field)
+        if not variants:
+            return None
+        storage = getattr(profile, self.image_field).storage
+        request = self.context.get("request")
+
+        def url(name):
+            url = storage.url(name)
+            return request.build_absolute_uri(url) if request else url
+
+        variants = sorted(variants, key=lambda variant: variant["width"])
+        srcsets = {}
+        for variant in variants:
+            srcsets.setdefault(variant["format"], []).append(
+                f'{url(variant["name"])} {variant["width"]}w')
+        data = {fmt: ", ".join(entries) for fmt, entries in srcsets.items()}
+        data["src"] = url(next(
+            variant["name"] for variant in variants
+            if variant["format"] == "jpeg"))
+        return data
+
+
 class CreatorCategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = CreatorCategory
@@ -105,6 +139,11 @@ class CreatorCategorySerializer(serializers.ModelSerializer):
         ]
 
 
+class CreatorCategoryBrowseSerializer(CreatorCategorySerializer):
+    class Meta(CreatorCategorySerializer.Meta):
+        fields = CreatorCategorySerializer.Meta.fields + ['creators_count']
+
+
 class CreatorPublicSerializer(serializers.ModelSerializer):
     """Serializer for public creator profile data."""
     user = UserSerializer(read_only=True)
@@ -113,6 +152,8 @@ class CreatorPublicSerializer(serializers.ModelSerializer):
     )
     profile_image = serializers.ImageField(max_length=None, use_url=True)
     cover_image = serializers.ImageField(max_length=None, use_url=True)
+    profile_image_variants = ImageVariantsField('profile_image')
+    cover_image_variants = ImageVariantsField('cover_image')
     categories = CreatorCategorySerializer(many=True, read_only=True)
 
     class Meta:
@@ -123,6 +164,8 @@ class CreatorPublicSerializer(serializers.ModelSerializer):
             'bio',
             'profile_image',
             'cover_image',
+            'profile_image_variants',
+            'cover_image_variants',
             'website',
             'followers_count',
             'rating',
@@ -145,6 +188,8 @@ class CreatorListSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     profile_image = serializers.ImageField(max_length=None, use_url=True)
     cover_image = serializers.ImageField(max_length=None, use_url=True)
+    profile_image_variants = ImageVariantsField('profile_image')
+    cover_image_variants = ImageVariantsField('cover_image')
     categories = CreatorCategorySerializer(many=True, read_only=True)
     class Meta:
         model = CreatorProfile
@@ -153,6 +198,8 @@ class CreatorListSerializer(serializers.ModelSerializer):
             'bio',
             'profile_image',
             'cover_image',
+            'profile_image_variants',
+            'cover_image_variants',
             'created_at',
             'updated_at',
             'categories',
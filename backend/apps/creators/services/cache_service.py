@@ -0,0 +1,191 @@
+"""
+Keyed cache for the public creator endpoints. Every cached response key
+embeds version counters, so a profile change only bumps the versions of
+that creator's profile and of the listing pages it was served on; the rest
+of the shared cache is left alone.
+"""
+import hashlib
+import logging
+import time
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class CreatorCacheService:
+    PROFILE_TTL = 60 * 10
+    LIST_TTL = 60 * 5
+    CATEGORIES_TTL = 60 * 60
+    NAMESPACES = ["profile", "list", "categories"]
+    KEY_PREFIX = "creators"
+    # Changes to these fields can move a creator in or out of the listing
+    # or reorder it
+    LISTING_FIELDS = ["status", "verified", "followers_count"]
+
+    @staticmethod
+    def _key(*parts) -> str:
+        return ":".join([CreatorCacheService.KEY_PREFIX, *map(str, parts)])
+
+    @staticmethod
+    def _versions(*names) -> list:
+        """Current values of the named version counters."""
+        keys = [CreatorCacheService._key("version", name) for name in names]
+        found = cache.get_many(keys)
+        versions = []
+        for key in keys:
+            if key not in found:
+                # Start from the clock so an evicted counter never
+                # resurrects entries cached under an old version
+                cache.add(key, time.time_ns(), timeout=None)
+                found[key] = cache.get(key)
+            versions.append(found[key])
+        return versions
+
+    @staticmethod
+    def _bump(name):
+        key = CreatorCacheService._key("version", name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+    @staticmethod
+    def _count(outcome, namespace):
+        key = CreatorCacheService._key("metrics", namespace, outcome)
+        try:
+            if not cache.add(key, 1, timeout=None):
+                cache.incr(key)
+        except Exception as e:
+            logger.warning(f"Could not record cache {outcome}: {e}")
+
+    @staticmethod
+    def profile_key(slug, host) -> str:
+        slug = slug.lower()
+        (version,) = CreatorCacheService._versions(f"profile:{slug}")
+        return CreatorCacheService._key("profile", slug, version, host)
+
+    @staticmethod
+    def page_id(url) -> str:
+        return hashlib.md5(url.encode()).hexdigest()
+
+    @staticmethod
+    def list_key(page_id) -> str:
+        listing, page = CreatorCacheService._versions(
+            "list", f"page:{page_id}")
+        return CreatorCacheService._key("list", page_id, f"{listing}.{page}")
+
+    @staticmethod
+    def get(key, namespace):
+        """
+        Cached response data, counting the hit or miss.
+        args:
+            key: key from profile_key or list_key
+            namespace: one of NAMESPACES
+        returns: the cached data, or None
+        """
+        data = cache.get(key)
+        CreatorCacheService._count("hits" if data is not None else "misses",
+                                   namespace)
+        return data
+
+    @staticmethod
+    def categories_key(country_code) -> str:
+        (version,) = CreatorCacheService._versions("categories")
+        return CreatorCacheService._key("categories", country_code, version)
+
+    @staticmethod
+    def set_profile(key, data):
+        cache.set(key, data, timeout=CreatorCacheService.PROFILE_TTL)
+
+    @staticmethod
+    def set_page(key, page_id, data, creator_ids):
+        """
+        Caches a listing page and records it as a page each of its
+        creators appears on.
+        """
+        cache.set(key, data, timeout=CreatorCacheService.LIST_TTL)
+        keys = {
+            creator_id: CreatorCacheService._key("pages", creator_id)
+            for creator_id in creator_ids
+        }
+        found = cache.get_many(list(keys.values()))
+        cache.set_many(
+            {
+                key: list(set(found.get(key, [])) | {page_id})
+                for key in keys.values()
+            },
+            timeout=CreatorCacheService.LIST_TTL,
+        )
+
+    @staticmethod
+    def set_categories(key, data):
+        cache.set(key, data, timeout=CreatorCacheService.CATEGORIES_TTL)
+
+    @staticmethod
+    def invalidate_profile(slug):
+        CreatorCacheService._bump(f"profile:{slug.lower()}")
+
+    @staticmethod
+    def invalidate_pages_of(creator_id):
+        """Bumps the listing pages the creator was served on."""
+        key = CreatorCacheService._key("pages", creator_id)
+        for page_id in cache.get(key, []):
+            CreatorCacheService._bump(f"page:{page_id}")
+        cache.delete(key)
+
+    @staticmethod
+    def invalidate_listing():
+        """Bumps every listing page, for changes that reorder the list."""
+        CreatorCacheService._bump("list")
+
+    @staticmethod
+    def invalidate_categories():
+        """Bumps the category browse pages, after counts or categories change."""
+        try:
+            CreatorCacheService._bump("categories")
+        except Exception as e:
+            logger.warning(f"Category cache invalidation failed: {e}")
+
+    @staticmethod
+    def is_listed(status, verified) -> bool:
+        return status == "active" and verified
+
+    @staticmethod
+    def invalidate_creator(profile, listing_changed=False):
+        """
+        Drops the cached responses showing a creator.
+        args:
+            profile: the changed CreatorProfile
+            listing_changed: whether the change can move the creator in,
+                out of or within the listing
+        """
+        try:
+            CreatorCacheService.invalidate_profile(profile.user.slug)
+            if listing_changed:
+                CreatorCacheService.invalidate_listing()
+            else:
+                CreatorCacheService.invalidate_pages_of(profile.pk)
+        except Exception as e:
+            # Entries expire on their own within the TTL
+            logger.warning(f"Creator cache invalidation failed: {e}")
+
+    @staticmethod
+    def metrics() -> dict:
+        keys = {
+            (namespace, outcome): CreatorCacheService._key(
+                "metrics", namespace, outcome)
+            for namespace in CreatorCacheService.NAMESPACES
+            for outcome in ("hits", "misses")
+        }
+        found = cache.get_many(list(keys.values()))
+        metrics = {}
+        for namespace in CreatorCacheService.NAMESPACES:
+            hits = found.get(keys[(namespace, "hits")], 0)
+            misses = found.get(keys[(namespace, "misses")], 0)
+            total = hits + misses
+            metrics[namespace] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / total, 4) if total else 0,
+            }
+        return metrics
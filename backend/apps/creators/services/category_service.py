@@ -0,0 +1,72 @@
+"""
+Category browsing. Each category keeps the number of listed creators in
+``creators_count``; signals recount only the categories touched by a
+membership or listing change, so the browse page is a single query and is
+cached until one of those changes.
+"""
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from apps.creators.models import CreatorCategory, CreatorProfileCategory
+from apps.creators.serializers import CreatorCategoryBrowseSerializer
+from apps.creators.services.cache_service import CreatorCacheService
+
+
+class CreatorCategoryService:
+    @staticmethod
+    def refresh_counts(category_ids) -> int:
+        """
+        Recounts the listed creators of the given categories, in one
+        UPDATE served by the (category, creator) index.
+        args:
+            category_ids: ids of the categories to recount
+        returns: the number of categories updated
+        """
+        category_ids = list(category_ids)
+        if not category_ids:
+            return 0
+        listed = (
+            CreatorProfileCategory.objects
+            .filter(
+                creatorcategory=OuterRef("pk"),
+                creatorprofile__status="active",
+                creatorprofile__verified=True,
+            )
+            .order_by()
+            .values("creatorcategory")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        updated = CreatorCategory.objects.filter(pk__in=category_ids).update(
+            creators_count=Coalesce(Subquery(listed), 0))
+        CreatorCacheService.invalidate_categories()
+        return updated
+
+    @staticmethod
+    def refresh_counts_of(profile) -> int:
+        """Recounts the categories a creator belongs to."""
+        return CreatorCategoryService.refresh_counts(
+            profile.categories.values_list("pk", flat=True))
+
+    @staticmethod
+    def browse(country_code=None) -> dict:
+        """
+        Active categories with their creator counts, featured first.
+        args:
+            country_code: optional ISO 3166-1 alpha-2 code to filter by
+        returns: dict with featured and others, lists of category dicts
+        """
+        country_code = (country_code or "").upper() or None
+        key = CreatorCacheService.categories_key(country_code or "all")
+        data = CreatorCacheService.get(key, "categories")
+        if data is not None:
+            return data
+
+        categories = CreatorCategory.objects.filter(is_active=True)
+        if country_code:
+            categories = categories.filter(country_code=country_code)
+        featured, others = [], []
+        for category in CreatorCategoryBrowseSerializer(categories, many=True).data:
+            (featured if category["is_featured"] else others).append(category)
+        data = {"featured": featured, "others": others}
+        CreatorCacheService.set_categories(key, data)
+        return data
@@ -0,0 +1,130 @@
+"""
+Resized variants of creator profile and cover images. Uploads are kept as
+they are; a Celery task writes WebP and JPEG copies at fixed widths, with
+the EXIF orientation applied and all metadata (GPS, camera) dropped, and
+records them in CreatorProfile.image_variants keyed by the upload they
+were made from.
+"""
+import hashlib
+import io
+import logging
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps
+from apps.creators.models import CreatorProfile
+
+logger = logging.getLogger(__name__)
+
+
+class CreatorImageService:
+    FIELDS = ["profile_image", "cover_image"]
+    # Avatar sizes on cards and the profile page, and banner widths
+    WIDTHS = {
+        "profile_image": [96, 192, 384],
+        "cover_image": [480, 960, 1600],
+    }
+    FORMATS = {
+        "webp": ("WEBP", {"quality": 80, "method": 4}),
+        "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+    }
+    UPLOAD_TO = "creator_variants"
+
+    @staticmethod
+    def _encode(image, fmt) -> bytes:
+        pil_format, options = CreatorImageService.FORMATS[fmt]
+        buffer = io.BytesIO()
+        # No exif/icc arguments, so no metadata is written
+        image.save(buffer, format=pil_format, **options)
+        return buffer.getvalue()
+
+    @staticmethod
+    def render(source, widths) -> list:
+        """
+        Resizes an image to each width, never upscaling.
+        args:
+            source: readable file of the uploaded image
+            widths: target widths in pixels
+        returns: list of (width, format, bytes)
+        """
+        with Image.open(source) as opened:
+            image = ImageOps.exif_transpose(opened)
+            image = image.convert("RGB")
+        sizes = sorted({min(width, image.width) for width in widths})
+        rendered = []
+        for width in sizes:
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize(
+                (width, height), Image.Resampling.LANCZOS)
+            for fmt in CreatorImageService.FORMATS:
+                rendered.append(
+                    (width, fmt, CreatorImageService._encode(resized, fmt)))
+        return rendered
+
+    @staticmethod
+    def _delete(storage, variants):
+        for variant in variants:
+            try:
+                storage.delete(variant["name"])
+            except Exception as e:
+                logger.warning(f"Could not delete image variant {variant['name']}: {e}")
+
+    @staticmethod
+    def generate(profile_id, field) -> list:
+        """
+        Writes the variants of one image of a creator and records them on
+        the profile, replacing those of the previous upload.
+        args:
+            profile_id: id of the CreatorProfile
+            field: "profile_image" or "cover_image"
+        returns: the recorded variants, [] if there is no image or it
+            changed while the variants were being made
+        """
+        if field not in CreatorImageService.FIELDS:
+            raise ValueError(f"Unknown image field: {field}")
+        profile = CreatorProfile.objects.get(pk=profile_id)
+        image = getattr(profile, field)
+        if not image:
+            return []
+
+        storage = image.storage
+        digest = hashlib.sha1(image.name.encode()).hexdigest()[:10]
+        with image.open("rb") as source:
+            rendered = CreatorImageService.render(
+                source, CreatorImageService.WIDTHS[field])
+        variants = []
+        for width, fmt, data in rendered:
+            name = storage.save(
+                f"{CreatorImageService.UPLOAD_TO}/{profile.pk}/"
+                f"{field}-{digest}-{width}.{fmt}",
+                ContentFile(data),
+            )
+            variants.append({
+                "name": name, "width": width, "format": fmt, "bytes": len(data),
+            })
+
+        with transaction.atomic():
+            profile = CreatorProfile.objects.select_for_update().get(pk=profile_id)
+            if getattr(profile, field).name != image.name:
+                # A newer upload has its own task
+                stale, variants = variants, []
+            else:
+                stale = (profile.image_variants or {}).get(field, {}).get(
+                    "variants", [])
+                profile.image_variants = {
+                    **(profile.image_variants or {}),
+                    field: {"source": image.name, "variants": variants},
+                }
+                # Saved through the model so the cached responses are dropped
+                profile.save(update_fields=["image_variants", "updated_at"])
+        transaction.on_commit(
+            lambda: CreatorImageService._delete(storage, stale))
+        return variants
+
+    @staticmethod
+    def schedule(profile, fields):
+        """Queues variant generation for the given image fields after commit."""
+        from apps.creators.tasks import generate_image_variants_task
+        for field in fields:
+            transaction.on_commit(
+                lambda field=field: generate_image_variants_task.delay(
+                    profile.pk, field))
@@ -0,0 +1,256 @@
+"""
+Creator search over username, full name, category names and bio.
+
+Each profile keeps those fields flattened into ``search_text``. On
+PostgreSQL, queries use full-text search (prefix matching) and trigram word
+similarity for typos; both are served by GIN indexes on that column. Other
+databases use the CreatorSearchTerm inverted index, which is kept in sync
+by signals and matches term prefixes. Results are ranked and paged with a
+(rank, id) cursor.
+"""
+import base64
+import re
+from django.db import connection, transaction
+from django.db.models import BooleanField, Count, FloatField, Q, Sum
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Coalesce
+from apps.creators.models import CreatorProfile, CreatorSearchTerm
+
+
+class CreatorSearchService:
+    NAME_WEIGHT = 4
+    CATEGORY_WEIGHT = 2
+    BIO_WEIGHT = 1
+    MIN_TERM_LENGTH = 2
+    MAX_TERM_LENGTH = 50
+    MAX_QUERY_TERMS = 8
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 50
+    TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+    @staticmethod
+    def tokenize(text) -> list:
+        """Lowercased word tokens of text, in order, without duplicates."""
+        terms = []
+        for token in CreatorSearchService.TOKEN_PATTERN.findall(text.lower()):
+            token = token[:CreatorSearchService.MAX_TERM_LENGTH]
+            if len(token) >= CreatorSearchService.MIN_TERM_LENGTH and (
+                token not in terms
+            ):
+                terms.append(token)
+        return terms
+
+    @staticmethod
+    def uses_postgres() -> bool:
+        return connection.vendor == "postgresql"
+
+    @staticmethod
+    def _fields(profile) -> list:
+        """(text, weight) pairs of the searchable fields of a profile."""
+        user = profile.user
+        categories = [category.name for category in profile.categories.all()]
+        return [
+            (" ".join([user.username, user.first_name, user.last_name]),
+             CreatorSearchService.NAME_WEIGHT),
+            (" ".join(categories), CreatorSearchService.CATEGORY_WEIGHT),
+            (profile.bio or "", CreatorSearchService.BIO_WEIGHT),
+        ]
+
+    @staticmethod
+    def _index_many(profiles) -> int:
+        """
+        Rewrites search_text (and the inverted index outside PostgreSQL)
+        of profiles whose searchable fields changed.
+        returns: the number of profiles reindexed
+        """
+        changed, terms = [], []
+        for profile in profiles:
+            fields = CreatorSearchService._fields(profile)
+            text = " ".join(
+                " ".join(value.lower().split()) for value, _ in fields)
+            if text == profile.search_text:
+                continue
+            profile.search_text = text
+            changed.append(profile)
+            weights = {}
+            for value, weight in fields:
+                for term in CreatorSearchService.tokenize(value):
+                    weights[term] = max(weights.get(term, 0), weight)
+            terms.extend(
+                CreatorSearchTerm(term=term, creator=profile, weight=weight)
+                for term, weight in weights.items()
+            )
+        if not changed:
+            return 0
+
+        with transaction.atomic():
+            CreatorProfile.objects.bulk_update(changed, ["search_text"])
+            if not CreatorSearchService.uses_postgres():
+                CreatorSearchTerm.objects.filter(creator__in=changed).delete()
+                CreatorSearchTerm.objects.bulk_create(terms, batch_size=1000)
+        return len(changed)
+
+    @staticmethod
+    def index_creator(profile) -> bool:
+        """
+        Brings a creator's search entry up to date.
+        args:
+            profile: the CreatorProfile to index
+        returns: whether anything changed
+        """
+        return CreatorSearchService._index_many([profile]) > 0
+
+    @staticmethod
+    def index_creators(profile_ids) -> int:
+        """Reindexes the creators with the given ids."""
+        profiles = (
+            CreatorProfile.objects.filter(pk__in=profile_ids)
+            .select_related("user").prefetch_related("categories")
+        )
+        return CreatorSearchService._index_many(profiles)
+
+    @staticmethod
+    def rebuild(batch_size=1000) -> int:
+        """
+        Reindexes every creator, batch_size profiles at a time.
+        returns: the number of profiles reindexed
+        """
+        indexed = 0
+        ids = list(CreatorProfile.objects.order_by("pk").values_list(
+            "pk", flat=True))
+        for start in range(0, len(ids), batch_size):
+            indexed += CreatorSearchService.index_creators(
+                ids[start:start + batch_size])
+        return indexed
+
+    @staticmethod
+    def encode_cursor(rank, pk) -> str:
+        raw = f"{float(rank)!r}|{pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        returns: (rank, pk)
+        raises: ValueError for a malformed cursor
+        """
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            rank, pk = raw.split("|")
+            return float(rank), int(pk)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    def _ranked_postgres(listed, terms):
+        from django.contrib.postgres.search import (
+            SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity)
+        # Matches the expression of the creators_profile_search_fts index
+        vector = SearchVector("search_text", config="simple")
+        prefixes = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            config="simple", search_type="raw",
+        )
+        text = " ".join(terms)
+        similar = RawSQL(
+            "%s <%% creators_profile.search_text", (text,),
+            output_field=BooleanField(),
+        )
+        return (
+            CreatorProfile.objects.filter(**listed)
+            .annotate(document=vector)
+            .filter(Q(document=prefixes) | similar)
+            .annotate(rank=Cast(
+                SearchRank(vector, prefixes)
+                + TrigramWordSimilarity(text, "search_text"),
+                FloatField(),
+            ))
+        )
+
+    @staticmethod
+    def _ranked_index(listed, terms):
+        matches = []
+        for term in terms:
+            matches.append(Q(
+                term__gte=term, term__lt=term + "\uffff"))
+        any_match = matches[0]
+        for match in matches[1:]:
+            any_match |= match
+        per_term = {
+            f"matched_{i}": Count("pk", filter=match)
+            for i, match in enumerate(matches)
+        }
+        # Grouped by creator alone and joined to the profile, so the term
+        # index drives the scan. Prefix matches score the field weight,
+        # whole words twice that
+        return (
+            CreatorSearchTerm.objects
+            .filter(any_match, **{
+                f"creator__{lookup}": value for lookup, value in listed.items()
+            })
+            .values("creator")
+            .annotate(**per_term)
+            .filter(**{f"{name}__gt": 0 for name in per_term})
+            .annotate(rank=Cast(
+                Sum("weight")
+                + Coalesce(Sum("weight", filter=Q(term__in=terms)), 0),
+                FloatField(),
+            ))
+        )
+
+    @staticmethod
+    def search(query, categories=None, cursor=None, limit=None) -> dict:
+        """
+        Ranked search over active, verified creators.
+        args:
+            query: free text; every word must match a word prefix
+            categories: optional category slugs, any of which must match
+            cursor: value of ``next`` from the previous page
+            limit: page size, capped at MAX_LIMIT
+        returns: dict with results (CreatorProfiles) and next (cursor)
+        raises: ValueError for a malformed cursor
+        """
+        limit = min(
+            limit or CreatorSearchService.DEFAULT_LIMIT,
+            CreatorSearchService.MAX_LIMIT,
+        )
+        terms = CreatorSearchService.tokenize(query or "")[
+            :CreatorSearchService.MAX_QUERY_TERMS]
+        if not terms:
+            return {"results": [], "next": None}
+
+        listed = {"status": "active", "verified": True}
+        if categories:
+            listed["pk__in"] = CreatorProfile.objects.filter(
+                categories__slug__in=categories).values("pk")
+        if CreatorSearchService.uses_postgres():
+            ranked = CreatorSearchService._ranked_postgres(listed, terms)
+            key = "pk"
+        else:
+            ranked = CreatorSearchService._ranked_index(listed, terms)
+            key = "creator"
+
+        if cursor:
+            rank, pk = CreatorSearchService.decode_cursor(cursor)
+            ranked = ranked.filter(
+                Q(rank__lt=rank) | Q(rank=rank, **{f"{key}__gt": pk}))
+        rows = list(
+            ranked.order_by("-rank", key).values(key, "rank")[:limit + 1])
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = CreatorSearchService.encode_cursor(
+                rows[-1]["rank"], rows[-1][key])
+
+        # Only the page itself is loaded in full
+        profiles = (
+            CreatorProfile.objects.select_related("user")
+            .prefetch_related("categories")
+            .in_bulk([row[key] for row in rows])
+        )
+        page = []
+        for row in rows:
+            profile = profiles[row[key]]
+            profile.rank = row["rank"]
+            page.append(profile)
+        return {"results": page, "next": next_cursor}
@@ -0,0 +1,313 @@
+"""
+Trending creators, ranked by exponentially decayed tip velocity.
+
+Scores use forward decay: a tip of weight w at time t adds
+w * exp(rate * (t - landmark)) to the creator's score, which never has to
+be decayed in place. Every stored score shrinks by the same factor over
+time, so the order of the sorted set is the decayed order and a tip is a
+single O(log n) ZINCRBY. The current score is the stored one times
+exp(-rate * (now - landmark)). Compaction moves the landmark to now,
+keeping the stored values small, and drops creators whose score decayed
+away.
+
+Scores live in a Redis sorted set shared by all processes. When Redis is
+unavailable, each process falls back to its own in-memory index.
+"""
+import bisect
+import logging
+import math
+import threading
+import time
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class LocalTrendingIndex:
+    """In-process stand-in for the Redis sorted set and landmark."""
+
+    def __init__(self):
+        self.landmark = None
+        self.scores = {}
+        # (score, member) pairs in ascending order
+        self.ordered = []
+        self._lock = threading.Lock()
+
+    def _set(self, member, score):
+        old = self.scores.get(member)
+        if old is not None:
+            del self.ordered[bisect.bisect_left(self.ordered, (old, member))]
+        if score is None:
+            self.scores.pop(member, None)
+            return
+        self.scores[member] = score
+        bisect.insort(self.ordered, (score, member))
+
+    def record(self, events, rate):
+        with self._lock:
+            if self.landmark is None:
+                self.landmark = events[0][2]
+            for member, weight, at in events:
+                boost = math.exp((at - self.landmark) * rate)
+                self._set(member, self.scores.get(member, 0) + weight * boost)
+            return self.landmark
+
+    def top(self, count):
+        with self._lock:
+            if count <= 0:
+                return self.landmark, []
+            return self.landmark, [
+                (member, score)
+                for score, member in reversed(self.ordered[-count:])
+            ]
+
+    def compact(self, now, rate, min_score, max_members):
+        with self._lock:
+            if self.landmark is None:
+                return 0
+            factor = math.exp((self.landmark - now) * rate)
+            entries = [
+                (score * factor, member) for score, member in self.ordered]
+            kept = [entry for entry in entries if entry[0] >= min_score]
+            kept = kept[max(len(kept) - max_members, 0):]
+            self.ordered = kept
+            self.scores = {member: score for score, member in kept}
+            self.landmark = now
+            return len(entries) - len(kept)
+
+    def clear(self):
+        with self._lock:
+            self.landmark = None
+            self.scores = {}
+            self.ordered = []
+
+
+class TrendingService:
+    HALF_LIFE = timedelta(hours=24)
+    # Below a tenth of a fresh tip the creator is no longer trending
+    MIN_SCORE = 0.1
+    MAX_MEMBERS = 10000
+    KEY = "creators:trending"
+
+    _RECORD_SCRIPT = """
+    local landmark = tonumber(redis.call('GET', KEYS[2]))
+    if not landmark then
+        landmark = tonumber(ARGV[4])
+        redis.call('SET', KEYS[2], ARGV[4])
+    end
+    local rate = tonumber(ARGV[1])
+    for i = 2, #ARGV, 3 do
+        local boost = math.exp((tonumber(ARGV[i + 2]) - landmark) * rate)
+        redis.call('ZINCRBY', KEYS[1], tonumber(ARGV[i + 1]) * boost, ARGV[i])
+    end
+    return tostring(landmark)
+    """
+    # One round trip, consistent with concurrent compaction
+    _TOP_SCRIPT = """
+    local landmark = redis.call('GET', KEYS[2])
+    local entries = redis.call(
+        'ZREVRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1, 'WITHSCORES')
+    return {landmark, entries}
+    """
+    _COMPACT_SCRIPT = """
+    local landmark = tonumber(redis.call('GET', KEYS[2]))
+    if not landmark then
+        return 0
+    end
+    local now = tonumber(ARGV[1])
+    local factor = math.exp((landmark - now) * tonumber(ARGV[2]))
+    local min_score = tonumber(ARGV[3])
+    local entries = redis.call('ZRANGE', KEYS[1], 0, -1, 'WITHSCORES')
+    local removed = 0
+    for i = 1, #entries, 2 do
+        local score = tonumber(entries[i + 1]) * factor
+        if score < min_score then
+            redis.call('ZREM', KEYS[1], entries[i])
+            removed = removed + 1
+        else
+            redis.call('ZADD', KEYS[1], score, entries[i])
+        end
+    end
+    redis.call('SET', KEYS[2], ARGV[1])
+    local extra = redis.call('ZCARD', KEYS[1]) - tonumber(ARGV[4])
+    if extra > 0 then
+        removed = removed + redis.call('ZREMRANGEBYRANK', KEYS[1], 0, extra - 1)
+    end
+    return removed
+    """
+
+    local = LocalTrendingIndex()
+
+    @staticmethod
+    def rate() -> float:
+        """Decay rate per second."""
+        return math.log(2) / TrendingService.HALF_LIFE.total_seconds()
+
+    @staticmethod
+    def weight(amount) -> float:
+        """
+        Score of one tip. Every tip counts at least 1, larger tips add
+        one per tenfold, so velocity outweighs a single large tip.
+        """
+        return 1 + math.log10(1 + max(float(amount), 0))
+
+    @staticmethod
+    def _client():
+        from django_redis import get_redis_connection
+        return get_redis_connection("default")
+
+    @staticmethod
+    def _keys():
+        key = cache.make_key(TrendingService.KEY)
+        return [key, f"{key}:landmark"]
+
+    @staticmethod
+    def record(events) -> int:
+        """
+        Adds tips to the scores of their creators.
+        args:
+            events: iterable of (creator_id, amount, unix_time)
+        returns: the number of tips recorded
+        """
+        events = [
+            (str(creator_id), TrendingService.weight(amount), float(at))
+            for creator_id, amount, at in events
+        ]
+        if not events:
+            return 0
+        args = [TrendingService.rate()]
+        for member, weight, at in events:
+            args.extend([member, weight, at])
+        try:
+            TrendingService._client().eval(
+                TrendingService._RECORD_SCRIPT, 2,
+                *TrendingService._keys(), *args)
+        except Exception as e:
+            logger.warning(f"Trending scores kept in process, Redis failed: {e}")
+            TrendingService.local.record(events, TrendingService.rate())
+        return len(events)
+
+    @staticmethod
+    def record_on_commit(transactions):
+        """
+        Records the completed CASH_IN rows of a ledger write once it
+        commits.
+        args:
+            transactions: WalletTransaction rows just written
+        """
+        cash_ins = [
+            tx for tx in transactions
+            if tx.transaction_type == "CASH_IN" and tx.status == "COMPLETED"
+        ]
+        if cash_ins:
+            transaction.on_commit(
+                lambda: TrendingService._record_cash_ins(cash_ins))
+
+    @staticmethod
+    def _record_cash_ins(cash_ins):
+        from apps.wallets.models import Wallet
+        try:
+            creators = dict(
+                Wallet.objects.filter(
+                    pk__in={tx.wallet_id for tx in cash_ins}
+                ).values_list("pk", "creator_id")
+            )
+            TrendingService.record(
+                (creators[tx.wallet_id], tx.amount, tx.created_at.timestamp())
+                for tx in cash_ins if creators.get(tx.wallet_id)
+            )
+        except Exception as e:
+            # Trending is best effort, the ledger write already committed
+            logger.error(f"Could not record tips for trending: {e}")
+
+    @staticmethod
+    def _decayed(landmark, entries, now) -> list:
+        if landmark is None:
+            return []
+        factor = math.exp((float(landmark) - now) * TrendingService.rate())
+        return [(int(member), float(score) * factor) for member, score in entries]
+
+    @staticmethod
+    def top(count, now=None) -> list:
+        """
+        The count highest scoring creators.
+        args:
+            count: number of creators
+            now: unix time to decay the scores to (defaults to now)
+        returns: list of (creator_id, score), best first
+        """
+        if count <= 0:
+            return []
+        now = now or time.time()
+        try:
+            landmark, flat = TrendingService._client().eval(
+                TrendingService._TOP_SCRIPT, 2,
+                *TrendingService._keys(), count)
+            entries = [
+                (flat[i].decode(), flat[i + 1])
+                for i in range(0, len(flat), 2)
+            ]
+        except Exception as e:
+            logger.warning(f"Reading in-process trending scores, Redis failed: {e}")
+            landmark, entries = TrendingService.local.top(count)
+        return TrendingService._decayed(landmark, entries, now)
+
+    @staticmethod
+    def compact(now=None) -> int:
+        """
+        Rebases the stored scores to now, dropping creators below
+        MIN_SCORE and beyond the MAX_MEMBERS best.
+        returns: the number of creators dropped
+        """
+        now = now or time.time()
+        args = [
+            now, TrendingService.rate(),
+            TrendingService.MIN_SCORE, TrendingService.MAX_MEMBERS,
+        ]
+        removed = TrendingService.local.compact(*args)
+        try:
+            removed += TrendingService._client().eval(
+                TrendingService._COMPACT_SCRIPT, 2,
+                *TrendingService._keys(), *args)
+        except Exception as e:
+            logger.warning(f"Could not compact shared trending scores: {e}")
+        return removed
+
+    @staticmethod
+    def rebuild(since=None) -> int:
+        """
+        Replaces the scores with a replay of the CASH_IN ledger.
+        args:
+            since: oldest tip to replay, defaults to ten half-lives ago
+        returns: the number of tips replayed
+        """
+        from django.utils import timezone
+        from apps.wallets.models import WalletTransaction
+        since = since or timezone.now() - 10 * TrendingService.HALF_LIFE
+        TrendingService.clear()
+        rows = (
+            WalletTransaction.objects
+            .filter(transaction_type="CASH_IN", status="COMPLETED",
+                    created_at__gte=since, wallet__creator__isnull=False)
+            .order_by("created_at")
+            .values_list("wallet__creator_id", "amount", "created_at")
+        )
+        replayed, batch = 0, []
+        for creator_id, amount, created_at in rows.iterator(chunk_size=2000):
+            batch.append((creator_id, amount, created_at.timestamp()))
+            if len(batch) == 2000:
+                replayed += TrendingService.record(batch)
+                batch = []
+        replayed += TrendingService.record(batch)
+        TrendingService.compact()
+        return replayed
+
+    @staticmethod
+    def clear():
+        TrendingService.local.clear()
+        try:
+            TrendingService._client().delete(*TrendingService._keys())
+        except Exception as e:
+            logger.warning(f"Could not clear shared trending scores: {e}")
@@ -1,10 +1,12 @@
 from datetime import datetime, timezone as dt_timezone
 from django.utils import timezone
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
-from apps.creators.models import CreatorProfile
+from apps.creators.models import CreatorCategory, CreatorProfile
+from apps.creators.services.cache_service import CreatorCacheService
+from apps.creators.services.category_service import CreatorCategoryService
+from apps.creators.services.search_service import CreatorSearchService
 from apps.creators.tasks import send_welcome_email_task, welcome_early_adopter_task
 
 User = get_user_model()
@@ -41,11 +43,128 @@ def creator_profile_post_save(sender, instance, created, **kwargs):
             # Send welcome email to early adopter asynchronously
             welcome_early_adopter_task.delay(instance.user.slug)
     else:
-        # On update (not creation), clear the view cache to ensure fresh data is shown
-        # The @cache_page decorator's cache will expire naturally after TTL,
-        # but this helps for immediate consistency
-        try:
-            cache.clear()
-        except Exception:
-            # Fail silently if cache clear fails - cache will expire on its own
-            pass
\ No newline at end of file
+        # On update, drop only the cached responses showing this creator
+        loaded = getattr(instance, "_loaded_listing", None)
+        current = instance.listing_state()
+        was_listed = loaded is not None and CreatorCacheService.is_listed(
+            loaded["status"], loaded["verified"])
+        is_listed = CreatorCacheService.is_listed(
+            current["status"], current["verified"])
+        listing_changed = loaded is None or was_listed != is_listed or (
+            is_listed and loaded != current)
+        CreatorCacheService.invalidate_creator(instance, listing_changed)
+        if loaded is None or was_listed != is_listed:
+            CreatorCategoryService.refresh_counts_of(instance)
+        instance._loaded_listing = current
+
+
+@receiver(pre_delete, sender=CreatorProfile)
+def creator_profile_pre_delete(sender, instance, **kwargs):
+    """Remember the categories of a creator about to be deleted."""
+    # The memberships are deleted along with the profile
+    instance._deleted_category_ids = list(
+        instance.categories.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=CreatorProfile)
+def creator_profile_post_delete(sender, instance, **kwargs):
+    """Drop cached responses and category counts of a deleted creator."""
+    CreatorCacheService.invalidate_creator(instance, listing_changed=True)
+    CreatorCategoryService.refresh_counts(
+        instance.__dict__.pop("_deleted_category_ids", []))
+
+
+@receiver(m2m_changed, sender=CreatorProfile.categories.through)
+def creator_categories_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Drop cached responses showing the creators whose categories changed
+    and recount the categories involved."""
+    if action == "pre_clear" and not reverse:
+        # The memberships are gone by post_clear
+        instance._cleared_category_ids = list(
+            instance.categories.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    # Membership moves creators in or out of category listings
+    CreatorCacheService.invalidate_listing()
+    if not reverse:
+        CreatorCacheService.invalidate_creator(instance)
+        if action == "post_clear":
+            pk_set = instance.__dict__.pop("_cleared_category_ids", [])
+        CreatorCategoryService.refresh_counts(pk_set)
+        return
+    CreatorCategoryService.refresh_counts([instance.pk])
+    if action == "post_clear":
+        # pk_set is not provided when clearing from the category side
+        return
+    profiles = CreatorProfile.objects.select_related("user").filter(
+        pk__in=pk_set)
+    for profile in profiles:
+        CreatorCacheService.invalidate_creator(profile)
+
+
+@receiver(post_save, sender=CreatorCategory)
+@receiver(post_delete, sender=CreatorCategory)
+def creator_category_changed(sender, instance, **kwargs):
+    """Drop the cached category browse pages."""
+    CreatorCacheService.invalidate_categories()
+
+
+@receiver(post_save, sender=User)
+def user_post_save_invalidate_creator(sender, instance, update_fields=None, **kwargs):
+    """Drop cached responses showing a creator whose user data changed."""
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    if instance.user_type != "creator":
+        return
+    try:
+        profile = instance.creator_profile
+    except CreatorProfile.DoesNotExist:
+        return
+    CreatorCacheService.invalidate_creator(profile)
+
+
+@receiver(post_save, sender=CreatorProfile)
+def index_creator_profile(sender, instance, **kwargs):
+    """Keep the creator search index in sync with the profile."""
+    CreatorSearchService.index_creator(instance)
+
+
+@receiver(m2m_changed, sender=CreatorProfile.categories.through)
+def index_creator_categories(sender, instance, action, reverse, pk_set, **kwargs):
+    """Reindex creators whose categories changed."""
+    if action == "pre_clear" and reverse:
+        # The creators are gone from the category by post_clear
+        instance._search_reindex = list(
+            instance.creators.values_list("pk", flat=True))
+    elif action not in ("post_add", "post_remove", "post_clear"):
+        return
+    elif not reverse:
+        CreatorSearchService.index_creator(instance)
+    elif action == "post_clear":
+        CreatorSearchService.index_creators(
+            instance.__dict__.pop("_search_reindex", []))
+    else:
+        CreatorSearchService.index_creators(pk_set)
+
+
+@receiver(post_save, sender=CreatorCategory)
+def index_category_creators(sender, instance, created, **kwargs):
+    """Reindex the creators of a renamed category."""
+    if not created:
+        CreatorSearchService.index_creators(
+            instance.creators.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=User)
+def index_creator_user(sender, instance, update_fields=None, **kwargs):
+    """Reindex a creator whose names changed."""
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    if instance.user_type != "creator":
+        return
+    try:
+        profile = instance.creator_profile
+    except CreatorProfile.DoesNotExist:
+        return
+    CreatorSearchService.index_creator(profile)
@@ -6,6 +6,8 @@ import logging
 from celery import shared_task
 from django.contrib.auth import get_user_model
 from apps.wallets.models import Wallet
+from apps.creators.services.image_service import CreatorImageService
+from apps.creators.services.trending_service import TrendingService
 from utils.send_emails import (
     send_welcome_email, send_daily_weekly_summary_email,
     send_reminder_to_share_creator_link_email,
@@ -172,3 +174,60 @@ def welcome_early_adopter_task(slug):
     except Exception as e:
         logger.error(f"Error in welcome_early_adopter_task for slug {slug}: {str(e)}")
         raise
+
+
+@shared_task
+def generate_image_variants_task(profile_id, field):
+    """
+    Task to write the resized WebP/JPEG variants of a creator's uploaded
+    profile or cover image.
+
+    Queued by UpdateProfileView after an upload is committed.
+
+    Args:
+        profile_id (int): The ID of the creator profile
+        field (str): "profile_image" or "cover_image"
+
+    Returns:
+        str: Status message
+    """
+    try:
+        from apps.creators.models import CreatorProfile
+        variants = CreatorImageService.generate(profile_id, field)
+        logger.info(f"Generated {len(variants)} {field} variants for creator profile {profile_id}")
+        return f"Generated {len(variants)} {field} variants for creator profile {profile_id}"
+    except CreatorProfile.DoesNotExist:
+        logger.error(f"CreatorProfile with id {profile_id} not found")
+        return f"CreatorProfile {profile_id} not found"
+    except Exception as e:
+        logger.error(f"Error in generate_image_variants_task for profile {profile_id}: {str(e)}")
+        raise
+
+
+@shared_task
+def compact_trending_scores_task():
+    """
+    Task to rebase the trending scores to the current time and drop
+    creators whose score has decayed away.
+
+    Returns:
+        str: Status message
+    """
+    try:
+        removed = TrendingService.compact()
+        logger.info(f"Compacted trending scores, dropped {removed} creators")
+        return f"Compacted trending scores, dropped {removed} creators"
+    except Exception as e:
+        logger.error(f"Error in compact_trending_scores_task: {str(e)}")
+        raise
+
+
+# Schedule trending score compaction every hour
+@app.on_after_finalize.connect
+def setup_trending_compaction_task(sender, **kwargs):
+    """Schedule the trending score compaction to run every hour."""
+    sender.add_periodic_task(
+        crontab(minute=15),  # Every hour at minute 15
+        compact_trending_scores_task.s(),
+        name='Compact trending creator scores every hour'
+    )
@@ -1,11 +1,17 @@
 from django.urls import path
 from apps.creators.views import (
-    CreatorPublicView, CreatorsListView, UpdateProfileView, SelectUserTypeView)
+    CreatorCacheMetricsAPIView, CreatorCategoriesView, CreatorPublicView,
+    CreatorSearchView, CreatorTrendingView, CreatorsListView, SelectUserTypeView,
+    UpdateProfileView)
 
 app_name = 'creators'
 
 urlpatterns = [
     path('all/', CreatorsListView.as_view(), name='creator_profiles_list'),
+    path('cache/metrics/', CreatorCacheMetricsAPIView.as_view(), name='creator_cache_metrics'),
+    path('categories/', CreatorCategoriesView.as_view(), name='creator_categories'),
+    path('search/', CreatorSearchView.as_view(), name='creator_search'),
+    path('trending/', CreatorTrendingView.as_view(), name='creator_trending'),
     path('<slug:slug>/', CreatorPublicView.as_view(), name='creator_public_view'),
     path('profile/me/', UpdateProfileView.as_view(), name='update_creator_profile'),
     path('profile/user-type/', SelectUserTypeView.as_view(), name='select_user_type'),
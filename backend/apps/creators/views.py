@@ -1,11 +1,14 @@
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
-from django.views.decorators.cache import cache_page
-from django.utils.decorators import method_decorator
 from apps.creators.models import CreatorProfile
+from apps.creators.services.cache_service import CreatorCacheService
+from apps.creators.services.category_service import CreatorCategoryService
+from apps.creators.services.image_service import CreatorImageService
+from apps.creators.services.search_service import CreatorSearchService
+from apps.creators.services.trending_service import TrendingService
 from apps.creators.serializers import (
     CreatorPublicSerializer, CreatorListSerializer,
     UpdateCreatorProfileSerializer, UserTypeSelectionSerializer
@@ -122,7 +125,13 @@ class UpdateProfileView(APIView):
         )
 
         if serializer.is_valid():
-            serializer.save()
+            profile = serializer.save()
+            # Resized copies are made off the request, after commit
+            uploaded = [
+                field for field in CreatorImageService.FIELDS
+                if field in request.FILES
+            ]
+            CreatorImageService.schedule(profile, uploaded)
             return Response(
                 {"status": "success"}, status=status.HTTP_200_OK
             )
@@ -137,7 +146,6 @@ class CreatorPublicView(APIView):
     permission_classes = [AllowAny]
     serializer_class = CreatorPublicSerializer
 
-    @method_decorator(cache_page(60 * 10))  # Cache for 10 minutes (stable public profiles)
     @extend_schema(
         operation_id="retrieve_creator",
         summary="Retrieve a Creator",
@@ -166,6 +174,12 @@ class CreatorPublicView(APIView):
         slug : str
             Creator slug
         """
+        # Versioned per creator, dropped when the profile changes
+        cache_key = CreatorCacheService.profile_key(slug, request.get_host())
+        data = CreatorCacheService.get(cache_key, "profile")
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
+
         try:
             creator_profile = CreatorProfile.objects.select_related('user').get(
                 user__slug__iexact=slug, status="active")
@@ -177,10 +191,9 @@ class CreatorPublicView(APIView):
 
         serializer = CreatorPublicSerializer(
             creator_profile, context={'request': request})
-        return Response(
-            {"status": "success", "data": serializer.data},
-            status=status.HTTP_200_OK,
-        )
+        data = {"status": "success", "data": serializer.data}
+        CreatorCacheService.set_profile(cache_key, data)
+        return Response(data, status=status.HTTP_200_OK)
 
 
 class CreatorsListView(APIView):
@@ -188,7 +201,6 @@ class CreatorsListView(APIView):
     serializer_class = CreatorListSerializer
     pagination_class = PageNumberPagination
 
-    @method_decorator(cache_page(60 * 5))  # Cache for 5 minutes
     @extend_schema(
         operation_id="fetch_creators",
         summary="Fetch Active/Verfified Creators",
@@ -210,7 +222,19 @@ class CreatorsListView(APIView):
         Authentication
         --------------
         Public endpoint (no authentication required).
+
+        Query Parameters
+        ----------------
+        category : str
+            Only creators in the category with this slug
         """
+        # Versioned per page, dropped when a creator on it changes
+        page_id = CreatorCacheService.page_id(request.build_absolute_uri())
+        cache_key = CreatorCacheService.list_key(page_id)
+        data = CreatorCacheService.get(cache_key, "list")
+        if data is not None:
+            return Response(data)
+
         # Optimized query: select_related for user, prefetch_related for M2M relationships
         creator_profiles = (
             CreatorProfile.objects
@@ -219,6 +243,10 @@ class CreatorsListView(APIView):
             .filter(status="active", verified=True)
             .order_by('-followers_count')
         )
+        category = request.query_params.get('category')
+        if category:
+            # Served by the (category, creator) index of the M2M table
+            creator_profiles = creator_profiles.filter(categories__slug=category)
 
         # Apply pagination
         paginator = self.pagination_class()
@@ -228,7 +256,184 @@ class CreatorsListView(APIView):
         serializer = CreatorListSerializer(
             paginated_creators, many=True, context={'request': request})
         
-        return paginator.get_paginated_response({
+        response = paginator.get_paginated_response({
             "status": "success",
             "data": serializer.data,
         })
+        CreatorCacheService.set_page(
+            cache_key, page_id, response.data,
+            [creator.pk for creator in paginated_creators],
+        )
+        return response
+
+
+class CreatorCategoriesView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        operation_id="browse_creator_categories",
+        summary="Browse Creator Categories",
+        responses={
+            200: helpers.SuccessResponseSerializer,
+            500: helpers.ServerErrorSerializer,
+        }
+    )
+    def get(self, request) -> Response:
+        """List active creator categories with their creator counts.
+
+        Featured categories come first, each group in display order. Use a
+        category's slug with the creators list ``category`` filter.
+
+        Authentication
+        --------------
+        Public endpoint (no authentication required).
+
+        Query Parameters
+        ----------------
+        country : str
+            Optional ISO 3166-1 alpha-2 country code
+        """
+        data = CreatorCategoryService.browse(request.query_params.get('country'))
+        return Response(
+            {"status": "success", "data": data}, status=status.HTTP_200_OK)
+
+
+class CreatorSearchView(APIView):
+    permission_classes = [AllowAny]
+    serializer_class = CreatorListSerializer
+
+    @extend_schema(
+        operation_id="search_creators",
+        summary="Search Creators",
+        responses={
+            200: helpers.SuccessResponseSerializer,
+            400: helpers.ValidationErrorSerializer,
+            500: helpers.ServerErrorSerializer,
+        }
+    )
+    def get(self, request) -> Response:
+        """Search active, verified creators.
+
+        Matches every word of ``q`` against word prefixes of the creator's
+        username, name, categories and bio, best matches first.
+
+        Authentication
+        --------------
+        Public endpoint (no authentication required).
+
+        Query Parameters
+        ----------------
+        q : str
+            Search text
+        category : str
+            Category slug, repeatable or comma separated
+        cursor : str
+            ``next`` value of the previous page
+        limit : int
+            Page size (max 50)
+        """
+        categories = [
+            slug.strip()
+            for value in request.query_params.getlist('category')
+            for slug in value.split(',') if slug.strip()
+        ]
+        try:
+            limit = int(request.query_params.get('limit') or 0) or None
+            if limit is not None and limit < 1:
+                raise ValueError("Invalid limit")
+            result = CreatorSearchService.search(
+                request.query_params.get('q', ''),
+                categories=categories,
+                cursor=request.query_params.get('cursor'),
+                limit=limit,
+            )
+        except ValueError as e:
+            return Response(
+                {"status": "error", "message": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = CreatorListSerializer(
+            result["results"], many=True, context={'request': request})
+        return Response({
+            "status": "success",
+            "data": serializer.data,
+            "next": result["next"],
+        }, status=status.HTTP_200_OK)
+
+
+class CreatorTrendingView(APIView):
+    permission_classes = [AllowAny]
+    serializer_class = CreatorListSerializer
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 50
+
+    @extend_schema(
+        operation_id="trending_creators",
+        summary="Trending Creators",
+        responses={
+            200: helpers.SuccessResponseSerializer,
+            400: helpers.ValidationErrorSerializer,
+            500: helpers.ServerErrorSerializer,
+        }
+    )
+    def get(self, request) -> Response:
+        """List the creators receiving the most tips lately.
+
+        Creators are ranked by tip velocity: every tip adds to the score,
+        which halves every day without new tips.
+
+        Authentication
+        --------------
+        Public endpoint (no authentication required).
+
+        Query Parameters
+        ----------------
+        limit : int
+            Number of creators (max 50)
+        """
+        try:
+            limit = int(request.query_params.get('limit') or self.DEFAULT_LIMIT)
+        except ValueError:
+            return Response(
+                {"status": "error", "message": "Invalid limit"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = max(1, min(limit, self.MAX_LIMIT))
+
+        # Extra candidates make up for creators no longer listed
+        ranked = TrendingService.top(limit * 2)
+        profiles = (
+            CreatorProfile.objects
+            .select_related('user')
+            .prefetch_related('categories')
+            .filter(status="active", verified=True)
+            .in_bulk([creator_id for creator_id, _ in ranked])
+        )
+        ranked = [
+            (profiles[creator_id], score)
+            for creator_id, score in ranked if creator_id in profiles
+        ][:limit]
+
+        serializer = CreatorListSerializer(
+            [profile for profile, _ in ranked], many=True,
+            context={'request': request})
+        data = [
+            {**item, "trending_score": round(score, 4)}
+            for item, (_, score) in zip(serializer.data, ranked)
+        ]
+        return Response(
+            {"status": "success", "data": data}, status=status.HTTP_200_OK)
+
+
+class CreatorCacheMetricsAPIView(APIView):
+    """Admin-only hit rates of the creator profile and listing caches"""
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(exclude=True)
+    def get(self, request):
+        return Response(
+            {"status": "success", "data": CreatorCacheService.metrics()},
+            status=status.HTTP_200_OK
+        )
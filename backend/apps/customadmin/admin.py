@@ -5,7 +5,7 @@ from django.utils.html import format_html
 from django.urls import reverse
 from apps.customauth.models import APIClient
 from apps.creators.models import CreatorProfile
-from apps.payments.models import Payment, PaymentStatus
+from apps.payments.models import Payment, PaymentPayload, PaymentStatus
 from apps.payments.models import PaymentWebhookLog as WebHook
 from apps.wallets.models import (
     PaymentAttempt, Refund, Wallet,
@@ -114,7 +114,18 @@ class WalletAdmin(admin.ModelAdmin):
         """
         for wallet in queryset:
             wallet.is_verified = True
-            wallet.save()
+            wallet.save(update_fields=["is_verified", "updated_at"])
+
+
+class PaymentPayloadInline(admin.StackedInline):
+    model = PaymentPayload
+    extra = 0
+    can_delete = False
+    classes = ["collapse"]
+    fields = [
+        "metadata", "provider_data", "provider_metadata", "callback_data",
+        "user_agent",
+    ]
 
 
 class PaymentAdmin(admin.ModelAdmin):
@@ -161,14 +172,10 @@ class PaymentAdmin(admin.ModelAdmin):
             "Timing",
             {"fields": ("created_at", "updated_at", "completed_at")},
         ),
-        (
-            "Metadata",
-            {
-                "fields": ("metadata", "provider_data", "provider_metadata"),
-                "classes": ("collapse",),
-            },
-        ),
     )
+    inlines = [PaymentPayloadInline]
+    # Columns loaded for the change list, on top of list_display
+    list_only_fields = ["currency", "is_deleted"]
 
     def status_badge(self, obj):
         colors = {
@@ -191,6 +198,9 @@ class PaymentAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
+        match = request.resolver_match
+        if match and match.url_name == "payments_payment_changelist":
+            qs = qs.only(*self.list_display, *self.list_only_fields)
         if not request.user.is_superuser:
             return qs.filter(is_deleted=False)
         return qs
@@ -199,17 +209,18 @@ class PaymentAdmin(admin.ModelAdmin):
 
     def check_final_status(self, request, queryset):
         """Admin action to check status of selected payments."""
-        from apps.payments.helpers import check_final_status
-        for payment in queryset:
-            try:
-                status = check_final_status(payment)
-                self.message_user(request, f"Payment {payment.reference} status: {status}")
-            except Exception as e:
-                self.message_user(
-                    request,
-                    f"Failed to check status for {payment.reference}: {str(e)}",
-                    level="error",
-                )
+        from apps.payments.helpers import check_final_statuses
+        try:
+            results = check_final_statuses(queryset)
+        except Exception as e:
+            self.message_user(
+                request,
+                f"Failed to check status of selected payments: {str(e)}",
+                level="error",
+            )
+            return
+        for payment, status in results:
+            self.message_user(request, f"Payment {payment.reference} status: {status}")
 
     def capture_payments(self, request, queryset):
         for payment in queryset:
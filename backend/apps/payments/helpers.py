@@ -1,10 +1,12 @@
 from apps.payments.models import PaymentWebhookLog as WebHook
-from utils.external_requests import resend_callback
+from utils.external_requests import resend_callback, resend_callbacks
+
+FINAL_STATUSES = ["failed", "completed", "reversed"]
+
 
 def check_final_status(payment):
     """Checks if the payment is in a final state and logs the webhook call."""
-    final_statuses = ["failed", "completed", "reversed"]
-    if payment.status in final_statuses:
+    if payment.status in FINAL_STATUSES:
         # If webhook log already exists for this payment, skip logging
         if not WebHook.objects.filter(external_id=payment.reference).exists():
             WebHook.objects.create(
@@ -22,4 +24,22 @@ def check_final_status(payment):
             return data['status']
         else:
             return payment.status
-        
\ No newline at end of file
+        
+
+def check_final_statuses(payments):
+    """Batch version of check_final_status. Callbacks of the non-final
+    payments are resent to PawaPay concurrently instead of one by one.
+    Returns a list of (payment, status) pairs."""
+    payments = list(payments)
+    pending = [p for p in payments if p.status not in FINAL_STATUSES]
+    responses = resend_callbacks([p.id for p in pending])
+
+    results = []
+    for payment in payments:
+        if payment.status in FINAL_STATUSES:
+            results.append((payment, check_final_status(payment)))
+            continue
+        data, code = responses[str(payment.id)]
+        results.append(
+            (payment, data['status'] if code == 200 else payment.status))
+    return results
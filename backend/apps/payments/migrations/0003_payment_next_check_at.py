@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-18 06:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_initial'),
+        ('wallets', '0005_archivedwallettransaction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='check_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='next_check_at',
+            field=models.DateTimeField(blank=True, help_text='When to next ask the provider to resend the callback', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', 'next_check_at'], name='payments_pa_status_931c84_idx'),
+        ),
+    ]
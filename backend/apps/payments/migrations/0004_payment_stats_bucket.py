@@ -0,0 +1,42 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:20
+
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0003_payment_next_check_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentStatsBucket',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hour', models.DateTimeField()),
+                ('currency', models.CharField(choices=[('ZMW', 'Zambian Kwacha'), ('EUR', 'Euro')], max_length=3)),
+                ('total_payments', models.PositiveIntegerField(default=0)),
+                ('successful_payments', models.PositiveIntegerField(default=0)),
+                ('failed_payments', models.PositiveIntegerField(default=0)),
+                ('refunded_payments', models.PositiveIntegerField(default=0)),
+                ('pending_payments', models.PositiveIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('successful_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('failed_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('pending_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('captured_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('refunded_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('total_fees', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('net_revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+            ],
+            options={
+                'verbose_name': 'Payment Stats Bucket',
+                'verbose_name_plural': 'Payment Stats Buckets',
+                'ordering': ['-hour'],
+                'constraints': [models.UniqueConstraint(fields=('hour', 'currency'), name='unique_payment_stats_hour')],
+            },
+        ),
+    ]
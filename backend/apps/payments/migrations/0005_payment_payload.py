@@ -0,0 +1,81 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+PAYLOAD_FIELDS = [
+    "metadata", "provider_data", "provider_metadata", "user_agent",
+    "callback_data",
+]
+
+
+def copy_payloads(apps, schema_editor):
+    Payment = apps.get_model("payments", "Payment")
+    PaymentPayload = apps.get_model("payments", "PaymentPayload")
+    batch = []
+    rows = Payment.objects.values("id", *PAYLOAD_FIELDS)
+    for row in rows.iterator(chunk_size=1000):
+        if not any(row[field] for field in PAYLOAD_FIELDS):
+            continue
+        batch.append(PaymentPayload(
+            payment_id=row["id"],
+            **{field: row[field] for field in PAYLOAD_FIELDS},
+        ))
+        if len(batch) == 1000:
+            PaymentPayload.objects.bulk_create(batch)
+            batch = []
+    PaymentPayload.objects.bulk_create(batch)
+
+
+def restore_payloads(apps, schema_editor):
+    Payment = apps.get_model("payments", "Payment")
+    PaymentPayload = apps.get_model("payments", "PaymentPayload")
+    for payload in PaymentPayload.objects.iterator(chunk_size=1000):
+        Payment.objects.filter(id=payload.payment_id).update(
+            **{field: getattr(payload, field) for field in PAYLOAD_FIELDS})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0004_payment_stats_bucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentPayload',
+            fields=[
+                ('payment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='payload', serialize=False, to='payments.payment')),
+                ('metadata', models.JSONField(blank=True, default=dict, help_text='Additional payment metadata')),
+                ('provider_data', models.JSONField(blank=True, default=dict, help_text='Raw response data from payment provider')),
+                ('provider_metadata', models.JSONField(blank=True, default=dict, help_text='Additional provider-specific metadata')),
+                ('user_agent', models.TextField(blank=True)),
+                ('callback_data', models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                'verbose_name': 'Payment Payload',
+                'verbose_name_plural': 'Payment Payloads',
+            },
+        ),
+        migrations.RunPython(copy_payloads, restore_payloads),
+        migrations.RemoveField(
+            model_name='payment',
+            name='callback_data',
+        ),
+        migrations.RemoveField(
+            model_name='payment',
+            name='metadata',
+        ),
+        migrations.RemoveField(
+            model_name='payment',
+            name='provider_data',
+        ),
+        migrations.RemoveField(
+            model_name='payment',
+            name='provider_metadata',
+        ),
+        migrations.RemoveField(
+            model_name='payment',
+            name='user_agent',
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:40
+
+import utils.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0005_payment_payload'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='paymentstatsbucket',
+            name='id',
+            field=models.UUIDField(default=utils.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='paymentwebhooklog',
+            name='id',
+            field=models.UUIDField(default=utils.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
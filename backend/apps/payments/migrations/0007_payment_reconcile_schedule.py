@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0006_uuid7_primary_keys'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='reconcile_at',
+            field=models.DateTimeField(blank=True, help_text='When to next check the status with the provider', null=True),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='reconcile_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['status', 'reconcile_at'], name='payments_pa_status_ec7ccf_idx'),
+        ),
+    ]
@@ -1,5 +1,5 @@
 from django.db import models
-from django.db.models import Sum
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
 from datetime import timedelta
 from django.contrib.auth import get_user_model
@@ -8,6 +8,7 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 import uuid
 from decimal import Decimal
 from typing import Optional, Dict
+from utils.ids import monotonic_reference, uuid7
 
 User = get_user_model()
 
@@ -80,9 +81,9 @@ class TimeStampedModel(models.Model):
 
 
 class UUIDModel(models.Model):
-    """Abstract base model with UUID primary key"""
+    """Abstract base model with a time-ordered (UUIDv7) primary key"""
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
 
     class Meta:
         abstract = True
@@ -201,55 +202,121 @@ class PaymentManager(models.Manager):
         )
 
     def get_payment_stats(self, start_date, end_date):
-        """Get comprehensive payment statistics"""
-        queryset = self.filter(
+        """
+        Get comprehensive payment statistics in a single pass over the
+        date range
+        Args:
+            start_date (datetime): Start of date range
+            end_date (datetime): End of date range
+        Returns:
+            dict: Counts and amounts, see summarize_payment_stats
+        """
+        totals = self.filter(
             created_at__range=[start_date, end_date], is_deleted=False
-        )
-
-        total = queryset.count()
-        successful = queryset.filter(
-            status__in=[PaymentStatus.CAPTURED, PaymentStatus.COMPLETED]
-        ).count()
-        failed = queryset.filter(status=PaymentStatus.FAILED).count()
-        refunded = queryset.filter(
-            status__in=[
-                PaymentStatus.REFUNDED, PaymentStatus.PARTIALLY_REFUNDED]
-        ).count()
-
-        # Calculate amounts
-        total_amount = queryset.aggregate(
-            total=Sum("amount"))["total"] or Decimal("0")
-
-        captured_amount = queryset.filter(
-            status__in=[
-                PaymentStatus.CAPTURED, PaymentStatus.PARTIALLY_CAPTURED]
-        ).aggregate(total=Sum("amount_captured"))["total"] or Decimal("0")
-
-        refunded_amount = queryset.aggregate(total=Sum("amount_refunded"))[
-            "total"
-        ] or Decimal("0")
-
-        return {
-            "total_payments": total,
-            "successful_payments": successful,
-            "failed_payments": failed,
-            "refunded_payments": refunded,
-            "success_rate": (successful / total * 100) if total > 0 else 0,
-            "total_amount": total_amount,
-            "captured_amount": captured_amount,
-            "refunded_amount": refunded_amount,
-            "net_amount": captured_amount - refunded_amount,
-        }
+        ).aggregate(**payment_stats_aggregates())
+        return summarize_payment_stats(totals)
+
+
+# ========== PAYMENT STATISTICS ==========
+
+SUCCESSFUL_STATUSES = [PaymentStatus.CAPTURED, PaymentStatus.COMPLETED]
+
+PAYMENT_STATS_COUNTS = [
+    "total_payments",
+    "successful_payments",
+    "failed_payments",
+    "refunded_payments",
+    "pending_payments",
+]
+PAYMENT_STATS_AMOUNTS = [
+    "total_amount",
+    "successful_amount",
+    "failed_amount",
+    "pending_amount",
+    "captured_amount",
+    "refunded_amount",
+    "total_fees",
+    "net_revenue",
+]
+
+
+def payment_stats_aggregates() -> dict:
+    """
+    Conditional aggregates computing every payment statistic in one scan.
+    Keys match PAYMENT_STATS_COUNTS and PAYMENT_STATS_AMOUNTS.
+    """
+    successful = Q(status__in=SUCCESSFUL_STATUSES)
+    failed = Q(status=PaymentStatus.FAILED)
+    pending = Q(status=PaymentStatus.PENDING)
+    return {
+        "total_payments": Count("id"),
+        "successful_payments": Count("id", filter=successful),
+        "failed_payments": Count("id", filter=failed),
+        "refunded_payments": Count(
+            "id",
+            filter=Q(status__in=[
+                PaymentStatus.REFUNDED, PaymentStatus.PARTIALLY_REFUNDED]),
+        ),
+        "pending_payments": Count("id", filter=pending),
+        "total_amount": Sum("amount"),
+        "successful_amount": Sum("amount", filter=successful),
+        "failed_amount": Sum("amount", filter=failed),
+        "pending_amount": Sum("amount", filter=pending),
+        "captured_amount": Sum(
+            "amount_captured",
+            filter=Q(status__in=[
+                PaymentStatus.CAPTURED, PaymentStatus.PARTIALLY_CAPTURED]),
+        ),
+        "refunded_amount": Sum("amount_refunded"),
+        "total_fees": Sum("provider_fee", filter=successful),
+        "net_revenue": Sum("net_amount", filter=successful),
+    }
+
+
+def summarize_payment_stats(values: dict) -> dict:
+    """
+    Fills in missing totals and derives the success rate and net amount.
+    Args:
+        values (dict): Raw totals keyed like payment_stats_aggregates
+    Returns:
+        dict: The totals plus success_rate and net_amount
+    """
+    stats = {field: values.get(field) or 0 for field in PAYMENT_STATS_COUNTS}
+    stats.update({
+        field: values.get(field) or Decimal("0")
+        for field in PAYMENT_STATS_AMOUNTS
+    })
+    total = stats["total_payments"]
+    stats["success_rate"] = (
+        stats["successful_payments"] / total * 100) if total > 0 else 0
+    stats["net_amount"] = stats["captured_amount"] - stats["refunded_amount"]
+    return stats
 
 # ========== MAIN PAYMENT MODEL ==========
 
 
+def _payload_field(name):
+    """Exposes a PaymentPayload field as an attribute of the payment."""
+
+    def getter(self):
+        return getattr(self.get_payload(), name)
+
+    def setter(self, value):
+        setattr(self.get_payload(), name, value)
+        self._payload_changed = True
+
+    return property(getter, setter)
+
+
 class Payment(UUIDModel, TimeStampedModel, SoftDeleteModel):
     """
     Main Payment model with support for multiple gateways,
     currencies, and payment methods
     """
 
+    # Sent to PawaPay as the depositId, which must be a UUIDv4
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
     # Basic Information
     objects = PaymentManager()
     wallet = models.ForeignKey(
@@ -311,20 +378,27 @@ class Payment(UUIDModel, TimeStampedModel, SoftDeleteModel):
     )
     patron_name = models.CharField(max_length=255, blank=True, null=True)
 
-    patron_message = models.CharField(
-        max_length=100,
-        db_index=True,
-        null=True,
-        blank=True,
-    )
     patron_message = models.TextField(blank=True, null=True)
-    metadata = models.JSONField(
-        default=dict, blank=True, help_text=_("Additional payment metadata")
-    )
 
     # Timing Information
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    # Callback resend scheduling
+    next_check_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("When to next ask the provider to resend the callback"),
+    )
+    check_attempts = models.PositiveIntegerField(default=0)
+
+    # Status reconciliation scheduling
+    reconcile_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("When to next check the status with the provider"),
+    )
+    reconcile_attempts = models.PositiveIntegerField(default=0)
+
     # Fee and Settlement Information
     provider_fee = models.DecimalField(
         max_digits=20,
@@ -343,19 +417,8 @@ class Payment(UUIDModel, TimeStampedModel, SoftDeleteModel):
     settled_at = models.DateTimeField(null=True, blank=True)
     settlement_reference = models.CharField(max_length=255, blank=True)
 
-    # Provider-specific fields
-    provider_data = models.JSONField(
-        default=dict, blank=True, help_text=_(
-            "Raw response data from payment provider")
-    )
-    provider_metadata = models.JSONField(
-        default=dict, blank=True, help_text=_(
-            "Additional provider-specific metadata")
-    )
-
     # Security and Compliance
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    user_agent = models.TextField(blank=True)
     risk_score = models.FloatField(
         null=True,
         blank=True,
@@ -367,7 +430,13 @@ class Payment(UUIDModel, TimeStampedModel, SoftDeleteModel):
     # Payment Flow
     redirect_url = models.URLField(blank=True)
     webhook_url = models.URLField(blank=True)
-    callback_data = models.JSONField(default=dict, blank=True)
+
+    # Bulky provider data lives in PaymentPayload, loaded on first access
+    metadata = _payload_field("metadata")
+    provider_data = _payload_field("provider_data")
+    provider_metadata = _payload_field("provider_metadata")
+    user_agent = _payload_field("user_agent")
+    callback_data = _payload_field("callback_data")
 
     class Meta:
         ordering = ["-created_at"]
@@ -376,6 +445,8 @@ class Payment(UUIDModel, TimeStampedModel, SoftDeleteModel):
             models.Index(fields=["patron_phone", "created_at"]),
             models.Index(fields=["created_at", "status"]),
             models.Index(fields=["amount", "currency"]),
+            models.Index(fields=["status", "next_check_at"]),
+            models.Index(fields=["status", "reconcile_at"]),
         ]
         verbose_name = _("Payment")
         verbose_name_plural = _("Payments")
@@ -410,6 +481,25 @@ class Payment(UUIDModel, TimeStampedModel, SoftDeleteModel):
             self.patron_name = "Anonymous"
         super().save(*args, **kwargs)
 
+        if self.__dict__.pop("_payload_changed", False):
+            payload = self.get_payload()
+            payload.payment = self
+            payload.save()
+
+    def get_payload(self) -> "PaymentPayload":
+        """
+        The payment's PaymentPayload, fetched on first access. Use
+        select_related("payload") when reading it for many payments.
+        """
+        if Payment.payload.is_cached(self) or not self._state.adding:
+            try:
+                return self.payload
+            except PaymentPayload.DoesNotExist:
+                pass
+        payload = PaymentPayload(payment=self)
+        self.payload = payload
+        return payload
+
     @property
     def amount_remaining(self) -> Decimal:
         """Calculate remaining amount to be captured"""
@@ -451,9 +541,10 @@ class Payment(UUIDModel, TimeStampedModel, SoftDeleteModel):
 
         # Update metadata if provided
         if metadata:
-            if "metadata" not in self.metadata:
-                self.metadata["status_changes"] = []
-            self.metadata["status_changes"].append(
+            payment_metadata = self.metadata
+            if "metadata" not in payment_metadata:
+                payment_metadata["status_changes"] = []
+            payment_metadata["status_changes"].append(
                 {
                     "from": old_status,
                     "to": new_status,
@@ -461,17 +552,47 @@ class Payment(UUIDModel, TimeStampedModel, SoftDeleteModel):
                     "metadata": metadata,
                 }
             )
+            self.metadata = payment_metadata
         self.save()
 
     @classmethod
     def generate_reference(cls, prefix: str = "PAY") -> str:
-        """Generate unique payment reference"""
-        import secrets
-        import datetime
+        """Generate unique, time-ordered payment reference"""
+        return monotonic_reference(prefix)
+
+
+class PaymentPayload(models.Model):
+    """
+    Bulky, rarely read data of a payment. Kept off the payments table so
+    list queries, row locks and scans only read the narrow payment row.
+    """
+
+    payment = models.OneToOneField(
+        Payment,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="payload",
+    )
+    metadata = models.JSONField(
+        default=dict, blank=True, help_text=_("Additional payment metadata")
+    )
+    provider_data = models.JSONField(
+        default=dict, blank=True, help_text=_(
+            "Raw response data from payment provider")
+    )
+    provider_metadata = models.JSONField(
+        default=dict, blank=True, help_text=_(
+            "Additional provider-specific metadata")
+    )
+    user_agent = models.TextField(blank=True)
+    callback_data = models.JSONField(default=dict, blank=True)
 
-        timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-        random_str = secrets.token_hex(3).upper()
-        return f"{prefix}-{timestamp}-{random_str}"
+    class Meta:
+        verbose_name = _("Payment Payload")
+        verbose_name_plural = _("Payment Payloads")
+
+    def __str__(self):
+        return f"Payload({self.payment_id})"
 
 
 class WebhookEventType(models.TextChoices):
@@ -535,3 +656,49 @@ class PaymentWebhookLog(UUIDModel, TimeStampedModel):
 
     def __str__(self):
         return f"{self.provider} - {self.event_type} - {self.status}"
+
+
+class PaymentStatsBucket(UUIDModel):
+    """
+    Payment statistics of one currency for one settled hour (UTC). Built
+    by a periodic task once no payment of the hour can still change
+    status, so reports over closed periods read buckets instead of
+    scanning the payments.
+    """
+
+    hour = models.DateTimeField()
+    currency = models.CharField(max_length=3, choices=Currency.choices)
+    total_payments = models.PositiveIntegerField(default=0)
+    successful_payments = models.PositiveIntegerField(default=0)
+    failed_payments = models.PositiveIntegerField(default=0)
+    refunded_payments = models.PositiveIntegerField(default=0)
+    pending_payments = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(
+        max_digits=20, decimal_places=2, default=Decimal("0.00"))
+    successful_amount = models.DecimalField(
+        max_digits=20, decimal_places=2, default=Decimal("0.00"))
+    failed_amount = models.DecimalField(
+        max_digits=20, decimal_places=2, default=Decimal("0.00"))
+    pending_amount = models.DecimalField(
+        max_digits=20, decimal_places=2, default=Decimal("0.00"))
+    captured_amount = models.DecimalField(
+        max_digits=20, decimal_places=2, default=Decimal("0.00"))
+    refunded_amount = models.DecimalField(
+        max_digits=20, decimal_places=2, default=Decimal("0.00"))
+    total_fees = models.DecimalField(
+        max_digits=20, decimal_places=2, default=Decimal("0.00"))
+    net_revenue = models.DecimalField(
+        max_digits=20, decimal_places=2, default=Decimal("0.00"))
+
+    class Meta:
+        verbose_name = _("Payment Stats Bucket")
+        verbose_name_plural = _("Payment Stats Buckets")
+        ordering = ["-hour"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["hour", "currency"], name="unique_payment_stats_hour"
+            )
+        ]
+
+    def __str__(self):
+        return f"PaymentStats({self.currency}) - {self.hour}"
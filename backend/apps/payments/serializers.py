@@ -7,6 +7,9 @@ from .models import Payment
 class PaymentSerializer(serializers.ModelSerializer):
     """Lightweight serializer for creating payments"""
 
+    # Stored on the payment's PaymentPayload
+    metadata = serializers.JSONField(required=False)
+
     class Meta:
         model = Payment
         fields = [
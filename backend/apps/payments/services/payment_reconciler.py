@@ -0,0 +1,185 @@
+"""
+Background reconciliation of deposit statuses with PawaPay. Replaces
+polling the provider from the dashboard request: only recent, non-terminal
+payments are checked, provider calls fan out concurrently with a bounded
+number in flight, and each payment backs off exponentially while it stays
+unresolved. The backoff lives on the payment's reconcile_at and
+reconcile_attempts columns, next to the resend scheduler's own.
+"""
+import logging
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from apps.payments.models import Payment
+from apps.payments.services.status_service import PaymentStatusService
+from apps.wallets.services.wallet_services import WalletTransactionService
+from utils.exceptions import DuplicateTransaction
+from utils.external_requests import fetch_deposit_statuses
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentReconciler:
+    # Statuses that can still change on the provider side
+    NON_TERMINAL_STATUSES = [
+        "pending",
+        "submitted",
+        "accepted",
+        "processing",
+        "in_reconciliation",
+    ]
+    # Older payments are left to the provider callbacks
+    RECONCILE_WINDOW = timedelta(days=2)
+    MAX_CONCURRENCY = 8
+    BATCH_SIZE = 200
+    BASE_BACKOFF_SECONDS = 60
+    MAX_BACKOFF_SECONDS = 60 * 60
+
+    @staticmethod
+    def backoff_seconds(attempts: int) -> int:
+        """
+        Delay before the next status check of a payment.
+        args:
+            attempts: number of checks that left the payment unresolved
+        returns: the delay in seconds, doubling per attempt up to the cap
+        """
+        return min(
+            PaymentReconciler.BASE_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0),
+            PaymentReconciler.MAX_BACKOFF_SECONDS,
+        )
+
+    @staticmethod
+    def due_payments(now=None) -> list:
+        """
+        Recent non-terminal payments whose backoff has elapsed.
+        args:
+            now: reference time (defaults to timezone.now())
+        returns: up to BATCH_SIZE payments, oldest first
+        """
+        now = now or timezone.now()
+        return list(
+            Payment.objects.filter(
+                status__in=PaymentReconciler.NON_TERMINAL_STATUSES,
+                created_at__gte=now - PaymentReconciler.RECONCILE_WINDOW,
+                is_deleted=False,
+            )
+            .filter(Q(reconcile_at__isnull=True) | Q(reconcile_at__lte=now))
+            .order_by("created_at")
+            .only("id", "wallet_id", "amount", "reference", "status",
+                  "reconcile_attempts")[:PaymentReconciler.BATCH_SIZE]
+        )
+
+    @staticmethod
+    def parse_status(data, code):
+        """
+        Extracts the deposit status from a PawaPay response.
+        args:
+            data: the response data
+            code: the response status code
+        returns: the lower-cased provider status, or None if unavailable
+        """
+        if code != 200:
+            return None
+        try:
+            return data["data"]["status"].lower()
+        except (KeyError, TypeError, AttributeError):
+            return None
+
+    @staticmethod
+    def apply_status(payment, remote_status) -> bool:
+        """
+        Stores the provider status of a payment and credits the wallet once
+        it completed. Both happen in one transaction holding the payment
+        row lock, the same lock the webhook worker takes, so a failed
+        credit leaves the payment pending for the next sweep.
+        args:
+            payment: the payment that was checked
+            remote_status: lower-cased status from PawaPay, or None
+        returns: True if the payment reached a terminal status
+        """
+        with transaction.atomic():
+            locked = (
+                Payment.objects.select_for_update()
+                .filter(id=payment.id).first()
+            )
+            if locked is None:
+                return True
+            if remote_status and remote_status not in (
+                    PaymentReconciler.NON_TERMINAL_STATUSES):
+                Payment.objects.filter(id=locked.id).update(
+                    status=remote_status, updated_at=timezone.now())
+                locked.status = remote_status
+                PaymentStatusService.publish_on_commit(
+                    locked.id, remote_status)
+            payment.status = locked.status
+
+            if locked.status == "completed" and locked.wallet_id is not None:
+                try:
+                    WalletTransactionService.cash_in(
+                        wallet=locked.wallet,
+                        amount=locked.amount,
+                        payment=locked,
+                        reference=locked.reference,
+                    )
+                except DuplicateTransaction:
+                    logger.info(f"Payment {locked.id} already credited")
+
+        return payment.status not in PaymentReconciler.NON_TERMINAL_STATUSES
+
+    @staticmethod
+    def _schedule_retry(payment, now, count_attempt=True):
+        if count_attempt:
+            payment.reconcile_attempts += 1
+        payment.reconcile_at = now + timedelta(
+            seconds=PaymentReconciler.backoff_seconds(
+                payment.reconcile_attempts))
+
+    @staticmethod
+    def reconcile(now=None) -> dict:
+        """
+        Checks every due payment with PawaPay and applies the results.
+        args:
+            now: reference time (defaults to timezone.now())
+        returns: counts of checked, resolved and still pending payments
+        """
+        now = now or timezone.now()
+        payments = PaymentReconciler.due_payments(now)
+        if not payments:
+            return {"checked": 0, "resolved": 0, "pending": 0}
+
+        responses = fetch_deposit_statuses(
+            [p.id for p in payments],
+            max_concurrency=PaymentReconciler.MAX_CONCURRENCY,
+        )
+
+        resolved = 0
+        retries = []
+        for payment in payments:
+            data, code = responses[str(payment.id)]
+            if code == 429:
+                # Throttled before reaching PawaPay; says nothing about the
+                # payment, so it is retried without growing its backoff
+                PaymentReconciler._schedule_retry(
+                    payment, now, count_attempt=False)
+                retries.append(payment)
+                continue
+            remote_status = PaymentReconciler.parse_status(data, code)
+            try:
+                done = PaymentReconciler.apply_status(payment, remote_status)
+            except Exception as e:
+                logger.error(f"Error reconciling payment {payment.id}: {str(e)}")
+                done = False
+            if done:
+                resolved += 1
+            else:
+                PaymentReconciler._schedule_retry(payment, now)
+                retries.append(payment)
+        Payment.objects.bulk_update(
+            retries, ["reconcile_at", "reconcile_attempts"])
+
+        return {
+            "checked": len(payments),
+            "resolved": resolved,
+            "pending": len(payments) - resolved,
+        }
@@ -0,0 +1,119 @@
+"""
+Scheduling of PawaPay callback resends for deposits stuck in a
+non-final status. Each payment carries its own next_check_at/check_attempts
+so a run only touches payments that are due, backs off exponentially per
+payment and gives up once the payment is older than the horizon.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Q
+from django.utils import timezone
+from apps.payments.models import Payment, PaymentStatus
+
+
+class DepositResendScheduler:
+    PENDING_STATUSES = [
+        "pending",
+        "submitted",
+        "accepted",
+        "processing",
+        "in_reconciliation",
+    ]
+    BASE_DELAY = timedelta(minutes=5)
+    MAX_DELAY = timedelta(hours=6)
+    CHUNK_SIZE = 500
+    # Upper bound of tasks enqueued by one run
+    MAX_PER_RUN = 1000
+    # How long an enqueued resend blocks another one for the same payment
+    IN_FLIGHT_TTL = 30 * 60
+    IN_FLIGHT_PREFIX = "payments:resend-in-flight"
+
+    @staticmethod
+    def horizon() -> timedelta:
+        """Age after which a pending deposit is expired instead of retried."""
+        return timedelta(
+            hours=getattr(settings, "PAYMENT_RESEND_HORIZON_HOURS", 48))
+
+    @staticmethod
+    def delay_for(attempts: int) -> timedelta:
+        """
+        Backoff before the next resend of a payment.
+        args:
+            attempts: resends already requested for the payment
+        returns: BASE_DELAY doubled per attempt, capped at MAX_DELAY
+        """
+        delay = DepositResendScheduler.BASE_DELAY * 2 ** min(attempts, 16)
+        return min(delay, DepositResendScheduler.MAX_DELAY)
+
+    @staticmethod
+    def in_flight_key(payment_id) -> str:
+        return f"{DepositResendScheduler.IN_FLIGHT_PREFIX}:{payment_id}"
+
+    @staticmethod
+    def release(payment_id):
+        """Marks the resend of a payment as finished."""
+        cache.delete(DepositResendScheduler.in_flight_key(payment_id))
+
+    @staticmethod
+    def expire_stale(now=None) -> int:
+        """
+        Moves pending deposits older than the horizon to EXPIRED. A late
+        final callback still overrides the status.
+        args:
+            now: reference time (defaults to timezone.now())
+        returns: the number of expired payments
+        """
+        now = now or timezone.now()
+        return Payment.objects.filter(
+            status__in=DepositResendScheduler.PENDING_STATUSES,
+            created_at__lt=now - DepositResendScheduler.horizon(),
+        ).update(
+            status=PaymentStatus.EXPIRED, next_check_at=None, updated_at=now)
+
+    @staticmethod
+    def claim_due(now=None) -> list:
+        """
+        Picks the payments due for a resend and pushes their next_check_at
+        forward, skipping those with a resend still in flight.
+        args:
+            now: reference time (defaults to timezone.now())
+        returns: ids of the claimed payments, at most MAX_PER_RUN
+        """
+        now = now or timezone.now()
+        due = (
+            Payment.objects.filter(
+                status__in=DepositResendScheduler.PENDING_STATUSES,
+                is_deleted=False,
+            )
+            .filter(Q(next_check_at__isnull=True) | Q(next_check_at__lte=now))
+            .order_by(F("next_check_at").asc(nulls_first=True), "created_at")
+            .only("id", "check_attempts")
+        )[:DepositResendScheduler.MAX_PER_RUN]
+
+        claimed = []
+        chunk = []
+        for payment in due.iterator(chunk_size=DepositResendScheduler.CHUNK_SIZE):
+            if not cache.add(
+                DepositResendScheduler.in_flight_key(payment.id),
+                1,
+                timeout=DepositResendScheduler.IN_FLIGHT_TTL,
+            ):
+                continue
+            payment.next_check_at = now + DepositResendScheduler.delay_for(
+                payment.check_attempts)
+            payment.check_attempts += 1
+            chunk.append(payment)
+            if len(chunk) == DepositResendScheduler.CHUNK_SIZE:
+                DepositResendScheduler._save(chunk)
+                claimed.extend(p.id for p in chunk)
+                chunk = []
+        if chunk:
+            DepositResendScheduler._save(chunk)
+            claimed.extend(p.id for p in chunk)
+        return claimed
+
+    @staticmethod
+    def _save(payments):
+        Payment.objects.bulk_update(
+            payments, ["next_check_at", "check_attempts"])
@@ -0,0 +1,199 @@
+"""
+Payment statistics for admin reports. Settled hours are read from the
+precomputed PaymentStatsBucket rows; only the edges of the range and the
+recent, still-changing hours are aggregated live, all in one query.
+Results are cached per (range, granularity).
+"""
+from datetime import timedelta, timezone as dt_timezone
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+from apps.payments.models import (
+    PAYMENT_STATS_AMOUNTS,
+    PAYMENT_STATS_COUNTS,
+    Payment,
+    PaymentStatsBucket,
+    payment_stats_aggregates,
+    summarize_payment_stats,
+)
+from apps.payments.services.resend_scheduler import DepositResendScheduler
+
+FIELDS = PAYMENT_STATS_COUNTS + PAYMENT_STATS_AMOUNTS
+
+
+class PaymentStatsService:
+    GRANULARITIES = ["hour", "day"]
+    # Settled hours rebuilt on every run to pick up late callbacks
+    REBUILD_OVERLAP = timedelta(days=1)
+    OPEN_TTL = 60
+    CLOSED_TTL = 24 * 60 * 60
+    KEY_PREFIX = "payments:stats"
+
+    @staticmethod
+    def _floor_hour(value):
+        return value.astimezone(dt_timezone.utc).replace(
+            minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def _ceil_hour(value):
+        floor = PaymentStatsService._floor_hour(value)
+        return floor if floor == value else floor + timedelta(hours=1)
+
+    @staticmethod
+    def settled_before(now=None):
+        """
+        Start of the first hour whose payments may still change status.
+        Pending deposits older than the resend horizon are expired, so
+        earlier hours are final.
+        """
+        now = now or timezone.now()
+        return PaymentStatsService._floor_hour(
+            now - DepositResendScheduler.horizon())
+
+    @staticmethod
+    def watermark():
+        """End of the hours covered by buckets, or None if none are built."""
+        return cache.get(f"{PaymentStatsService.KEY_PREFIX}:watermark")
+
+    @staticmethod
+    def _hourly(queryset):
+        return (
+            queryset
+            .annotate(hour=TruncHour("created_at", tzinfo=dt_timezone.utc))
+            .values("hour", "currency")
+            .annotate(**payment_stats_aggregates())
+            .order_by()
+        )
+
+    @staticmethod
+    def build_buckets(now=None) -> int:
+        """
+        Aggregates the settled hours since the last build (minus
+        REBUILD_OVERLAP) into buckets and moves the watermark forward.
+        args:
+            now: reference time (defaults to timezone.now())
+        returns: the number of buckets written
+        """
+        cutoff = PaymentStatsService.settled_before(now)
+        watermark = PaymentStatsService.watermark()
+        payments = Payment.objects.filter(created_at__lt=cutoff)
+        buckets = PaymentStatsBucket.objects.filter(hour__lt=cutoff)
+        if watermark is not None:
+            start = watermark - PaymentStatsService.REBUILD_OVERLAP
+            payments = payments.filter(created_at__gte=start)
+            buckets = buckets.filter(hour__gte=start)
+
+        rows = [
+            PaymentStatsBucket(
+                hour=row["hour"], currency=row["currency"],
+                **{field: row[field] or 0 for field in FIELDS},
+            )
+            for row in PaymentStatsService._hourly(payments)
+        ]
+        with transaction.atomic():
+            buckets.delete()
+            PaymentStatsBucket.objects.bulk_create(rows)
+        cache.set(
+            f"{PaymentStatsService.KEY_PREFIX}:watermark", cutoff, timeout=None)
+        return len(rows)
+
+    @staticmethod
+    def hourly_rows(start, end) -> list:
+        """
+        Per-hour, per-currency totals of payments created in [start, end).
+        args:
+            start: range start, or None for all time
+            end: range end
+        returns: list of dicts with hour, currency and the stats fields
+        """
+        watermark = PaymentStatsService.watermark()
+        bucket_start = start and PaymentStatsService._ceil_hour(start)
+        bucket_end = watermark and min(
+            watermark, PaymentStatsService._floor_hour(end))
+
+        if bucket_end is None or (
+            bucket_start is not None and bucket_start >= bucket_end
+        ):
+            live = Q(created_at__lt=end)
+            if start is not None:
+                live &= Q(created_at__gte=start)
+            return list(PaymentStatsService._hourly(
+                Payment.objects.filter(live)))
+
+        buckets = PaymentStatsBucket.objects.filter(hour__lt=bucket_end)
+        live = Q(created_at__gte=bucket_end, created_at__lt=end)
+        if bucket_start is not None:
+            buckets = buckets.filter(hour__gte=bucket_start)
+            live |= Q(created_at__gte=start, created_at__lt=bucket_start)
+        rows = list(buckets.values("hour", "currency", *FIELDS))
+        rows.extend(PaymentStatsService._hourly(Payment.objects.filter(live)))
+        return rows
+
+    @staticmethod
+    def _period(hour, granularity):
+        if granularity == "day":
+            return timezone.localdate(hour).isoformat()
+        return hour.isoformat()
+
+    @staticmethod
+    def _add(totals, row):
+        for field in FIELDS:
+            totals[field] = totals.get(field, 0) + (row[field] or 0)
+
+    @staticmethod
+    def get(start=None, end=None, granularity="day") -> dict:
+        """
+        Payment statistics for payments created in [start, end).
+        args:
+            start: range start, or None for all time
+            end: range end, defaults to now
+            granularity: "hour" or "day" for the series
+        returns: dict with totals, by_currency and series
+        raises: ValueError for an unknown granularity
+        """
+        if granularity not in PaymentStatsService.GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        key = ":".join([
+            PaymentStatsService.KEY_PREFIX,
+            start.isoformat() if start else "all",
+            end.isoformat() if end else "now",
+            granularity,
+        ])
+        stats = cache.get(key)
+        if stats is not None:
+            return stats
+
+        end = end or timezone.now()
+        totals, currencies, periods = {}, {}, {}
+        for row in PaymentStatsService.hourly_rows(start, end):
+            PaymentStatsService._add(totals, row)
+            PaymentStatsService._add(
+                currencies.setdefault(row["currency"], {}), row)
+            PaymentStatsService._add(periods.setdefault(
+                PaymentStatsService._period(row["hour"], granularity), {}), row)
+
+        stats = {
+            "totals": summarize_payment_stats(totals),
+            "by_currency": sorted(
+                (
+                    {"currency": currency, **summarize_payment_stats(values)}
+                    for currency, values in currencies.items()
+                ),
+                key=lambda item: item["successful_amount"],
+                reverse=True,
+            ),
+            "series": [
+                {"period": period, **summarize_payment_stats(values)}
+                for period, values in sorted(periods.items())
+            ],
+        }
+        watermark = PaymentStatsService.watermark()
+        closed = watermark is not None and end <= watermark
+        cache.set(
+            key, stats,
+            timeout=PaymentStatsService.CLOSED_TTL if closed
+            else PaymentStatsService.OPEN_TTL,
+        )
+        return stats
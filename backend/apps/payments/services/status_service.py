@@ -0,0 +1,147 @@
+"""
+Payment status notifications. Webhook processing publishes every status
+change on a per-payment Redis pub/sub channel, and long-polling status
+requests block on that channel instead of asking PawaPay again, for at
+most MAX_WAIT_SECONDS since every wait occupies a WSGI worker. Terminal
+statuses are cached so repeated polls never reach the database.
+"""
+import logging
+import threading
+import time
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class _LocalBroker:
+    """In-process stand-in for Redis pub/sub when Redis is unavailable."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._messages = {}
+
+    def publish(self, channel, message):
+        with self._condition:
+            self._messages[channel] = (time.monotonic(), message)
+            self._condition.notify_all()
+
+    def wait(self, channel, timeout, since):
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                sent_at, message = self._messages.get(channel, (None, None))
+                if sent_at is not None and sent_at >= since:
+                    return message
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+
+_local_broker = _LocalBroker()
+
+
+class PaymentStatusService:
+    FINAL_STATUSES = ["completed", "failed", "rejected"]
+    TERMINAL_TTL = 24 * 60 * 60
+    # Window in which concurrent pollers share one upstream check
+    UPSTREAM_CHECK_TTL = 30
+    # Each waiting poll holds a sync gunicorn worker, so waits stay short
+    # and clients re-poll; a few patrons waiting cannot drain the pool
+    MAX_WAIT_SECONDS = 5
+    KEY_PREFIX = "payments:status"
+
+    @staticmethod
+    def _key(payment_id, suffix="") -> str:
+        key = f"{PaymentStatusService.KEY_PREFIX}:{payment_id}"
+        return f"{key}:{suffix}" if suffix else key
+
+    @staticmethod
+    def channel(payment_id) -> str:
+        return cache.make_key(PaymentStatusService._key(payment_id, "events"))
+
+    @staticmethod
+    def cached_status(payment_id):
+        """The payment's terminal status if it is known, else None."""
+        return cache.get(PaymentStatusService._key(payment_id))
+
+    @staticmethod
+    def remember(payment_id, status):
+        """Caches the status if it is terminal."""
+        if status in PaymentStatusService.FINAL_STATUSES:
+            cache.set(
+                PaymentStatusService._key(payment_id), status,
+                timeout=PaymentStatusService.TERMINAL_TTL)
+
+    @staticmethod
+    def publish(payment_id, status):
+        """
+        Notifies pollers waiting on a payment of its new status.
+        args:
+            payment_id: the payment's id
+            status: the status it moved to
+        """
+        PaymentStatusService.remember(payment_id, status)
+        channel = PaymentStatusService.channel(payment_id)
+        try:
+            from django_redis import get_redis_connection
+            get_redis_connection("default").publish(channel, status)
+        except Exception as e:
+            logger.warning(f"Redis publish failed, using local broker: {e}")
+            _local_broker.publish(channel, status)
+
+    @staticmethod
+    def publish_on_commit(payment_id, status):
+        """Publishes once the surrounding transaction commits."""
+        transaction.on_commit(
+            lambda: PaymentStatusService.publish(payment_id, status))
+
+    @staticmethod
+    def claim_upstream_check(payment_id) -> bool:
+        """
+        Single-flight guard: only the first of concurrent pollers gets to
+        ask PawaPay, the others wait for the outcome to be published.
+        returns: True if the caller should make the upstream check
+        """
+        return cache.add(
+            PaymentStatusService._key(payment_id, "upstream"), 1,
+            timeout=PaymentStatusService.UPSTREAM_CHECK_TTL)
+
+    @staticmethod
+    def wait_for_status(payment_id, timeout):
+        """
+        Blocks until a status is published for the payment.
+        args:
+            payment_id: the payment's id
+            timeout: seconds to wait, capped at MAX_WAIT_SECONDS
+        returns: the published status, or None on timeout
+        """
+        timeout = min(timeout, PaymentStatusService.MAX_WAIT_SECONDS)
+        channel = PaymentStatusService.channel(payment_id)
+        since = time.monotonic()
+        try:
+            from django_redis import get_redis_connection
+            pubsub = get_redis_connection("default").pubsub(
+                ignore_subscribe_messages=True)
+            pubsub.subscribe(channel)
+        except Exception as e:
+            logger.warning(f"Redis subscribe failed, using local broker: {e}")
+            return _local_broker.wait(channel, timeout, since)
+
+        try:
+            # Subscribed first so a status published meanwhile is not missed
+            cached = PaymentStatusService.cached_status(payment_id)
+            if cached:
+                return cached
+            deadline = since + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                message = pubsub.get_message(timeout=remaining)
+                if message and message["type"] == "message":
+                    data = message["data"]
+                    return data.decode() if isinstance(data, bytes) else data
+        finally:
+            pubsub.close()
@@ -0,0 +1,129 @@
+"""
+Processing of persisted provider callbacks. The webhook endpoint only
+stores the raw callback as a ``received`` PaymentWebhookLog; the work of
+applying it to the payment and crediting the wallet happens here, on a
+Celery worker.
+"""
+import json
+import logging
+import time
+from django.db import transaction
+from django.utils import timezone
+from apps.payments.models import Payment, PaymentWebhookLog
+from apps.payments.services.status_service import PaymentStatusService
+from apps.wallets.services.wallet_services import WalletTransactionService
+from utils.exceptions import DuplicateTransaction
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookProcessingService:
+    # Callback statuses that must not overwrite the payment's current state
+    SKIP_STATUSES = [
+        "pending",
+        "submitted",
+        "accepted",
+        "processing",
+        "in_reconciliation",
+    ]
+
+    @staticmethod
+    def process_payment(payment_id) -> int:
+        """
+        Applies every received callback of a payment, oldest first.
+        Each log is handled in its own transaction holding the payment row
+        lock, so callbacks of one payment never interleave across workers.
+        The wallet credit runs inside that transaction, so a failed credit
+        rolls back the status change with it; on PostgreSQL the wallet's
+        advisory lock is therefore held until the callback commits. Only
+        this path locks payment rows and it always does so before the
+        wallet, so the wider scope cannot deadlock.
+        args:
+            payment_id: id of the payment whose callbacks to process
+        returns: the number of callbacks handled
+        """
+        handled = 0
+        while True:
+            with transaction.atomic():
+                payment = (
+                    Payment.objects.select_for_update()
+                    .filter(id=payment_id).first()
+                )
+                if payment is None:
+                    return handled
+                log = (
+                    PaymentWebhookLog.objects.select_for_update()
+                    .filter(payment=payment, status="received")
+                    .order_by("created_at", "id")
+                    .first()
+                )
+                if log is None:
+                    return handled
+                WebhookProcessingService.process_log(log, payment)
+                handled += 1
+
+    @staticmethod
+    def process_log(log, payment):
+        """
+        Applies one callback to its payment and records the outcome on
+        the log. Must be called inside a transaction holding the payment
+        lock.
+        args:
+            log: the received PaymentWebhookLog
+            payment: the locked Payment the callback belongs to
+        """
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                WebhookProcessingService._apply(log, payment)
+        except Exception as e:
+            logger.error(f"Error processing webhook {log.id}: {str(e)}")
+            log.status = "failed"
+            log.error_message = str(e)
+
+        log.processed_at = timezone.now()
+        log.processing_time_ms = (time.perf_counter() - started) * 1000
+        log.save(update_fields=[
+            "status", "event_type", "error_message", "parsed_payload",
+            "processed_at", "processing_time_ms", "updated_at",
+        ])
+
+    @staticmethod
+    def _apply(log, payment):
+        payload = log.parsed_payload or json.loads(log.raw_payload)
+        log.parsed_payload = payload
+
+        # Provider retries that raced past the endpoint's duplicate check
+        if log.external_id and PaymentWebhookLog.objects.filter(
+            external_id=log.external_id, status="processed"
+        ).exclude(id=log.id).exists():
+            log.status = "ignored"
+            return
+
+        res_status = payload["status"].lower()
+        if res_status == "completed" and payment.wallet_id is not None:
+            # Every crediting path uses the payment reference, so the unique
+            # reference turns a second credit into DuplicateTransaction
+            try:
+                WalletTransactionService.cash_in(
+                    wallet=payment.wallet,
+                    amount=payment.amount,
+                    payment=payment,
+                    reference=payment.reference,
+                )
+            except DuplicateTransaction:
+                logger.info(
+                    f"Payment {payment.id} already credited, "
+                    f"webhook {log.id} skipped the cash-in"
+                )
+
+        # Dont update status if pending/submitted/accepted to
+        # avoid overwriting final state
+        if res_status in WebhookProcessingService.SKIP_STATUSES:
+            res_status = payment.status
+        payment.status = res_status
+        payment.save()
+
+        log.event_type = f"deposit.{res_status}"
+        log.status = "processed"
+        PaymentStatusService.publish_on_commit(payment.id, res_status)
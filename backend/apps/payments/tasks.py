@@ -1,6 +1,20 @@
+import logging
+from datetime import timedelta
 from celery import shared_task
-from apps.payments.models import Payment
-from utils.external_requests import resend_callback
+from celery.schedules import crontab
+from django.utils import timezone
+from apps.payments.models import Payment, PaymentWebhookLog
+from apps.payments.services.payment_reconciler import PaymentReconciler
+from apps.payments.services.resend_scheduler import DepositResendScheduler
+from apps.payments.services.stats_service import PaymentStatsService
+from apps.payments.services.webhook_service import WebhookProcessingService
+from config.celery import app
+from utils.external_requests import PawaPayClient, resend_callback
+
+logger = logging.getLogger(__name__)
+
+# Received callbacks older than this are assumed to have lost their task
+STALE_WEBHOOK_AFTER = timedelta(minutes=5)
 
 
 @shared_task(bind=True, max_retries=5, default_retry_delay=300)
@@ -9,13 +23,16 @@ def resend_deposit_callback(self, payment_id):
         payment = Payment.objects.filter(id=payment_id).first()
 
         if not payment:
+            DepositResendScheduler.release(payment_id)
             return "No Payment Found"
 
-        data, code = resend_callback(str(payment.id))
+        data, code = resend_callback(
+            str(payment.id), priority=PawaPayClient.BACKGROUND)
 
         if code != 200:
             raise Exception("Retry")
 
+        DepositResendScheduler.release(payment.id)
         return "Callback resent"
 
     except Exception as exc:
@@ -24,9 +41,139 @@ def resend_deposit_callback(self, payment_id):
 
 @shared_task
 def resend_pending_deposits():
-    pending = Payment.objects.filter(
-        status__in=["pending", "accepted", "submitted", "processing", "in_reconciliation"]
+    """
+    Expire deposits pending past the horizon and enqueue a callback
+    resend for the ones whose backoff has elapsed.
+
+    Returns:
+        str: Status message with the number of resends and expired payments
+    """
+    expired = DepositResendScheduler.expire_stale()
+    payment_ids = DepositResendScheduler.claim_due()
+
+    for payment_id in payment_ids:
+        resend_deposit_callback.delay(payment_id)
+
+    logger.info(
+        f"Enqueued {len(payment_ids)} callback resends, "
+        f"expired {expired} payments"
+    )
+    return (
+        f"Enqueued {len(payment_ids)} callback resends, "
+        f"expired {expired} payments"
+    )
+
+
+# Schedule pending deposit resends to run every 10 minutes
+@app.on_after_finalize.connect
+def setup_resend_pending_deposits_task(sender, **kwargs):
+    """Schedule the pending deposit resend task to run every 10 minutes."""
+    sender.add_periodic_task(
+        crontab(minute="*/10"),
+        resend_pending_deposits.s(),
+        name='Resend callbacks of pending deposits every 10 minutes'
+    )
+
+
+@shared_task
+def process_payment_webhooks(payment_id):
+    """
+    Apply the received callbacks of a payment in arrival order.
+    Routed to the ``webhooks`` queue.
+
+    Returns:
+        str: Status message with the number of callbacks handled
+    """
+    handled = WebhookProcessingService.process_payment(payment_id)
+    logger.info(f"Processed {handled} webhooks for payment {payment_id}")
+    return f"Processed {handled} webhooks"
+
+
+@shared_task
+def process_stale_webhooks():
+    """
+    Re-enqueue processing for payments whose callbacks are still
+    ``received`` after STALE_WEBHOOK_AFTER, e.g. when the broker lost the
+    original task.
+
+    Returns:
+        str: Status message with the number of payments re-enqueued
+    """
+    cutoff = timezone.now() - STALE_WEBHOOK_AFTER
+    payment_ids = (
+        PaymentWebhookLog.objects.filter(
+            status="received", created_at__lt=cutoff, payment__isnull=False)
+        .values_list("payment_id", flat=True)
+        .distinct()
     )
+    count = 0
+    for payment_id in payment_ids:
+        process_payment_webhooks.delay(str(payment_id))
+        count += 1
+    return f"Re-enqueued webhooks for {count} payments"
 
-    for payment in pending:
-        resend_deposit_callback.delay(payment.id)
+
+# Schedule the stale webhook sweep to run every 5 minutes
+@app.on_after_finalize.connect
+def setup_stale_webhooks_task(sender, **kwargs):
+    """Schedule the stale webhook sweep to run every 5 minutes."""
+    sender.add_periodic_task(
+        crontab(minute="*/5"),
+        process_stale_webhooks.s(),
+        name='Re-enqueue stale payment webhooks every 5 minutes'
+    )
+
+
+@shared_task
+def reconcile_payment_statuses():
+    """
+    Sync recent non-terminal deposits with PawaPay and credit wallets of
+    the ones that completed.
+
+    Returns:
+        str: Status message with the number of payments checked and resolved
+    """
+    result = PaymentReconciler.reconcile()
+    logger.info(
+        f"Reconciled {result['checked']} payments, "
+        f"{result['resolved']} resolved"
+    )
+    return (
+        f"Reconciled {result['checked']} payments, "
+        f"{result['resolved']} resolved"
+    )
+
+
+# Schedule the payment reconciler to run every 2 minutes
+@app.on_after_finalize.connect
+def setup_reconcile_payments_task(sender, **kwargs):
+    """Schedule the payment status reconciler to run every 2 minutes."""
+    sender.add_periodic_task(
+        crontab(minute="*/2"),
+        reconcile_payment_statuses.s(),
+        name='Reconcile pending payment statuses every 2 minutes'
+    )
+
+
+@shared_task
+def build_payment_stats_buckets():
+    """
+    Precompute hourly payment statistics for settled hours.
+
+    Returns:
+        str: Status message with the number of buckets written
+    """
+    built = PaymentStatsService.build_buckets()
+    logger.info(f"Built {built} payment stats buckets")
+    return f"Built {built} payment stats buckets"
+
+
+# Schedule the stats bucket build to run every hour
+@app.on_after_finalize.connect
+def setup_build_payment_stats_task(sender, **kwargs):
+    """Schedule the payment stats bucket build to run every hour."""
+    sender.add_periodic_task(
+        crontab(minute=5),
+        build_payment_stats_buckets.s(),
+        name='Build payment stats buckets every hour'
+    )
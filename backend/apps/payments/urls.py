@@ -1,5 +1,5 @@
 from django.urls import path
-from apps.payments.views import DepositAPIView
+from apps.payments.views import DepositAPIView, PawaPayMetricsAPIView
 from apps.payments.webhooks import WebhookAPIView, PaymentStatusAPIView
 
 app_name = "payments"
@@ -7,6 +7,11 @@ app_name = "payments"
 urlpatterns = [
     path("deposits/<uuid:wallet_id>/", DepositAPIView.as_view(), name="deposit"),
     path("webhook/", WebhookAPIView.as_view(), name="webhook"),
+    path(
+        "pawapay/metrics/",
+        PawaPayMetricsAPIView.as_view(),
+        name="pawapay_metrics",
+    ),
     path(
         "status/<uuid:payment_id>/",
         PaymentStatusAPIView.as_view(),
@@ -6,11 +6,12 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from apps.payments.serializers import PaymentSerializer
 from apps.wallets.models import Wallet
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from utils.authentication import RequireAPIKey
-from utils.external_requests import pawapay_request
-from drf_spectacular.utils import extend_schema
+from utils.external_requests import pawapay_client, pawapay_request
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 from utils import serializers as helpers
+from utils.idempotency import idempotent
 
 User = get_user_model()
 
@@ -22,6 +23,18 @@ class DepositAPIView(APIView):
     @extend_schema(
         operation_id="send_tip",
         summary="Send Tip",
+        parameters=[
+            OpenApiParameter(
+                name="Idempotency-Key",
+                type=str,
+                location=OpenApiParameter.HEADER,
+                required=False,
+                description=(
+                    "Client-generated key; repeats within 24h replay the "
+                    "first response instead of creating a new deposit"
+                ),
+            )
+        ],
         responses={
             201: helpers.CreatedResponseSerializer,
             400: helpers.ValidationErrorSerializer,
@@ -33,6 +46,7 @@ class DepositAPIView(APIView):
             500: helpers.ServerErrorSerializer,
         }
     )
+    @idempotent("deposit")
     def post(self, request, wallet_id):
         """
         Creates a tip intent and initiates a Mobile Money payment request. This
@@ -45,6 +59,9 @@ class DepositAPIView(APIView):
         Optional:Authenticated patron(future).
 
         If guest is supported, return a receipt without attaching a user identity.
+
+        Send an Idempotency-Key header to make retries safe: a repeat with
+        the same key and body returns the original response.
         """
         serializer = PaymentSerializer(data=request.data)
         if serializer.is_valid():
@@ -60,7 +77,19 @@ class DepositAPIView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             wallet = get_object_or_404(Wallet, id=wallet_id)
-            
+
+            # Fail fast while PawaPay is degraded instead of creating a
+            # payment and waiting out the timeout. A half open breaker
+            # passes, so the deposit call itself can be the probe
+            if not pawapay_client.is_available("POST", "/v2/deposits/"):
+                return Response(
+                    {
+                        "status": "failed",
+                        "error": "service_unavailable",
+                    },
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+
             with transaction.atomic():
                 payment = serializer.save(wallet=wallet)
 
@@ -108,3 +137,16 @@ class DepositAPIView(APIView):
             },
             status=status.HTTP_400_BAD_REQUEST
         )
+
+
+class PawaPayMetricsAPIView(APIView):
+    """Admin-only view of PawaPay client latency, breakers and limiter"""
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(exclude=True)
+    def get(self, request):
+        return Response(
+            {"status": "success", "data": pawapay_client.metrics()},
+            status=status.HTTP_200_OK
+        )
@@ -1,6 +1,6 @@
 import json
-from django.db import transaction
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema
@@ -8,9 +8,9 @@ from rest_framework.permissions import AllowAny
 from rest_framework.views import APIView
 from apps.payments.models import Payment
 from apps.payments.models import PaymentWebhookLog as WebHook
-from apps.wallets.services.wallet_services import WalletTransactionService
+from apps.payments.services.status_service import PaymentStatusService
+from apps.payments.tasks import process_payment_webhooks
 from utils.authentication import RequireAPIKey
-from utils.exceptions import DuplicateTransaction
 from utils.external_requests import resend_callback
 
 User = get_user_model()
@@ -32,7 +32,7 @@ class WebhookAPIView(APIView):
             )
 
         deposit_id = payload.get("depositId")
-        res_status = payload.get("status").lower()
+        res_status = (payload.get("status") or "").lower()
         external_id = payload.get("providerTransactionId")
 
         if not all([deposit_id, res_status]):
@@ -40,58 +40,34 @@ class WebhookAPIView(APIView):
                 {"error": "Invalid payload"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        res_status = res_status.lower()
-
         # IDEMPOTENCY CHECK (fast path) - check for duplicate based on external_id
         if external_id and WebHook.objects.filter(external_id=external_id).exists():
             return Response(
                 {"message": "Duplicate callback ignored"}, status=status.HTTP_200_OK
             )
         try:
-            with transaction.atomic():
-                payment = Payment.objects.select_for_update().get(id=deposit_id)
-                # Dont update status if pending/submitted/accepted to
-                # avoid overwriting final state
-                skip_statuses = [
-                    "pending",
-                    "submitted",
-                    "accepted",
-                    "processing",
-                    "in_reconciliation",
-                ]
-                if res_status in skip_statuses:
-                    res_status = payment.status
-                payment.status = res_status
-                payment.save()
-
-                # Create webhook log ONCE
-                WebHook.objects.create(
-                    parsed_payload=payload,
-                    event_type=f"deposit.{res_status}",
-                    payment=payment,
-                    provider=payment.provider,
-                    external_id=external_id,
-                )
-                if res_status == "completed" and payment.wallet is not None:
-                    try:
-                        WalletTransactionService.cash_in(
-                            wallet=payment.wallet,
-                            amount=payment.amount,
-                            payment=payment,
-                            reference=external_id,
-                        )
-                    except DuplicateTransaction:
-                        pass
-
+            payment = Payment.objects.only("id", "provider").get(id=deposit_id)
         except Payment.DoesNotExist:
             return Response({"status": "NOT_FOUND"}, status=status.HTTP_404_NOT_FOUND)
-
-        except Exception:
-            # If unique constraint triggered by race condition
+        except (ValidationError, ValueError):
             return Response(
-                {"message": "Duplicate callback ignored"}, status=status.HTTP_200_OK
+                {"error": "Invalid payload"}, status=status.HTTP_400_BAD_REQUEST
             )
-        return Response({"message": "Callback processed"}, status=status.HTTP_200_OK)
+
+        # Persist and acknowledge; the payment update and wallet credit
+        # run on the webhooks worker, in arrival order per payment
+        WebHook.objects.create(
+            raw_payload=request.body.decode("utf-8"),
+            parsed_payload=payload,
+            event_type=f"deposit.{res_status}",
+            payment=payment,
+            provider=payment.provider,
+            external_id=external_id or "",
+            status="received",
+        )
+        process_payment_webhooks.delay(str(payment.id))
+
+        return Response({"message": "Callback received"}, status=status.HTTP_200_OK)
 
 
 class PaymentStatusAPIView(APIView):
@@ -103,14 +79,25 @@ class PaymentStatusAPIView(APIView):
     @extend_schema(
         operation_id="retrieve_payment_status",
         summary="Retrieve Payment Status",
-        description="Get payment status by deposit ID",
+        description=(
+            "Get payment status by deposit ID. Pass ?wait=<seconds> (up to "
+            "5) to long-poll: the request returns as soon as the payment's "
+            "status changes, or with the current status on timeout. Poll "
+            "again to keep waiting."
+        ),
         parameters=[
             {
                 "name": "deposit_id",
                 "description": "ID of the deposit to check status for",
                 "required": True,
                 "type": "string (uuid)",
-            }
+            },
+            {
+                "name": "wait",
+                "description": "Seconds to wait for a status change",
+                "required": False,
+                "type": "integer",
+            },
         ],
         responses={
             200: {"description": "Payment status retrieved successfully"},
@@ -119,29 +106,46 @@ class PaymentStatusAPIView(APIView):
     )
     def get(self, request, payment_id):
         try:
-            payment = Payment.objects.get(id=str(payment_id))
-            final_statuses = ["completed", "failed", "rejected"]
-            if payment.status in final_statuses:
-                return Response({"status": payment.status}, status=status.HTTP_200_OK)
-            # Check if payment has received a callback before returning status
-            if not WebHook.objects.filter(
-                payment=payment,
-                event_type__in=[
-                    "deposit.completed",
-                    "deposit.failed",
-                    "deposit.rejected",
-                ],
-            ).exists():
-                data, code = resend_callback(str(payment_id))
+            wait = max(0, int(request.query_params.get("wait", 0)))
+        except ValueError:
+            wait = 0
+
+        cached = PaymentStatusService.cached_status(payment_id)
+        if cached:
+            return Response({"status": cached}, status=status.HTTP_200_OK)
+        try:
+            payment = Payment.objects.only("id", "status").get(id=str(payment_id))
+        except Payment.DoesNotExist:
+            return Response({"status": "NOT_FOUND"}, status=status.HTTP_404_NOT_FOUND)
+
+        if payment.status in PaymentStatusService.FINAL_STATUSES:
+            PaymentStatusService.remember(payment.id, payment.status)
+            return Response({"status": payment.status}, status=status.HTTP_200_OK)
+
+        # Check if payment has received a callback before returning status.
+        # Concurrent pollers share a single upstream check.
+        if not WebHook.objects.filter(
+            payment=payment,
+            event_type__in=[
+                "deposit.completed",
+                "deposit.failed",
+                "deposit.rejected",
+            ],
+        ).exists() and PaymentStatusService.claim_upstream_check(payment.id):
+            data, code = resend_callback(str(payment_id))
+            if not wait:
                 if code == 200:
                     return Response(
                         {"status": data["status"].lower()}, status=status.HTTP_200_OK
                     )
-                else:
-                    return Response(
-                        {"status": "error"},
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    )
-            return Response({"status": payment.status}, status=status.HTTP_200_OK)
-        except Payment.DoesNotExist:
-            return Response({"status": "NOT_FOUND"}, status=status.HTTP_404_NOT_FOUND)
+                return Response(
+                    {"status": "error"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+
+        if wait:
+            published = PaymentStatusService.wait_for_status(payment.id, wait)
+            if published:
+                return Response({"status": published}, status=status.HTTP_200_OK)
+            payment.refresh_from_db(fields=["status"])
+        return Response({"status": payment.status}, status=status.HTTP_200_OK)
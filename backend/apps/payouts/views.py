@@ -7,6 +7,7 @@ from django.views.decorators.http import require_http_methods
 
 from apps.wallets.models import Wallet, WalletTransaction
 from apps.payments.services.payout_orchestrator import PayoutOrchestrator
+from apps.wallets.services.wallet_services import WalletRollupService
 from utils.send_emails import send_missing_payout_account_email
 
 
@@ -216,11 +217,10 @@ def stats(request):
     Shows creator counts, wallet statistics, payment statistics, etc.
     """
     from django.db.models import Sum, Count, Avg, Q
-    from django.db.models.functions import Abs
     from django.utils import timezone
     from datetime import timedelta
     from apps.creators.models import CreatorProfile
-    from apps.payments.models import Payment
+    from apps.payments.services.stats_service import PaymentStatsService
     
     # Creator statistics
     total_creators = CreatorProfile.objects.count()
@@ -232,43 +232,16 @@ def stats(request):
     total_balance = Wallet.objects.aggregate(Sum("balance"))["balance__sum"] or 0
     avg_balance = Wallet.objects.aggregate(Avg("balance"))["balance__avg"] or 0
     
-    # Transaction statistics (last 30 days)
+    # Transaction statistics (last 30 days) from the daily rollups
     thirty_days_ago = timezone.now() - timedelta(days=30)
-    cash_in_txns = WalletTransaction.objects.filter(
-        transaction_type="CASH_IN",
-        created_at__gte=thirty_days_ago
-    )
-    payout_txns = WalletTransaction.objects.filter(
-        transaction_type="PAYOUT",
-        created_at__gte=thirty_days_ago
-    )
-    
-    cash_in_total = cash_in_txns.aggregate(Sum("amount"))["amount__sum"] or 0
-    payout_total = payout_txns.aggregate(Sum("amount"))["amount__sum"] or 0
+    totals = WalletRollupService.get_totals(
+        since=timezone.localdate(thirty_days_ago))
     
-    # Payment statistics
-    total_payments = Payment.objects.count()
-    successful_payments = Payment.objects.filter(status="completed").count()
-    pending_payments = Payment.objects.filter(status="pending").count()
-    failed_payments = Payment.objects.filter(status="failed").count()
-    
-    # Only sum completed payments for total amount
-    total_payment_amount = Payment.objects.filter(status="completed").aggregate(
-        Sum("amount")
-    )["amount__sum"] or 0
-
-    total_failed_amount = Payment.objects.filter(status="failed").aggregate(
-        Sum("amount")
-    )["amount__sum"] or 0
-
-    total_pending_amount = Payment.objects.filter(status="pending").aggregate(
-        Sum("amount")
-    )["amount__sum"] or 0
+    # Payment statistics (all time), mostly from precomputed buckets
+    payment_stats = PaymentStatsService.get()["totals"]
     
-    # Fee statistics
-    total_fees = WalletTransaction.objects.filter(
-        transaction_type="FEE"
-    ).aggregate(total=Sum(Abs("amount")))["total"] or 0
+    # Fee statistics (all time) from the daily rollups
+    total_fees = WalletRollupService.get_totals()["fees"]
     
     context = {
         "total_creators": total_creators,
@@ -277,17 +250,17 @@ def stats(request):
         "total_wallets": total_wallets,
         "total_balance": total_balance,
         "avg_balance": avg_balance,
-        "cash_in_total": cash_in_total,
-        "cash_in_count": cash_in_txns.count(),
-        "payout_total": payout_total,
-        "payout_count": payout_txns.count(),
-        "total_payments": total_payments,
-        "successful_payments": successful_payments,
-        "pending_payments": pending_payments,
-        "failed_payments": failed_payments,
-        "total_payment_amount": total_payment_amount,
-        "total_pending_amount": total_pending_amount,
-        "total_failed_amount": total_failed_amount,
+        "cash_in_total": totals["cash_in"],
+        "cash_in_count": totals["tip_count"],
+        "payout_total": totals["payouts"],
+        "payout_count": totals["payout_count"],
+        "total_payments": payment_stats["total_payments"],
+        "successful_payments": payment_stats["successful_payments"],
+        "pending_payments": payment_stats["pending_payments"],
+        "failed_payments": payment_stats["failed_payments"],
+        "total_payment_amount": payment_stats["successful_amount"],
+        "total_pending_amount": payment_stats["pending_amount"],
+        "total_failed_amount": payment_stats["failed_amount"],
         "total_fees": total_fees,
     }
     
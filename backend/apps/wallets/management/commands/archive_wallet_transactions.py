@@ -0,0 +1,31 @@
+"""
+Management command to move closed-period ledger rows into the archive.
+"""
+
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from apps.wallets.models import Wallet
+from apps.wallets.services.wallet_services import LedgerArchiveService
+
+
+class Command(BaseCommand):
+    help = 'Move wallet transactions older than the cut-off into the archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=LedgerArchiveService.ARCHIVE_AFTER.days,
+            help='Archive transactions older than this many days',
+        )
+
+    def handle(self, *args, **options):
+        older_than = timedelta(days=options['days'])
+        archived = 0
+        for wallet in Wallet.objects.iterator():
+            archived += LedgerArchiveService.archive_wallet(
+                wallet, older_than=older_than)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Archived {archived} wallet transactions')
+        )
@@ -0,0 +1,49 @@
+"""
+Management command to verify stored wallet balances against the ledger.
+"""
+
+from django.core.management.base import BaseCommand
+from apps.wallets.models import Wallet
+from apps.wallets.services.wallet_services import WalletService
+
+
+class Command(BaseCommand):
+    help = 'Verify stored wallet balances against the transaction ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Recalculate and store the ledger balance for drifted wallets',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Sum the whole ledger instead of starting from the latest checkpoint',
+        )
+
+    def handle(self, *args, **options):
+        use_checkpoint = not options['full']
+        drifted_count = 0
+
+        for wallet in Wallet.objects.select_related('creator__user').iterator():
+            drift = WalletService.verify_wallet_balance(
+                wallet, use_checkpoint=use_checkpoint)
+            if not drift:
+                continue
+
+            drifted_count += 1
+            self.stdout.write(self.style.WARNING(
+                f'Wallet {wallet.id} ({wallet.creator.user.username}) '
+                f'drifted by {drift}'
+            ))
+            if options['fix']:
+                balance = WalletService.recalculate_wallet_balance(
+                    wallet, use_checkpoint=use_checkpoint)
+                self.stdout.write(self.style.SUCCESS(
+                    f'Fixed wallet {wallet.id}: balance is now {balance}'
+                ))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Total drifted wallets: {drifted_count}')
+        )
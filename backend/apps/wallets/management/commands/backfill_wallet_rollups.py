@@ -0,0 +1,32 @@
+"""
+Management command to rebuild the per-day wallet rollups from the ledger.
+"""
+
+from django.core.management.base import BaseCommand
+from apps.wallets.models import Wallet
+from apps.wallets.services.wallet_services import WalletRollupService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-day wallet rollups from the transaction ledger'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--wallet',
+            help='Only rebuild the rollups of the wallet with this id',
+        )
+
+    def handle(self, *args, **options):
+        wallets = Wallet.objects.all()
+        if options['wallet']:
+            wallets = wallets.filter(id=options['wallet'])
+
+        wallet_count = 0
+        day_count = 0
+        for wallet in wallets.iterator():
+            day_count += WalletRollupService.rebuild(wallet)
+            wallet_count += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {day_count} rollup days for {wallet_count} wallets'
+        ))
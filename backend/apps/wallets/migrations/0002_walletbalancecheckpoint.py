@@ -0,0 +1,51 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:12
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_initial'),
+        ('wallets', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletBalanceCheckpoint',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('as_of', models.DateTimeField()),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Wallet Balance Checkpoint',
+                'verbose_name_plural': 'Wallet Balance Checkpoints',
+                'ordering': ['-as_of'],
+                'get_latest_by': 'as_of',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['wallet', 'created_at'], name='wallets_wal_wallet__a0330b_idx'),
+        ),
+        migrations.AddField(
+            model_name='walletbalancecheckpoint',
+            name='last_tx',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='wallets.wallettransaction'),
+        ),
+        migrations.AddField(
+            model_name='walletbalancecheckpoint',
+            name='wallet',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balance_checkpoints', to='wallets.wallet'),
+        ),
+        migrations.AddConstraint(
+            model_name='walletbalancecheckpoint',
+            constraint=models.UniqueConstraint(fields=('wallet', 'as_of'), name='unique_wallet_checkpoint'),
+        ),
+    ]
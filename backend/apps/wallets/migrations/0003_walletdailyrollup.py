@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:05
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallets', '0002_walletbalancecheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletDailyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('cash_in', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('fees', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('payouts', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('tip_count', models.PositiveIntegerField(default=0)),
+                ('payout_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('wallet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='wallets.wallet')),
+            ],
+            options={
+                'verbose_name': 'Wallet Daily Rollup',
+                'verbose_name_plural': 'Wallet Daily Rollups',
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['day'], name='wallets_wal_day_bbcc87_idx')],
+                'constraints': [models.UniqueConstraint(fields=('wallet', 'day'), name='unique_wallet_rollup_day')],
+            },
+        ),
+    ]
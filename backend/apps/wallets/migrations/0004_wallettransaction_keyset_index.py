@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_initial'),
+        ('wallets', '0003_walletdailyrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['wallet', 'transaction_type', 'created_at', 'id'], name='wallets_wal_wallet__e95ebb_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:02
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0002_initial'),
+        ('wallets', '0004_wallettransaction_keyset_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedWalletTransaction',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('fee', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('transaction_type', models.CharField(choices=[('CASH_IN', 'Cash In'), ('PAYOUT', 'Payout'), ('REVERSAL', 'Reversal'), ('FEE', 'Fee')], max_length=20)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('COMPLETED', 'Completed'), ('FAILED', 'Failed')], default='PENDING', max_length=20)),
+                ('reference', models.CharField(max_length=100, unique=True)),
+                ('correlation_id', models.CharField(db_index=True, max_length=100)),
+                ('created_at', models.DateTimeField()),
+                ('approved_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('approved_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('payment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='payments.payment')),
+                ('related_transaction', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='wallets.wallettransaction')),
+                ('wallet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_transactions', to='wallets.wallet')),
+            ],
+            options={
+                'verbose_name': 'Archived Wallet Transaction',
+                'verbose_name_plural': 'Archived Wallet Transactions',
+                'indexes': [models.Index(fields=['wallet', 'created_at'], name='wallets_arc_wallet__6167bd_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:40
+
+import utils.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallets', '0005_archivedwallettransaction'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedwallettransaction',
+            name='id',
+            field=models.UUIDField(default=utils.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='dispute',
+            name='id',
+            field=models.UUIDField(default=utils.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='paymentattempt',
+            name='id',
+            field=models.UUIDField(default=utils.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='refund',
+            name='id',
+            field=models.UUIDField(default=utils.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='wallet',
+            name='id',
+            field=models.UUIDField(default=utils.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='walletbalancecheckpoint',
+            name='id',
+            field=models.UUIDField(default=utils.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='walletdailyrollup',
+            name='id',
+            field=models.UUIDField(default=utils.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='wallettransaction',
+            name='id',
+            field=models.UUIDField(default=utils.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -120,6 +120,162 @@ class WalletTransaction(UUIDModel):
     def __str__(self):
         return f"TXN - {self.transaction_type} - {self.amount}"
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["wallet", "created_at"]),
+            # Keyset pagination of a wallet's transactions by type
+            models.Index(fields=["wallet", "transaction_type", "created_at", "id"]),
+        ]
+
+
+class ArchivedWalletTransaction(UUIDModel):
+    """
+    Cold copy of a closed-period ledger row moved out of WalletTransaction.
+    Columns mirror WalletTransaction in the same order so the two tables
+    can be combined with a UNION for date ranges that reach the archive.
+    """
+
+    wallet = models.ForeignKey(
+        Wallet, on_delete=models.CASCADE, related_name="archived_transactions"
+    )
+
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    fee = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    transaction_type = models.CharField(
+        max_length=20, choices=WalletTransaction.TRANSACTION_TYPE)
+
+    status = models.CharField(
+        max_length=20, choices=WalletTransaction.STATUS, default="PENDING")
+
+    payment = models.ForeignKey(
+        Payment, null=True, blank=True, on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    # The related row may itself be archived, so no database constraint
+    related_transaction = models.ForeignKey(
+        WalletTransaction,
+        null=True,
+        blank=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+
+    reference = models.CharField(max_length=100, unique=True)
+    correlation_id = models.CharField(max_length=100, db_index=True)
+
+    created_at = models.DateTimeField()
+    approved_by = models.ForeignKey(
+        User,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    approved_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Archived Wallet Transaction")
+        verbose_name_plural = _("Archived Wallet Transactions")
+        indexes = [
+            models.Index(fields=["wallet", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"ARCHIVED TXN - {self.transaction_type} - {self.amount}"
+
+    @classmethod
+    def from_transaction(cls, tx):
+        """Builds an unsaved archive copy of a ledger row."""
+        return cls(
+            id=tx.id,
+            wallet_id=tx.wallet_id,
+            amount=tx.amount,
+            fee=tx.fee,
+            transaction_type=tx.transaction_type,
+            status=tx.status,
+            payment_id=tx.payment_id,
+            related_transaction_id=tx.related_transaction_id,
+            reference=tx.reference,
+            correlation_id=tx.correlation_id,
+            created_at=tx.created_at,
+            approved_by_id=tx.approved_by_id,
+            approved_at=tx.approved_at,
+        )
+
+
+class WalletBalanceCheckpoint(UUIDModel):
+    """
+    Snapshot of a wallet balance covering every ledger row created before
+    `as_of`. Balance recalculation starts from the latest checkpoint and
+    only sums the rows created since.
+    """
+
+    wallet = models.ForeignKey(
+        Wallet, on_delete=models.CASCADE, related_name="balance_checkpoints"
+    )
+    as_of = models.DateTimeField()
+    balance = models.DecimalField(max_digits=12, decimal_places=2)
+    last_tx = models.ForeignKey(
+        WalletTransaction,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Wallet Balance Checkpoint")
+        verbose_name_plural = _("Wallet Balance Checkpoints")
+        ordering = ["-as_of"]
+        get_latest_by = "as_of"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["wallet", "as_of"], name="unique_wallet_checkpoint"
+            )
+        ]
+
+    def __str__(self):
+        return f"Checkpoint({self.wallet_id}) - {self.balance} @ {self.as_of}"
+
+
+class WalletDailyRollup(UUIDModel):
+    """
+    Per-day totals of a wallet's completed ledger rows. Kept up to date as
+    ledger rows are written so dashboards and summaries read O(days) rows
+    instead of scanning the transactions.
+    """
+
+    wallet = models.ForeignKey(
+        Wallet, on_delete=models.CASCADE, related_name="daily_rollups"
+    )
+    day = models.DateField()
+    cash_in = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    fees = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    payouts = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    tip_count = models.PositiveIntegerField(default=0)
+    payout_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Wallet Daily Rollup")
+        verbose_name_plural = _("Wallet Daily Rollups")
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["wallet", "day"], name="unique_wallet_rollup_day"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["day"]),
+        ]
+
+    def __str__(self):
+        return f"Rollup({self.wallet_id}) - {self.day}"
+
 
 class WalletKYC(models.Model):
 
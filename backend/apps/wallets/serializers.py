@@ -99,18 +99,23 @@ class WalletDetailSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
 
+    def to_representation(self, instance):
+        from .services.wallet_services import WalletSummaryService
+        if not hasattr(instance, "summary_transaction_count"):
+            # Load every computed figure in one query instead of one per field
+            WalletSummaryService.attach(instance)
+        return super().to_representation(instance)
+
     def get_transaction_count(self, obj):
-        return obj.transactions.count()
+        return obj.summary_transaction_count
 
     def get_total_outgoing(self, obj):
-        return abs(obj.transactions.filter(transaction_type="PAYOUT").aggregate(
-            total=models.Sum("amount")
-        )["total"] or Decimal("0"))
+        return abs(obj.summary_total_outgoing)
 
     def get_next_payout_date(self, obj):
-        from .services.wallet_services import PayoutScheduleService
-        last_payout = obj.transactions.filter(transaction_type="PAYOUT").order_by("-created_at").first()
-        last_payout_date = last_payout.created_at if last_payout else None
+        from .services.wallet_services import (
+            PayoutScheduleService, WalletSummaryService)
+        last_payout_date = WalletSummaryService.last_payout_at(obj)
         payout_interval = obj.payout_interval_days or 30  # default to 30 days if not set
         next_payout_date = PayoutScheduleService.get_next_payout_date(
             last_payout_date, payout_interval
@@ -7,13 +7,20 @@ wallet balances.
 """
 import uuid
 from decimal import Decimal
-from django.db import transaction
-from django.db.models import Sum, Q
+from django.db import transaction, IntegrityError
+from django.db.models import (
+    Sum, Q, F, Count, Max, OuterRef, Subquery, DecimalField)
+from django.db.models.functions import TruncDate, Coalesce
 from utils.exceptions import WalletNotFound, WalletError
 from datetime import datetime, timedelta
 from typing import Optional
-from apps.wallets.models import WalletTransaction, Wallet
+from django.utils import timezone
+from apps.wallets.models import (
+    WalletTransaction, Wallet, WalletBalanceCheckpoint, WalletDailyRollup,
+    ArchivedWalletTransaction)
 from apps.payments.services.fee_service import FeeService
+from apps.wallets.services.wallet_locks import WalletLockManager
+from apps.creators.services.trending_service import TrendingService
 from utils.exceptions import (
     InsufficientBalance,
     DuplicateTransaction,
@@ -50,6 +57,459 @@ class PayoutScheduleService:
         return last_payout_date + timedelta(days=payout_interval_days)
 
 
+BALANCE_FILTER = (
+    (Q(transaction_type="CASH_IN") | Q(transaction_type="PAYOUT")) &
+    Q(status="COMPLETED")
+)
+
+
+class LedgerCheckpointService:
+    """Records wallet balance checkpoints to bound ledger recalculation."""
+
+    # Rows younger than this may still belong to an uncommitted transaction
+    CHECKPOINT_LAG = timedelta(minutes=5)
+
+    @staticmethod
+    def get_latest_checkpoint(wallet) -> Optional[WalletBalanceCheckpoint]:
+        """Returns the latest checkpoint for the wallet, or None."""
+        return wallet.balance_checkpoints.order_by("-as_of").first()
+
+    @staticmethod
+    def create_checkpoint(wallet, now=None) -> Optional[WalletBalanceCheckpoint]:
+        """
+        Records a checkpoint covering all ledger rows created before the
+        cut-off. The cut-off lags behind now and never passes the oldest
+        PENDING transaction, so rows covered by a checkpoint never change.
+        args:
+            wallet: the wallet to checkpoint
+            now: optional current time (defaults to timezone.now())
+        returns: the created checkpoint, or None if there is nothing new
+        to cover
+        """
+        as_of = (now or timezone.now()) - LedgerCheckpointService.CHECKPOINT_LAG
+        oldest_pending = wallet.transactions.filter(
+            status="PENDING").order_by("created_at").first()
+        if oldest_pending and oldest_pending.created_at < as_of:
+            as_of = oldest_pending.created_at
+
+        previous = LedgerCheckpointService.get_latest_checkpoint(wallet)
+        rows = wallet.transactions.filter(created_at__lt=as_of)
+        balance = Decimal("0")
+        if previous:
+            if as_of <= previous.as_of:
+                return None
+            rows = rows.filter(created_at__gte=previous.as_of)
+            balance = previous.balance
+
+        last_tx = rows.order_by("-created_at").first()
+        if last_tx is None:
+            return None
+
+        balance += rows.filter(BALANCE_FILTER).aggregate(
+            total=Sum("amount"))["total"] or 0
+        return WalletBalanceCheckpoint.objects.create(
+            wallet=wallet, as_of=as_of, balance=balance, last_tx=last_tx)
+
+
+class LedgerArchiveService:
+    """Moves closed-period ledger rows from the hot table to the archive."""
+
+    ARCHIVE_AFTER = timedelta(days=90)
+    BATCH_SIZE = 1000
+    # Columns shared by the hot and archive tables, in model field order
+    UNION_FIELDS = (
+        "id", "wallet", "amount", "fee", "transaction_type", "status",
+        "reference", "created_at",
+    )
+
+    @staticmethod
+    def archive_wallet(wallet, now=None, older_than=None) -> int:
+        """
+        Rolls the wallet's ledger into a checkpoint, then moves rows older
+        than the cut-off into the archive. The cut-off never passes the
+        latest checkpoint, so archived rows are already covered by it.
+        Rows still referenced by a newer row (e.g. a fee whose reversal is
+        recent) stay in the hot table.
+        args:
+            wallet: the wallet to archive
+            now: optional current time (defaults to timezone.now())
+            older_than: optional age of rows to archive (defaults to
+            ARCHIVE_AFTER)
+        returns: the number of rows archived
+        """
+        now = now or timezone.now()
+        older_than = older_than or LedgerArchiveService.ARCHIVE_AFTER
+        LedgerCheckpointService.create_checkpoint(wallet, now=now)
+        checkpoint = LedgerCheckpointService.get_latest_checkpoint(wallet)
+        if checkpoint is None:
+            return 0
+
+        cut_off = min(now - older_than, checkpoint.as_of)
+        rows = (
+            wallet.transactions.filter(created_at__lt=cut_off)
+            .exclude(related_fees__created_at__gte=cut_off)
+            .order_by("created_at")
+        )
+
+        archived = 0
+        while True:
+            with transaction.atomic():
+                batch = list(rows[:LedgerArchiveService.BATCH_SIZE])
+                if not batch:
+                    break
+                # Rows pointing at the batch (a cash-in's fee) move with it;
+                # deleting their parent would null related_transaction
+                ids = {tx.pk for tx in batch}
+                while True:
+                    children = list(rows.filter(
+                        related_transaction_id__in=ids).exclude(pk__in=ids))
+                    if not children:
+                        break
+                    batch.extend(children)
+                    ids.update(tx.pk for tx in children)
+                ArchivedWalletTransaction.objects.bulk_create(
+                    [ArchivedWalletTransaction.from_transaction(tx)
+                     for tx in batch]
+                )
+                WalletTransaction.objects.filter(
+                    pk__in=[tx.pk for tx in batch]).delete()
+            archived += len(batch)
+        return archived
+
+    @staticmethod
+    def range_querysets(wallet, start=None, end=None, **filters) -> list:
+        """
+        Returns one queryset per table holding the wallet's ledger rows
+        created in [start, end): the hot table, plus the archive when the
+        range reaches archived rows (always possible for an open start).
+        Both share the (created_at, id) key, so keyset pagination can page
+        them side by side.
+        args:
+            wallet: the wallet whose rows to return
+            start: optional inclusive lower bound (datetime)
+            end: optional exclusive upper bound (datetime)
+            filters: extra field lookups applied to both tables
+        returns: [hot] or [hot, archived] querysets
+        """
+        hot = wallet.transactions.filter(**filters)
+        cold = wallet.archived_transactions.filter(**filters)
+        if start is not None:
+            hot = hot.filter(created_at__gte=start)
+            cold = cold.filter(created_at__gte=start)
+        if end is not None:
+            hot = hot.filter(created_at__lt=end)
+            cold = cold.filter(created_at__lt=end)
+
+        # The bounded archive query answers whether the range reaches
+        # archived rows, including open-ended and all-time ranges
+        if not cold.exists():
+            return [hot]
+        return [hot, cold]
+
+    @staticmethod
+    def transactions_for_range(wallet, start=None, end=None, **filters):
+        """
+        Returns the wallet's ledger rows created in [start, end), with the
+        hot and archive tables combined with a UNION when the range holds
+        archived rows; otherwise only the hot table is queried.
+        args:
+            wallet: the wallet whose rows to return
+            start: optional inclusive lower bound (datetime)
+            end: optional exclusive upper bound (datetime)
+            filters: extra field lookups applied to both tables
+        returns: a queryset of WalletTransaction instances. Union querysets
+        only load UNION_FIELDS and cannot be filtered further.
+        """
+        querysets = LedgerArchiveService.range_querysets(
+            wallet, start=start, end=end, **filters)
+        if len(querysets) == 1:
+            return querysets[0]
+
+        hot, cold = querysets
+        fields = LedgerArchiveService.UNION_FIELDS
+        return hot.only(*fields).union(cold.only(*fields), all=True)
+
+
+class WalletRollupService:
+    """Maintains and reads the per-day wallet rollups."""
+
+    @staticmethod
+    def _deltas(tx) -> dict:
+        """Maps a completed ledger row to the rollup columns it changes."""
+        if tx.status != "COMPLETED":
+            return {}
+        if tx.transaction_type == "CASH_IN":
+            return {"cash_in": tx.amount, "tip_count": 1}
+        if tx.transaction_type == "PAYOUT":
+            return {"payouts": -tx.amount, "payout_count": 1}
+        if tx.transaction_type in ("FEE", "FEE_REVERSAL"):
+            # Fees are stored negative, reversals positive
+            return {"fees": -tx.amount}
+        return {}
+
+    @staticmethod
+    def _apply(wallet_id, day, deltas: dict):
+        """Adds deltas to a rollup row, creating it if needed."""
+        rows = WalletDailyRollup.objects.filter(wallet_id=wallet_id, day=day)
+        updates = {field: F(field) + value for field, value in deltas.items()}
+        if rows.update(**updates):
+            return
+        try:
+            with transaction.atomic():
+                WalletDailyRollup.objects.create(
+                    wallet_id=wallet_id, day=day, **deltas)
+        except IntegrityError:
+            # A concurrent writer created the row first
+            rows.update(**updates)
+
+    @staticmethod
+    def record_transaction(tx):
+        """
+        Adds a completed ledger row to its wallet's rollup for the day the
+        row was created. Must be called in the same transaction as the
+        ledger write, once per row reaching COMPLETED.
+        args:
+            tx: the completed wallet transaction
+        returns: None
+        """
+        deltas = WalletRollupService._deltas(tx)
+        if deltas:
+            WalletRollupService._apply(
+                tx.wallet_id, timezone.localdate(tx.created_at), deltas)
+
+    @staticmethod
+    def record_many(txs):
+        """
+        Adds a batch of completed ledger rows to the rollups, writing each
+        (wallet, day) row once.
+        args:
+            txs: iterable of completed wallet transactions
+        returns: None
+        """
+        grouped = {}
+        for tx in txs:
+            key = (tx.wallet_id, timezone.localdate(tx.created_at))
+            totals = grouped.setdefault(key, {})
+            for field, value in WalletRollupService._deltas(tx).items():
+                totals[field] = totals.get(field, 0) + value
+
+        for (wallet_id, day), deltas in grouped.items():
+            if deltas:
+                WalletRollupService._apply(wallet_id, day, deltas)
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild(wallet) -> int:
+        """
+        Rebuilds all rollups of a wallet from the ledger.
+        args:
+            wallet: the wallet to rebuild
+        returns: the number of rollup days written
+        """
+        completed = Q(status="COMPLETED")
+        totals = {}
+        # Archived rows still belong in their day's rollup
+        for ledger in (wallet.archived_transactions, wallet.transactions):
+            days = (
+                ledger.filter(completed)
+                .annotate(day=TruncDate("created_at"))
+                .values("day")
+                .annotate(
+                    cash_in=Sum("amount", filter=Q(transaction_type="CASH_IN")),
+                    tip_count=Count("id", filter=Q(transaction_type="CASH_IN")),
+                    payouts=Sum("amount", filter=Q(transaction_type="PAYOUT")),
+                    payout_count=Count(
+                        "id", filter=Q(transaction_type="PAYOUT")),
+                    fees=Sum(
+                        "amount",
+                        filter=Q(transaction_type__in=["FEE", "FEE_REVERSAL"]),
+                    ),
+                )
+                .order_by("day")
+            )
+            for row in days:
+                day = totals.setdefault(row["day"], {
+                    "cash_in": 0, "tip_count": 0, "payouts": 0,
+                    "payout_count": 0, "fees": 0,
+                })
+                day["cash_in"] += row["cash_in"] or 0
+                day["tip_count"] += row["tip_count"]
+                day["payouts"] -= row["payouts"] or 0
+                day["payout_count"] += row["payout_count"]
+                day["fees"] -= row["fees"] or 0
+
+        rollups = [
+            WalletDailyRollup(wallet=wallet, day=day, **values)
+            for day, values in sorted(totals.items())
+        ]
+        wallet.daily_rollups.all().delete()
+        WalletDailyRollup.objects.bulk_create(rollups)
+        return len(rollups)
+
+    @staticmethod
+    def get_totals(wallets=None, since=None) -> dict:
+        """
+        Sums rollups, optionally for a single wallet and from a given day.
+        args:
+            wallets: optional wallet (or wallet queryset) to restrict to
+            since: optional date; only days on or after it are included
+        returns: dict with cash_in, fees, payouts, tip_count and payout_count
+        """
+        rollups = WalletDailyRollup.objects.all()
+        if isinstance(wallets, Wallet):
+            rollups = rollups.filter(wallet=wallets)
+        elif wallets is not None:
+            rollups = rollups.filter(wallet__in=wallets)
+        if since is not None:
+            rollups = rollups.filter(day__gte=since)
+
+        totals = rollups.aggregate(
+            cash_in=Sum("cash_in"),
+            fees=Sum("fees"),
+            payouts=Sum("payouts"),
+            tip_count=Sum("tip_count"),
+            payout_count=Sum("payout_count"),
+        )
+        cents = Decimal("0.01")
+        return {
+            "cash_in": Decimal(totals["cash_in"] or 0).quantize(cents),
+            "fees": Decimal(totals["fees"] or 0).quantize(cents),
+            "payouts": Decimal(totals["payouts"] or 0).quantize(cents),
+            "tip_count": totals["tip_count"] or 0,
+            "payout_count": totals["payout_count"] or 0,
+        }
+
+
+class WalletSummaryService:
+    """
+    Projects a wallet together with its dashboard figures in one query:
+    ledger figures come from correlated subqueries over the hot and archive
+    tables, money totals from the daily rollups.
+    """
+
+    MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+    @staticmethod
+    def _per_wallet(rows, expression):
+        """Subquery aggregating the outer wallet's rows."""
+        return Subquery(
+            rows.filter(wallet=OuterRef("pk"))
+            .order_by()
+            .values("wallet")
+            .annotate(value=expression)
+            .values("value")[:1]
+        )
+
+    @staticmethod
+    def annotate(queryset):
+        """
+        Annotates a wallet queryset with the summary figures.
+        args:
+            queryset: a Wallet queryset
+        returns: the queryset with summary_* annotations and the creator
+        and user joined in
+        """
+        per_wallet = WalletSummaryService._per_wallet
+        money = WalletSummaryService.MONEY
+        zero = Decimal("0")
+        hot = WalletTransaction.objects.all()
+        cold = ArchivedWalletTransaction.objects.all()
+        rollups = WalletDailyRollup.objects.all()
+
+        def ledger_total(expression, **filters):
+            output = money if isinstance(expression, Sum) else None
+            default = zero if output else 0
+            return (
+                Coalesce(per_wallet(hot.filter(**filters), expression),
+                         default, output_field=output)
+                + Coalesce(per_wallet(cold.filter(**filters), expression),
+                           default, output_field=output)
+            )
+
+        def rollup_total(field):
+            return Coalesce(
+                per_wallet(rollups, Sum(field)), zero, output_field=money)
+
+        return queryset.select_related("creator__user").annotate(
+            summary_transaction_count=ledger_total(Count("id")),
+            summary_total_outgoing=ledger_total(
+                Sum("amount"), transaction_type="PAYOUT"),
+            summary_last_payout_at=per_wallet(
+                hot.filter(transaction_type="PAYOUT"), Max("created_at")),
+            summary_archived_last_payout_at=per_wallet(
+                cold.filter(transaction_type="PAYOUT"), Max("created_at")),
+            summary_cash_in=rollup_total("cash_in"),
+            summary_fees=rollup_total("fees"),
+            summary_payouts=rollup_total("payouts"),
+        )
+
+    @staticmethod
+    def get(wallet_id):
+        """
+        Fetches a wallet with its summary figures.
+        Args:
+            wallet_id: The wallet id.
+        Returns:
+            Wallet: The annotated wallet instance.
+        Raises:
+            WalletNotFound: If the wallet does not exist.
+        """
+        try:
+            return WalletSummaryService.annotate(
+                Wallet.objects.filter(pk=wallet_id)).get()
+        except Wallet.DoesNotExist:
+            raise WalletNotFound("Wallet not found")
+
+    @staticmethod
+    def attach(wallet):
+        """
+        Loads the summary figures onto an existing wallet instance with
+        one query, leaving its other attributes untouched.
+        Args:
+            wallet (Wallet): The wallet instance.
+        Returns:
+            Wallet: The same instance with summary_* attributes set.
+        """
+        queryset = WalletSummaryService.annotate(
+            Wallet.objects.filter(pk=wallet.pk))
+        fields = [
+            name for name in queryset.query.annotations
+            if name.startswith("summary_")
+        ]
+        figures = queryset.values(*fields).get()
+        for name, value in figures.items():
+            setattr(wallet, name, value)
+        return wallet
+
+    @staticmethod
+    def get_for_user(user):
+        """
+        Fetches the user's wallet with its summary figures in one query.
+        Args:
+            user (User): The user instance.
+        Returns:
+            Wallet: The annotated wallet instance.
+        Raises:
+            WalletNotFound: If the user does not have a wallet.
+        """
+        try:
+            return WalletSummaryService.annotate(
+                Wallet.objects.filter(creator__user=user)).get()
+        except (Wallet.DoesNotExist, TypeError):
+            raise WalletNotFound("User does not have a wallet")
+
+    @staticmethod
+    def last_payout_at(wallet):
+        """Latest payout date of an annotated wallet, or None."""
+        dates = [
+            date for date in (
+                wallet.summary_last_payout_at,
+                wallet.summary_archived_last_payout_at,
+            ) if date is not None
+        ]
+        return max(dates) if dates else None
+
+
 class WalletService:
     """Core wallet operations."""
 
@@ -69,35 +529,137 @@ class WalletService:
             raise WalletNotFound("User does not have a wallet")
 
     @staticmethod
-    def recalculate_wallet_balance(wallet):
+    def compute_ledger_balance(wallet, use_checkpoint: bool = True) -> Decimal:
+        """
+        Computes the wallet balance from the ledger without writing it.
+        Only completed CASH_IN and PAYOUT rows count towards the balance.
+        Args:
+            wallet (Wallet): The wallet instance to compute the balance for.
+            use_checkpoint (bool): Start from the latest balance checkpoint
+                and only sum rows created since. Pass False for a full scan.
+        Returns:
+            Decimal: The balance according to the ledger.
+        Raises:
+            WalletError: If the given object is not a wallet.
+        """
+        try:
+            rows = wallet.transactions.filter(BALANCE_FILTER)
+            checkpoint = (
+                LedgerCheckpointService.get_latest_checkpoint(wallet)
+                if use_checkpoint else None
+            )
+        except AttributeError:
+            raise WalletError("Wallet error")
+
+        opening = Decimal("0")
+        if checkpoint:
+            rows = rows.filter(created_at__gte=checkpoint.as_of)
+            opening = checkpoint.balance
+        else:
+            # A full scan also has to cover rows moved to the archive
+            opening += wallet.archived_transactions.filter(
+                BALANCE_FILTER).aggregate(total=Sum("amount"))["total"] or 0
+
+        total = rows.aggregate(total=Sum("amount"))["total"] or 0
+        return opening + Decimal(total)
+
+    @staticmethod
+    def apply_balance_delta(wallet, delta: Decimal):
+        """
+        Atomically adds a delta to the stored wallet balance.
+        Must be called in the same transaction as the ledger row that
+        caused the change so the balance never drifts from the ledger.
+        Args:
+            wallet (Wallet): The wallet to update.
+            delta (Decimal): Signed amount to add to the balance.
+        Returns:
+            Decimal: The updated wallet balance.
+        """
+        if delta:
+            Wallet.objects.filter(pk=wallet.pk).update(
+                balance=F("balance") + delta)
+        wallet.refresh_from_db(fields=["balance"])
+        return wallet.balance
+
+    @staticmethod
+    @transaction.atomic
+    def recalculate_wallet_balance(wallet, use_checkpoint: bool = True):
         """
         Recalculates and updates the wallet balance based on
-        completed transactions.
+        completed transactions. This is the verification/repair path;
+        regular ledger writes maintain the balance via apply_balance_delta().
         Args:
             wallet (Wallet): The wallet instance to recalculate balance for.
+            use_checkpoint (bool): Whether to start from the latest checkpoint.
         Returns:
             Decimal: The updated wallet balance.
         """
         try:
-            query_filter = (
-                (Q(transaction_type="CASH_IN") | Q(transaction_type="PAYOUT")) &
-                Q(status="COMPLETED")
-            )
-            total = (wallet.transactions.filter(query_filter).aggregate(
-                total=Sum("amount"))["total"] or 0)
+            wallet_id = wallet.pk
         except AttributeError:
             raise WalletError("Wallet error")
 
-        wallet.balance = total
-        wallet.save(update_fields=["balance"])
+        # Hold the wallet lock so a concurrent delta is not overwritten
+        with WalletLockManager.locked(wallet_id):
+            wallet.balance = WalletService.compute_ledger_balance(
+                wallet, use_checkpoint=use_checkpoint)
+            wallet.save(update_fields=["balance"])
 
         return wallet.balance
 
+    @staticmethod
+    def verify_wallet_balance(wallet, use_checkpoint: bool = True) -> Decimal:
+        """
+        Compares the stored wallet balance against the ledger.
+        Args:
+            wallet (Wallet): The wallet instance to verify.
+            use_checkpoint (bool): Whether to start from the latest checkpoint.
+        Returns:
+            Decimal: The drift (stored balance - ledger balance). Zero means
+            the stored balance is consistent with the ledger.
+        """
+        ledger_balance = WalletService.compute_ledger_balance(
+            wallet, use_checkpoint=use_checkpoint)
+        wallet.refresh_from_db(fields=["balance"])
+        return wallet.balance - ledger_balance
+
 
 class WalletTransactionService:
     """
     Single source of truth for all wallet money movements.
     """
+    @staticmethod
+    def insert_ledger_rows(rows) -> bool:
+        """
+        Inserts ledger rows in a single statement, relying on the unique
+        reference instead of checking for existing rows first.
+        args:
+            rows: unsaved wallet transactions
+        returns: True if the rows were created, False if a reference
+        already exists (nothing is written in that case)
+        """
+        try:
+            with transaction.atomic():
+                WalletTransaction.objects.bulk_create(rows)
+        except IntegrityError:
+            if WalletTransactionService.is_duplicate(rows):
+                return False
+            raise
+        return True
+
+    @staticmethod
+    def is_duplicate(rows) -> bool:
+        """
+        Whether a failed insert of rows collided with references already in
+        the ledger, as opposed to another integrity error (FK, NOT NULL).
+        Must be called after the failed insert was rolled back.
+        args:
+            rows: the wallet transactions that failed to insert
+        returns: True if any of their references exists
+        """
+        return WalletTransaction.objects.filter(
+            reference__in=[tx.reference for tx in rows]).exists()
+
     @staticmethod
     def create_fee_transaction(
         *,
@@ -126,10 +688,7 @@ class WalletTransactionService:
         else:
             final_amount = -amount if transaction_type == "FEE" else amount
 
-        if WalletTransaction.objects.filter(reference=reference).exists():
-            raise DuplicateTransaction("Transaction already exists")
-            
-        fee_tx = WalletTransaction.objects.create(
+        fee_tx = WalletTransaction(
             wallet=wallet,
             amount=final_amount,
             transaction_type=transaction_type,
@@ -138,11 +697,13 @@ class WalletTransactionService:
             related_transaction=related_transaction,
             correlation_id=related_transaction.correlation_id,
         )
+        if not WalletTransactionService.insert_ledger_rows([fee_tx]):
+            raise DuplicateTransaction("Transaction already exists")
+        WalletRollupService.record_transaction(fee_tx)
 
         return fee_tx
 
     @staticmethod
-    @transaction.atomic
     def cash_in(*, wallet, amount: Decimal, payment, reference: str):
         """
         Process a cash-in transaction. Amount must be positive.
@@ -154,10 +715,17 @@ class WalletTransactionService:
 
         returns: the created cash-in transaction (status COMPLETED). Fees are
         automatically calculated and linked to the cash-in transaction.
+        raises: DuplicateTransaction if the reference is already in the
+        ledger or its archive. The unique reference is the check, so concurrent deliveries
+        of the same payment cannot both succeed.
         """
         if amount <= 0:
             raise InvalidTransaction("Amount must be positive")
-        if WalletTransaction.objects.filter(reference=reference).exists():
+        if not reference:
+            raise InvalidTransaction("Reference is required")
+        # The unique index does not span the archive; archived rows are
+        # never rewritten, so a plain lookup cannot race
+        if ArchivedWalletTransaction.objects.filter(reference=reference).exists():
             raise DuplicateTransaction("Transaction already exists")
 
         fee = FeeService.calculate_cash_in_fee(amount)
@@ -165,7 +733,7 @@ class WalletTransactionService:
         
         correlation_id = f"CASHIN-{uuid.uuid4()}"
 
-        cashin_tx = WalletTransaction.objects.create(
+        cashin_tx = WalletTransaction(
             wallet=wallet,
             amount=net_amount,
             transaction_type="CASH_IN",
@@ -174,19 +742,143 @@ class WalletTransactionService:
             reference=reference,
             correlation_id=correlation_id,
         )
+        rows = [cashin_tx]
 
         # Fee linked to cash-in
         if fee > 0:
-            WalletTransactionService.create_fee_transaction(
+            rows.append(WalletTransaction(
                 wallet=wallet,
-                amount=fee,
+                amount=-fee,
+                transaction_type="FEE",
+                status="COMPLETED",
                 reference=f"{reference}-FEE",
                 related_transaction=cashin_tx,
-            )
+                correlation_id=correlation_id,
+            ))
 
-        WalletService.recalculate_wallet_balance(wallet)
+        # Both rows go in one INSERT; a duplicate reference rolls back the
+        # whole block instead of being checked for up front. The wallet lock
+        # covers only the ledger insert and balance delta.
+        try:
+            with WalletLockManager.locked(wallet.pk):
+                WalletTransaction.objects.bulk_create(rows)
+                WalletRollupService.record_many(rows)
+                WalletService.apply_balance_delta(wallet, net_amount)
+        except IntegrityError:
+            # Only a reference collision is a duplicate delivery
+            if WalletTransactionService.is_duplicate(rows):
+                raise DuplicateTransaction("Transaction already exists")
+            raise
+        TrendingService.record_on_commit(rows)
         return cashin_tx
 
+    @staticmethod
+    @transaction.atomic
+    def cash_in_many(payments) -> list:
+        """
+        Process cash-ins for a batch of completed payments, e.g. when
+        replaying deposits after a provider outage. Payments whose
+        reference is already in the ledger, or that already have a CASH_IN,
+        are skipped, as are rows a concurrent writer inserts first. CASH_IN
+        and FEE rows are bulk inserted and each wallet balance is updated
+        once.
+        args:
+            payments: iterable of payments with a wallet, amount and
+            reference
+        returns: the created cash-in transactions
+        """
+        pending = {}
+        for payment in payments:
+            if payment.wallet_id is None:
+                continue
+            if payment.amount <= 0:
+                raise InvalidTransaction("Amount must be positive")
+            pending.setdefault(payment.reference, payment)
+        if not pending:
+            return []
+
+        existing = set(
+            WalletTransaction.objects.filter(
+                reference__in=list(pending)
+            ).values_list("reference", flat=True)
+        )
+        # Replays can reach back past the archive cut-off
+        existing.update(
+            ArchivedWalletTransaction.objects.filter(
+                reference__in=list(pending)
+            ).values_list("reference", flat=True)
+        )
+        # Credits written before every path used the payment reference
+        # carry the provider id instead
+        payment_ids = [payment.id for payment in pending.values()]
+        credited = set(
+            WalletTransaction.objects.filter(
+                payment_id__in=payment_ids, transaction_type="CASH_IN"
+            ).values_list("payment_id", flat=True)
+        )
+        credited.update(
+            ArchivedWalletTransaction.objects.filter(
+                payment_id__in=payment_ids, transaction_type="CASH_IN"
+            ).values_list("payment_id", flat=True)
+        )
+
+        cashin_txs = []
+        fee_txs = []
+        for reference, payment in pending.items():
+            if reference in existing or payment.id in credited:
+                continue
+            fee = FeeService.calculate_cash_in_fee(payment.amount)
+            cashin_tx = WalletTransaction(
+                wallet_id=payment.wallet_id,
+                amount=payment.amount - fee,
+                transaction_type="CASH_IN",
+                status="COMPLETED",
+                payment=payment,
+                reference=reference,
+                correlation_id=f"CASHIN-{uuid.uuid4()}",
+            )
+            cashin_txs.append(cashin_tx)
+            if fee > 0:
+                fee_txs.append(WalletTransaction(
+                    wallet_id=payment.wallet_id,
+                    amount=-fee,
+                    transaction_type="FEE",
+                    status="COMPLETED",
+                    reference=f"{reference}-FEE",
+                    related_transaction=cashin_tx,
+                    correlation_id=cashin_tx.correlation_id,
+                ))
+        if not cashin_txs:
+            return []
+
+        with WalletLockManager.locked(*{tx.wallet_id for tx in cashin_txs}):
+            # A concurrent credit of the same reference skips that row
+            # instead of aborting the batch; primary keys are generated
+            # here, so a re-read tells which rows went in
+            WalletTransaction.objects.bulk_create(
+                cashin_txs, ignore_conflicts=True)
+            inserted = set(
+                WalletTransaction.objects.filter(
+                    pk__in=[tx.pk for tx in cashin_txs]
+                ).values_list("pk", flat=True)
+            )
+            cashin_txs = [tx for tx in cashin_txs if tx.pk in inserted]
+            fee_txs = [
+                tx for tx in fee_txs if tx.related_transaction.pk in inserted]
+            WalletTransaction.objects.bulk_create(fee_txs)
+            WalletRollupService.record_many(cashin_txs + fee_txs)
+
+            deltas = {}
+            for tx in cashin_txs:
+                deltas[tx.wallet_id] = (
+                    deltas.get(tx.wallet_id, Decimal("0")) + tx.amount)
+            for wallet_id, delta in deltas.items():
+                Wallet.objects.filter(pk=wallet_id).update(
+                    balance=F("balance") + delta)
+
+        TrendingService.record_on_commit(cashin_txs)
+        return cashin_txs
+
     @staticmethod
     @transaction.atomic
     def payout(*, wallet, amount: Decimal, correlation_id: str):
@@ -208,35 +900,37 @@ class WalletTransactionService:
 
         payout_fee = FeeService.payout_fee()
         total_required = amount + payout_fee
-        wallet = Wallet.objects.select_for_update().get(pk=wallet.pk)
-        WalletService.recalculate_wallet_balance(wallet)
-
-        if wallet.balance < total_required:
-            raise InsufficientBalance(
-                f"Insufficient balance. Required\
+        with WalletLockManager.locked(wallet.pk):
+            # Read under the wallet lock; the balance is maintained by
+            # ledger writes holding the same lock
+            wallet = Wallet.objects.get(pk=wallet.pk)
+
+            if wallet.balance < total_required:
+                raise InsufficientBalance(
+                    f"Insufficient balance. Required\
                       {total_required}, available {wallet.balance}"
-            )
+                )
 
-        payout_reference = f"PAYOUT-{uuid.uuid4()}"
+            payout_reference = f"PAYOUT-{uuid.uuid4()}"
 
-        payout_tx = WalletTransaction.objects.create(
-            wallet=wallet,
-            amount=-amount,
-            transaction_type="PAYOUT",
-            status="PENDING",
-            reference=payout_reference,
-            correlation_id=correlation_id,
-        )
-        if payout_fee > 0:
-            # Fee linked to payout
-            WalletTransactionService.create_fee_transaction(
+            payout_tx = WalletTransaction.objects.create(
                 wallet=wallet,
-                amount=payout_fee,
-                reference=f"{payout_reference}-FEE",
-                related_transaction=payout_tx,
+                amount=-amount,
+                transaction_type="PAYOUT",
+                status="PENDING",
+                reference=payout_reference,
+                correlation_id=correlation_id,
             )
-
-        WalletService.recalculate_wallet_balance(wallet)
+            if payout_fee > 0:
+                # Fee linked to payout
+                WalletTransactionService.create_fee_transaction(
+                    wallet=wallet,
+                    amount=payout_fee,
+                    reference=f"{payout_reference}-FEE",
+                    related_transaction=payout_tx,
+                )
+
+        # Pending payouts do not affect the balance until finalized
         return payout_tx
 
     @staticmethod
@@ -259,18 +953,26 @@ class WalletTransactionService:
         if payout_tx.status != "PENDING":
             return payout_tx  # idempotent
 
+        new_status = "COMPLETED" if success else "FAILED"
+        # Conditional update so concurrent finalizations apply the
+        # balance delta at most once
+        updated = WalletTransaction.objects.filter(
+            pk=payout_tx.pk, status="PENDING"
+        ).update(status=new_status, approved_by=approved_by)
+        payout_tx.status = new_status
         payout_tx.approved_by = approved_by
+        if not updated:
+            payout_tx.refresh_from_db(fields=["status", "approved_by"])
+            return payout_tx  # idempotent
 
         if success:
-            payout_tx.status = "COMPLETED"
-            payout_tx.save(update_fields=["status", "approved_by"])
-            WalletService.recalculate_wallet_balance(payout_tx.wallet)
+            with WalletLockManager.locked(payout_tx.wallet_id):
+                WalletService.apply_balance_delta(
+                    payout_tx.wallet, payout_tx.amount)
+                WalletRollupService.record_transaction(payout_tx)
             return payout_tx
-        
-        # FAILED PAYOUT → reverse fee
-        payout_tx.status = "FAILED"
-        payout_tx.save(update_fields=["status", "approved_by"])
 
+        # FAILED PAYOUT → reverse fee
         fee_tx = payout_tx.related_fees.filter(
             transaction_type="FEE",
             status="COMPLETED",
@@ -285,5 +987,5 @@ class WalletTransactionService:
                 transaction_type="FEE_REVERSAL",
             )
 
-        WalletService.recalculate_wallet_balance(payout_tx.wallet)
+        # Failed payouts and fee reversals leave the balance unchanged
         return payout_tx
@@ -0,0 +1,75 @@
+"""
+Celery tasks for the wallets app.
+Handles periodic ledger maintenance such as balance checkpoints and
+archival of closed-period transactions.
+"""
+import logging
+from celery import shared_task
+from celery.schedules import crontab
+from apps.wallets.models import Wallet
+from apps.wallets.services.wallet_services import (
+    LedgerCheckpointService, LedgerArchiveService)
+from config.celery import app
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def checkpoint_wallet_balances():
+    """
+    Record a balance checkpoint for every wallet with ledger activity since
+    its previous checkpoint, so recalculation only sums recent rows.
+
+    Returns:
+        str: Status message with the number of checkpoints created
+    """
+    created = 0
+    for wallet in Wallet.objects.iterator():
+        try:
+            if LedgerCheckpointService.create_checkpoint(wallet):
+                created += 1
+        except Exception as e:
+            logger.error(f"Error checkpointing wallet {wallet.id}: {str(e)}")
+    logger.info(f"Created {created} wallet balance checkpoints")
+    return f"Created {created} wallet balance checkpoints"
+
+
+# Schedule the checkpoint task to run every day at 2:00 AM
+@app.on_after_finalize.connect
+def setup_checkpoint_task(sender, **kwargs):
+    """Schedule the wallet balance checkpoint task to run daily at 2:00 AM."""
+    sender.add_periodic_task(
+        crontab(hour=2, minute=0),
+        checkpoint_wallet_balances.s(),
+        name='Record wallet balance checkpoints daily'
+    )
+
+
+@shared_task
+def archive_wallet_transactions():
+    """
+    Move closed-period ledger rows of every wallet into the archive table
+    so the hot transactions table and its indexes stay small.
+
+    Returns:
+        str: Status message with the number of archived rows
+    """
+    archived = 0
+    for wallet in Wallet.objects.iterator():
+        try:
+            archived += LedgerArchiveService.archive_wallet(wallet)
+        except Exception as e:
+            logger.error(f"Error archiving wallet {wallet.id}: {str(e)}")
+    logger.info(f"Archived {archived} wallet transactions")
+    return f"Archived {archived} wallet transactions"
+
+
+# Schedule the archive task to run every Sunday at 3:00 AM
+@app.on_after_finalize.connect
+def setup_archive_task(sender, **kwargs):
+    """Schedule the ledger archive task to run weekly on Sunday at 3:00 AM."""
+    sender.add_periodic_task(
+        crontab(hour=3, minute=0, day_of_week=0),
+        archive_wallet_transactions.s(),
+        name='Archive closed-period wallet transactions weekly'
+    )
@@ -1,4 +1,6 @@
-from django.db.models import Sum, Q, Count, F
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -6,7 +8,6 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination, LimitOffsetPagination
 from drf_spectacular.utils import extend_schema
 from apps.wallets.models import WalletTransaction, WalletKYC, WalletPayoutAccount
-from apps.payments.models import Payment
 from apps.wallets.serializers import (
     CreatorSupporterSerializer,
     WalletDetailSerializer,
@@ -16,11 +17,12 @@ from apps.wallets.serializers import (
     WalletUpdateSerializer,
 )
 from apps.wallets.services.wallet_services import (
-    WalletTransactionService, WalletService)
-from utils.exceptions import DuplicateTransaction, WalletNotFound
+    WalletService, WalletSummaryService,
+    LedgerArchiveService)
+from utils.exceptions import WalletNotFound
 from utils.authentication import RequireAPIKey
 from utils import serializers as helpers
-from utils.external_requests import pawapay_request
+from utils.pagination import KeysetPagination
 
 
 class SupporterListView(APIView):
@@ -61,16 +63,25 @@ class SupporterListView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Optimized query: select_related('payment') to avoid N+1
+        # Optimized query: select_related('payment') to avoid N+1, reading
+        # only the columns the serializer renders
         supporters = (
             WalletTransaction.objects
             .select_related('payment')
+            .only(
+                'id', 'created_at', 'payment__patron_name',
+                'payment__patron_message', 'payment__amount',
+                'payment__created_at',
+            )
             .filter(wallet=wallet, transaction_type="CASH_IN")
         )
 
-        # Apply pagination
-        paginator = self.pagination_class()
-        paginator.page_size = request.query_params.get('page_size', 25)
+        # Apply pagination (?cursor= switches to keyset pagination)
+        if KeysetPagination.is_requested(request):
+            paginator = KeysetPagination()
+        else:
+            paginator = self.pagination_class()
+            paginator.page_size = request.query_params.get('page_size', 25)
         paginated_supporters = paginator.paginate_queryset(supporters, request)
 
         serializer = CreatorSupporterSerializer(paginated_supporters, many=True)
@@ -198,7 +209,8 @@ class WalletListView(APIView):
         Requires authentication (creator).
         """
         try:
-            wallet = WalletService.get_wallet_for_user(request.user)
+            # Wallet plus every dashboard figure in a single query
+            wallet = WalletSummaryService.get_for_user(request.user)
         except WalletNotFound:
             return Response(
                 {"status": "NOT_FOUND"},
@@ -210,29 +222,15 @@ class WalletListView(APIView):
             wallet=wallet, transaction_type="CASH_IN"
         ).order_by("-created_at")[:10]
 
-        # Update payment statuses for incomplete payments
-        self._update_payment_statuses(wallet)
-
-        # Calculate totals for completed transactions
-        totals = WalletTransaction.objects.filter(
-            wallet=wallet, status="COMPLETED"
-        ).aggregate(
-            cash_in=Sum("amount", filter=Q(amount__gt=0)),
-            cash_out=Sum("amount",
-                        filter=Q(amount__lt=0) & Q(transaction_type="PAYOUT")),
-            cash_in_costs=Sum("amount",
-                            filter=Q(amount__lt=0) & Q(transaction_type="FEE")),
-        )
-
         # Serialize wallet details
         serializer = WalletDetailSerializer(wallet)
         wallet_data = serializer.data
 
         # Add transaction summaries and recent transactions
         wallet_data.update({
-            "cash_in": totals["cash_in"] or 0,
-            "cash_out": abs(totals["cash_out"] or 0),
-            "cash_in_costs": abs(totals["cash_in_costs"] or 0),
+            "cash_in": wallet.summary_cash_in,
+            "cash_out": wallet.summary_payouts,
+            "cash_in_costs": wallet.summary_fees,
             "recent_transactions": WalletTransactionListSerializer(
                 transactions, many=True
             ).data,
@@ -243,45 +241,6 @@ class WalletListView(APIView):
             status=status.HTTP_200_OK
         )
 
-    def _update_payment_statuses(self, wallet):
-        """Helper method to update payment statuses from external provider."""
-        payments = Payment.objects.filter(wallet=wallet)
-
-        if not payments:
-            return
-
-        for payment in payments:
-            skip_statuses = [
-                "pending",
-                "submitted",
-                "accepted",
-                "processing",
-                "in_reconciliation",
-            ]
-            payment_status = payment.status
-
-            if payment_status.lower() != "completed":
-                data, code = pawapay_request(
-                    "GET", f"/v2/deposits/{payment.id}"
-                )
-                if code == 200 and "data" in data:
-                    payment_status = data["data"]["status"].lower()
-
-                    if payment_status not in skip_statuses:
-                        payment.status = payment_status
-                        payment.save()
-
-                    # Process completed payment
-                    if payment_status == "completed" and payment.wallet is not None:
-                        try:
-                            WalletTransactionService.cash_in(
-                                wallet=payment.wallet,
-                                amount=payment.amount,
-                                payment=payment,
-                                reference=payment.reference,
-                            )
-                        except DuplicateTransaction:
-                            pass
     @extend_schema(
             operation_id="update_wallet_payout_interval",
             summary="Update Wallet Payout Interval",
@@ -317,7 +276,7 @@ class WalletListView(APIView):
             )
 
         wallet.payout_interval_days = serializer.validated_data["payout_interval_days"]
-        wallet.save()
+        wallet.save(update_fields=["payout_interval_days", "updated_at"])
 
         return Response(
             {
@@ -367,25 +326,56 @@ class WalletTransactionsView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Build filter queryset
-        queryset = WalletTransaction.objects.filter(wallet=wallet)
-
         # Apply optional filters
+        filters = {}
         transaction_type = request.query_params.get("transaction_type")
         if transaction_type:
-            queryset = queryset.filter(transaction_type=transaction_type)
+            filters["transaction_type"] = transaction_type
 
         tx_status = request.query_params.get("status")
         if tx_status:
-            queryset = queryset.filter(status=tx_status)
-
-        # Order by creation date (newest first)
-        queryset = queryset.order_by("-created_at")
-
-        # Apply pagination (supports both 'limit' and 'offset' params for backward compatibility)
-        paginator = self.pagination_class()
-        paginator.page_size = int(request.query_params.get("limit", 10))
-        paginated_transactions = paginator.paginate_queryset(queryset, request)
+            filters["status"] = tx_status
+
+        # Optional date range (inclusive dates); ranges reaching archived
+        # rows are served from the hot and archive tables combined
+        date_range = {}
+        for param, key, offset in (
+            ("start_date", "start", 0), ("end_date", "end", 1)
+        ):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            day = parse_date(value)
+            if day is None:
+                return Response(
+                    {
+                        "status": "failed",
+                        "errors": {param: ["Enter a valid date (YYYY-MM-DD)."]},
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            date_range[key] = timezone.make_aware(
+                datetime.combine(day + timedelta(days=offset), time.min))
+
+        # Apply pagination (supports both 'limit' and 'offset' params for backward
+        # compatibility; ?cursor= switches to keyset pagination, which reads
+        # the hot and archive tables side by side instead of their UNION)
+        if KeysetPagination.is_requested(request):
+            paginator = KeysetPagination()
+            paginated_transactions = paginator.paginate_queryset(
+                LedgerArchiveService.range_querysets(
+                    wallet, **date_range, **filters),
+                request,
+            )
+        else:
+            queryset = LedgerArchiveService.transactions_for_range(
+                wallet, **date_range, **filters)
+            # Order by creation date (newest first)
+            queryset = queryset.order_by("-created_at", "-id")
+            paginator = self.pagination_class()
+            paginator.page_size = int(request.query_params.get("limit", 10))
+            paginated_transactions = paginator.paginate_queryset(
+                queryset, request)
 
         serializer = WalletTransactionListSerializer(paginated_transactions, many=True)
         return paginator.get_paginated_response({
@@ -233,6 +233,8 @@ SPECTACULAR_SETTINGS = {
 
 PAWAPAY_BASE_URL = env("PAWAPAY_BASE_URL", default="https://api.sandbox.pawapay.io")
 PAWAPAY_API_KEY = env("PAWAPAY_API_KEY", default="")
+# Pending deposits older than this are expired instead of retried
+PAYMENT_RESEND_HORIZON_HOURS = env.int("PAYMENT_RESEND_HORIZON_HOURS", default=48)
 
 # Configure Gmail Email settings
 if DEBUG:
@@ -258,4 +260,9 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
-CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
\ No newline at end of file
+CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
+# Provider callbacks are processed by a dedicated worker:
+# celery -A config worker -Q webhooks
+CELERY_TASK_ROUTES = {
+    'apps.payments.tasks.process_payment_webhooks': {'queue': 'webhooks'},
+}
@@ -253,6 +253,8 @@ SPECTACULAR_SETTINGS = {
 PAWAPAY_BASE_URL = env(
     "PAWAPAY_BASE_URL", default="https://api.sandbox.pawapay.io")
 PAWAPAY_API_KEY = env("PAWAPAY_API_KEY", default="")
+# Pending deposits older than this are expired instead of retried
+PAYMENT_RESEND_HORIZON_HOURS = env.int("PAYMENT_RESEND_HORIZON_HOURS", default=48)
 
 # Configure Gmail Email settings
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -276,6 +278,11 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
 CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
+# Provider callbacks are processed by a dedicated worker:
+# celery -A config worker -Q webhooks
+CELERY_TASK_ROUTES = {
+    'apps.payments.tasks.process_payment_webhooks': {'queue': 'webhooks'},
+}
 
 # Configure Logging to capture errors and important info in production
 LOGGING = {
@@ -171,3 +171,24 @@ def dispute_factory(payment_factory):
     """Create a test dispute"""
     from tests.factories import DisputeFactory
     return DisputeFactory(payment=payment_factory)
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Start every test with closed PawaPay circuit breakers and full buckets"""
+    from django.core.cache import cache
+    from utils.circuit_breaker import CircuitBreaker, TokenBucket, _local_store
+    from utils.external_requests import pawapay_client
+    cache.delete_pattern(f"{CircuitBreaker.KEY_PREFIX}:*")
+    cache.delete_pattern(f"{TokenBucket.KEY_PREFIX}:*")
+    _local_store.clear()
+    pawapay_client.background_bucket.reset()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_throttles():
+    """Start every test with fresh API rate limit counters"""
+    from django.core.cache import cache
+    cache.delete_pattern("throttle_*")
+    yield
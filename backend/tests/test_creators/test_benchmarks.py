@@ -0,0 +1,160 @@
+"""
+Latency benchmarks for creator search over 100k creators and for the
+trending scores over a month of tips. Run with ``pytest -m slow -s`` to
+see the timings. On SQLite the search benchmark measures the inverted
+index fallback; its broadest queries match a quarter of the creators.
+"""
+import math
+import random
+import time
+import pytest
+from django.contrib.auth import get_user_model
+from apps.creators.models import CreatorCategory, CreatorProfile
+from apps.creators.services.search_service import CreatorSearchService
+from apps.creators.services.trending_service import TrendingService
+
+User = get_user_model()
+
+CREATORS = 100_000
+P95_MS = 250
+QUERIES = ["mwila", "chanda ban", "gospel", "kalindula sing", "photo lusaka",
+           "poet", "comedy", "drum", "natasha", "art ndola"]
+FIRST = ["Mwila", "Chanda", "Bwalya", "Natasha", "Mutale", "Kasonde",
+         "Lubasi", "Mulenga", "Chileshe", "Nkandu"]
+LAST = ["Banda", "Phiri", "Mwale", "Zulu", "Tembo", "Lungu", "Daka",
+        "Sakala", "Mumba", "Chirwa"]
+WORDS = ["gospel", "singer", "kalindula", "photographer", "lusaka", "ndola",
+         "poet", "comedy", "drummer", "painter", "dancer", "podcast",
+         "fashion", "cooking", "football", "travel"]
+
+
+def p95(timings):
+    return sorted(timings)[int(len(timings) * 0.95) - 1]
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestCreatorSearchBenchmark:
+    def test_p95_latency(self):
+        rng = random.Random(7)
+        categories = [
+            CreatorCategory.objects.create(name=name, slug=name.lower())
+            for name in ["Music", "Art", "Comedy", "Photography"]
+        ]
+        users = User.objects.bulk_create(
+            User(
+                email=f"creator{i}@example.com", username=f"creator{i}",
+                slug=f"creator{i}", user_type="creator",
+                first_name=rng.choice(FIRST), last_name=rng.choice(LAST),
+            )
+            for i in range(CREATORS)
+        )
+        profiles = CreatorProfile.objects.bulk_create(
+            CreatorProfile(
+                user=user, status="active", verified=True,
+                bio=" ".join(rng.sample(WORDS, 4)),
+            )
+            for user in users
+        )
+        through = CreatorProfile.categories.through
+        through.objects.bulk_create(
+            through(creatorprofile_id=profile.pk,
+                    creatorcategory_id=rng.choice(categories).pk)
+            for profile in profiles
+        )
+
+        started = time.perf_counter()
+        CreatorSearchService.rebuild()
+        print(f"\nindexed {CREATORS} creators in "
+              f"{time.perf_counter() - started:.1f}s")
+
+        timings = {}
+        for query in QUERIES:
+            cursor = None
+            for page in range(3):
+                started = time.perf_counter()
+                result = CreatorSearchService.search(query, cursor=cursor)
+                timings.setdefault(query, []).append(
+                    (time.perf_counter() - started) * 1000)
+                cursor = result["next"]
+        all_timings = [t for values in timings.values() for t in values]
+        for query, values in timings.items():
+            print(f"{query!r}: best {min(values):.1f}ms")
+        print(f"p95 {p95(all_timings):.1f}ms over {len(all_timings)} searches")
+        assert p95(all_timings) < P95_MS
+
+
+TRENDING_CREATORS = 20_000
+TIPS = 300_000
+DAYS = 30
+BATCH = 500
+
+
+def synthetic_tips(rng, start):
+    """A month of tips, popularity following a power law, in time order."""
+    weights = [1 / (rank + 1) ** 1.1 for rank in range(TRENDING_CREATORS)]
+    creators = rng.choices(range(1, TRENDING_CREATORS + 1), weights, k=TIPS)
+    times = sorted(rng.uniform(start, start + DAYS * 86400) for _ in range(TIPS))
+    return [
+        (creator, rng.choice([5, 10, 20, 50, 100]), at)
+        for creator, at in zip(creators, times)
+    ]
+
+
+@pytest.mark.slow
+class TestTrendingBenchmark:
+    @pytest.mark.parametrize("shared", [True, False])
+    def test_replay_month(self, shared, mocker):
+        if not shared:
+            mocker.patch.object(
+                TrendingService, "_client", side_effect=ConnectionError("down"))
+        TrendingService.clear()
+        rng = random.Random(11)
+        start = time.time() - DAYS * 86400
+        tips = synthetic_tips(rng, start)
+        end = tips[-1][2]
+
+        started = time.perf_counter()
+        next_compaction = start + 86400
+        for i in range(0, TIPS, BATCH):
+            batch = tips[i:i + BATCH]
+            if batch[0][2] >= next_compaction:
+                TrendingService.compact(now=next_compaction)
+                next_compaction += 86400
+            TrendingService.record(batch)
+        replay = time.perf_counter() - started
+
+        updates = []
+        for creator, amount, _ in tips[-1000:]:
+            started = time.perf_counter()
+            TrendingService.record([(creator, amount, end)])
+            updates.append((time.perf_counter() - started) * 1000)
+        reads = []
+        for _ in range(200):
+            started = time.perf_counter()
+            top = TrendingService.top(50, now=end)
+            reads.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        TrendingService.compact(now=end)
+        compaction = (time.perf_counter() - started) * 1000
+
+        # Same ranking as decaying every tip from scratch
+        rate = TrendingService.rate()
+        expected = {}
+        for creator, amount, at in tips + [
+            (creator, amount, end) for creator, amount, _ in tips[-1000:]
+        ]:
+            expected[creator] = expected.get(creator, 0) + (
+                TrendingService.weight(amount) * math.exp(rate * (at - end)))
+        best = sorted(expected, key=expected.get, reverse=True)[:10]
+        top = TrendingService.top(10, now=end)
+        TrendingService.clear()
+
+        print(f"\n{'redis' if shared else 'in-process'}: replayed {TIPS} tips "
+              f"in {replay:.1f}s, update p95 {p95(updates):.2f}ms, "
+              f"top-50 p95 {p95(reads):.2f}ms, compaction {compaction:.0f}ms")
+        assert [creator for creator, _ in top] == best
+        for creator, score in top:
+            assert score == pytest.approx(expected[creator], rel=1e-6)
+        assert p95(updates) < 20
+        assert p95(reads) < 20
@@ -0,0 +1,148 @@
+"""
+Tests for per-category creator counts, the category browse endpoint and
+the category filter of the creators list.
+"""
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from apps.creators.models import CreatorCategory
+from apps.creators.services.cache_service import CreatorCacheService
+from tests.factories import CreatorCategoryFactory, UserFactory
+
+CATEGORIES_URL = reverse("creators:creator_categories")
+LIST_URL = reverse("creators:creator_profiles_list")
+
+
+@pytest.fixture(autouse=True)
+def clear_creator_cache():
+    cache.delete_pattern(f"{CreatorCacheService.KEY_PREFIX}:*")
+    yield
+    cache.delete_pattern(f"{CreatorCacheService.KEY_PREFIX}:*")
+
+
+def listed_creator(verified=True):
+    profile = UserFactory().creator_profile
+    profile.verified = verified
+    profile.save()
+    return profile
+
+
+def count_of(category):
+    return CreatorCategory.objects.get(pk=category.pk).creators_count
+
+
+@pytest.mark.django_db
+class TestCategoryCounts:
+    def test_add_and_remove(self):
+        music, art = CreatorCategoryFactory.create_batch(2)
+        profile = listed_creator()
+
+        profile.categories.add(music, art)
+        assert (count_of(music), count_of(art)) == (1, 1)
+
+        profile.categories.remove(music)
+        assert (count_of(music), count_of(art)) == (0, 1)
+
+        profile.categories.set([music])
+        assert (count_of(music), count_of(art)) == (1, 0)
+
+        profile.categories.clear()
+        assert count_of(music) == 0
+
+    def test_changes_from_category_side(self):
+        music = CreatorCategoryFactory()
+        first, second = listed_creator(), listed_creator()
+
+        music.creators.add(first, second)
+        assert count_of(music) == 2
+
+        music.creators.remove(first)
+        assert count_of(music) == 1
+
+        music.creators.clear()
+        assert count_of(music) == 0
+
+    def test_only_listed_creators_count(self):
+        music = CreatorCategoryFactory()
+        profile = listed_creator(verified=False)
+        profile.categories.add(music)
+        assert count_of(music) == 0
+
+        profile.verified = True
+        profile.save()
+        assert count_of(music) == 1
+
+        profile.status = "suspended"
+        profile.save()
+        assert count_of(music) == 0
+
+    def test_profile_delete(self):
+        music = CreatorCategoryFactory()
+        profile = listed_creator()
+        profile.categories.add(music)
+
+        profile.delete()
+        assert count_of(music) == 0
+
+
+@pytest.mark.django_db
+class TestCategoryBrowseView:
+    def test_browse(self, api_client):
+        music = CreatorCategoryFactory(name="Music", is_featured=True, sort_order=10)
+        CreatorCategoryFactory(name="Art", sort_order=20)
+        CreatorCategoryFactory(name="Hidden", is_active=False)
+        listed_creator().categories.add(music)
+
+        response = api_client.get(CATEGORIES_URL)
+
+        assert response.status_code == 200
+        data = response.data["data"]
+        assert [(c["name"], c["creators_count"]) for c in data["featured"]] == [
+            ("Music", 1)]
+        assert [c["name"] for c in data["others"]] == ["Art"]
+
+    def test_country_filter(self, api_client):
+        CreatorCategoryFactory(name="Music", country_code="ZM")
+        CreatorCategoryFactory(name="Art", country_code="KE")
+
+        response = api_client.get(CATEGORIES_URL, {"country": "ke"})
+        assert [c["name"] for c in response.data["data"]["others"]] == ["Art"]
+
+    def test_served_from_cache(self, api_client, django_assert_num_queries):
+        CreatorCategoryFactory()
+        api_client.get(CATEGORIES_URL)
+
+        with django_assert_num_queries(0):
+            response = api_client.get(CATEGORIES_URL)
+        assert response.status_code == 200
+
+    def test_count_change_refreshes_cache(self, api_client):
+        music = CreatorCategoryFactory()
+        api_client.get(CATEGORIES_URL)
+
+        listed_creator().categories.add(music)
+        response = api_client.get(CATEGORIES_URL)
+        assert response.data["data"]["others"][0]["creators_count"] == 1
+
+
+@pytest.mark.django_db
+class TestCreatorsListCategoryFilter:
+    def test_filter_by_category(self, api_client):
+        music = CreatorCategoryFactory(slug="music")
+        in_music, other = listed_creator(), listed_creator()
+        in_music.categories.add(music)
+
+        response = api_client.get(LIST_URL, {"category": "music"})
+
+        assert response.status_code == 200
+        assert [c["user"]["id"] for c in response.data["results"]["data"]] == [
+            in_music.user.id]
+
+    def test_category_change_refreshes_filtered_page(self, api_client):
+        music = CreatorCategoryFactory(slug="music")
+        profile = listed_creator()
+        api_client.get(LIST_URL, {"category": "music"})
+
+        profile.categories.add(music)
+        response = api_client.get(LIST_URL, {"category": "music"})
+        assert len(response.data["results"]["data"]) == 1
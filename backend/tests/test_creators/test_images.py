@@ -0,0 +1,152 @@
+"""
+Tests for the resized creator image variants: rendering, recording on the
+profile, the upload trigger and the srcset fields of the serializers.
+"""
+import io
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from apps.creators.serializers import CreatorListSerializer, CreatorPublicSerializer
+from apps.creators.services.image_service import CreatorImageService
+
+ORIENTATION = 0x0112
+GPS_IFD = 0x8825
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def photo(width=3000, height=2000, name="photo.jpg"):
+    """A noisy phone-style JPEG, stored rotated with EXIF orientation and GPS."""
+    noise = Image.effect_noise((width, height), 80)
+    image = Image.merge("RGB", [noise, noise.rotate(180), noise.transpose(
+        Image.Transpose.FLIP_LEFT_RIGHT)])
+    exif = Image.Exif()
+    exif[ORIENTATION] = 6  # display rotated 90 degrees clockwise
+    exif[GPS_IFD] = {1: "S", 2: (15.0, 25.0, 0.0)}
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=95, exif=exif)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+def with_photo(profile, field="profile_image", **kwargs):
+    upload = photo(**kwargs)
+    getattr(profile, field).save(upload.name, upload)
+    return upload
+
+
+@pytest.mark.django_db
+class TestCreatorImageService:
+    def test_render_never_upscales(self):
+        rendered = CreatorImageService.render(photo(300, 200), [96, 192, 384])
+
+        assert sorted({width for width, _, _ in rendered}) == [96, 192, 200]
+        assert {fmt for _, fmt, _ in rendered} == {"webp", "jpeg"}
+
+    def test_generate_records_variants(self, user_factory):
+        profile = user_factory.creator_profile
+        upload = with_photo(profile)
+
+        variants = CreatorImageService.generate(profile.pk, "profile_image")
+
+        profile.refresh_from_db()
+        assert profile.get_image_variants("profile_image") == variants
+        assert sorted((v["width"], v["format"]) for v in variants) == [
+            (96, "jpeg"), (96, "webp"), (192, "jpeg"), (192, "webp"),
+            (384, "jpeg"), (384, "webp")]
+        card = next(v for v in variants if (v["width"], v["format"]) == (192, "webp"))
+        # Listing cards load an order of magnitude less than the upload
+        assert card["bytes"] * 10 < upload.size
+        assert default_storage.exists(card["name"])
+
+    def test_variants_are_upright_without_metadata(self, user_factory):
+        profile = user_factory.creator_profile
+        with_photo(profile)
+
+        for variant in CreatorImageService.generate(profile.pk, "profile_image"):
+            with default_storage.open(variant["name"]) as file, Image.open(file) as image:
+                assert image.width == variant["width"]
+                assert image.height > image.width  # orientation applied
+                assert len(image.getexif()) == 0
+
+    def test_new_upload_replaces_variants(
+        self, user_factory, django_capture_on_commit_callbacks,
+    ):
+        profile = user_factory.creator_profile
+        with_photo(profile)
+        old = CreatorImageService.generate(profile.pk, "profile_image")
+
+        profile.refresh_from_db()
+        with_photo(profile, name="new.jpg")
+        assert profile.get_image_variants("profile_image") == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            CreatorImageService.generate(profile.pk, "profile_image")
+        assert not any(default_storage.exists(v["name"]) for v in old)
+
+    def test_profile_without_image(self, user_factory):
+        profile = user_factory.creator_profile
+        assert CreatorImageService.generate(profile.pk, "cover_image") == []
+
+
+@pytest.mark.django_db
+class TestImageVariantSerializers:
+    def test_srcset(self, user_factory):
+        profile = user_factory.creator_profile
+        with_photo(profile, "cover_image", width=2000, height=3000)
+        CreatorImageService.generate(profile.pk, "cover_image")
+        profile.refresh_from_db()
+
+        data = CreatorListSerializer(profile).data["cover_image_variants"]
+
+        assert data["webp"].endswith(" 1600w")
+        assert data["webp"].count("w, ") == 2
+        assert data["jpeg"].split(", ")[0].endswith(" 480w")
+        assert data["src"].endswith(".jpeg")
+        assert data["src"] == data["jpeg"].split(" ")[0]
+
+    def test_missing_variants(self, user_factory):
+        profile = user_factory.creator_profile
+        data = CreatorPublicSerializer(profile).data
+        assert data["profile_image_variants"] is None
+        assert data["cover_image_variants"] is None
+
+
+@pytest.mark.django_db
+class TestImageUploadTrigger:
+    def test_upload_queues_variants(
+        self, auth_api_client, user_factory, mocker,
+        django_capture_on_commit_callbacks,
+    ):
+        delay = mocker.patch(
+            "apps.creators.tasks.generate_image_variants_task.delay")
+        auth_api_client.force_authenticate(user=user_factory)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_api_client.put(
+                "/api/v1/creators/profile/me/",
+                data={"profile_image": photo(400, 300)}, format="multipart",
+            )
+
+        assert response.status_code == 200
+        delay.assert_called_once_with(
+            user_factory.creator_profile.pk, "profile_image")
+
+    def test_no_upload_no_task(
+        self, auth_api_client, user_factory, mocker,
+        django_capture_on_commit_callbacks,
+    ):
+        delay = mocker.patch(
+            "apps.creators.tasks.generate_image_variants_task.delay")
+        auth_api_client.force_authenticate(user=user_factory)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            auth_api_client.put(
+                "/api/v1/creators/profile/me/", data={"bio": "Hi"},
+                format="multipart",
+            )
+        delay.assert_not_called()
@@ -0,0 +1,179 @@
+"""
+Tests for creator search: index maintenance, ranking, filters and cursor
+paging of CreatorSearchService, and the search endpoint.
+"""
+import pytest
+from django.core.management import call_command
+from apps.creators.models import CreatorProfile, CreatorSearchTerm
+from apps.creators.services.search_service import CreatorSearchService
+from tests.factories import CreatorCategoryFactory, UserFactory
+
+SEARCH_URL = "/api/v1/creators/search/"
+
+
+def make_creator(username, first_name="", last_name="", bio="",
+                 categories=(), verified=True, status="active"):
+    user = UserFactory(
+        username=username, first_name=first_name, last_name=last_name)
+    profile = user.creator_profile
+    profile.bio = bio
+    profile.verified = verified
+    profile.status = status
+    profile.save()
+    if categories:
+        profile.categories.set(categories)
+    return profile
+
+
+def terms_of(profile):
+    return dict(
+        CreatorSearchTerm.objects.filter(creator=profile)
+        .values_list("term", "weight")
+    )
+
+
+def usernames(result):
+    return [profile.user.username for profile in result["results"]]
+
+
+@pytest.mark.django_db
+class TestCreatorSearchIndex:
+    def test_tokenize(self):
+        assert CreatorSearchService.tokenize(
+            "Mwila's  MUSIC, music & a_b x") == ["mwila", "music"]
+
+    def test_profile_save_indexes_fields(self):
+        music = CreatorCategoryFactory(name="Music")
+        profile = make_creator(
+            "chanda", "Chanda", "Banda", bio="Kalindula music",
+            categories=[music])
+
+        profile.refresh_from_db()
+        assert profile.search_text == "chanda chanda banda music kalindula music"
+        terms = terms_of(profile)
+        assert terms["chanda"] == CreatorSearchService.NAME_WEIGHT
+        assert terms["music"] == CreatorSearchService.CATEGORY_WEIGHT
+        assert terms["kalindula"] == CreatorSearchService.BIO_WEIGHT
+
+    def test_user_rename_reindexes(self):
+        profile = make_creator("chanda", "Chanda")
+        user = profile.user
+        user.first_name = "Natasha"
+        user.save()
+
+        assert "natasha" in terms_of(profile)
+        assert "chanda" in terms_of(profile)
+
+    def test_category_changes_reindex(self):
+        music = CreatorCategoryFactory(name="Music")
+        profile = make_creator("chanda", categories=[music])
+
+        music.name = "Gospel"
+        music.save()
+        assert "gospel" in terms_of(profile)
+        assert "music" not in terms_of(profile)
+
+        music.creators.clear()
+        assert "gospel" not in terms_of(profile)
+
+    def test_unchanged_profile_is_not_rewritten(self):
+        profile = make_creator("chanda", bio="Painter")
+        assert CreatorSearchService.index_creator(profile) is False
+
+    def test_rebuild_command(self):
+        profile = make_creator("chanda", bio="Painter")
+        CreatorProfile.objects.update(search_text="")
+        CreatorSearchTerm.objects.all().delete()
+
+        call_command("rebuild_creator_search_index", batch_size=1)
+        assert "painter" in terms_of(profile)
+
+
+@pytest.mark.django_db
+class TestCreatorSearch:
+    def test_empty_query(self):
+        make_creator("chanda")
+        assert CreatorSearchService.search("  ") == {"results": [], "next": None}
+
+    def test_name_ranks_above_bio(self):
+        make_creator("painterbio", bio="Oil painter from Lusaka")
+        make_creator("painter")
+
+        assert usernames(CreatorSearchService.search("painter")) == [
+            "painter", "painterbio"]
+
+    def test_prefix_matching(self):
+        make_creator("kalindula")
+        assert usernames(CreatorSearchService.search("kalin")) == ["kalindula"]
+
+    def test_every_term_must_match(self):
+        make_creator("chanda", bio="gospel singer")
+        make_creator("mwila", bio="gospel drummer")
+
+        assert usernames(CreatorSearchService.search("gospel sing")) == ["chanda"]
+
+    def test_only_listed_creators(self):
+        make_creator("chanda", bio="poet")
+        make_creator("mwila", bio="poet", verified=False)
+        make_creator("bwalya", bio="poet", status="inactive")
+
+        assert usernames(CreatorSearchService.search("poet")) == ["chanda"]
+
+    def test_category_filter(self):
+        music = CreatorCategoryFactory(name="Music", slug="music")
+        art = CreatorCategoryFactory(name="Art", slug="art")
+        make_creator("chanda", bio="poet", categories=[music, art])
+        make_creator("mwila", bio="poet", categories=[art])
+        make_creator("bwalya", bio="poet")
+
+        result = CreatorSearchService.search("poet", categories=["music"])
+        assert usernames(result) == ["chanda"]
+        result = CreatorSearchService.search("poet", categories=["music", "art"])
+        assert sorted(usernames(result)) == ["chanda", "mwila"]
+
+    def test_cursor_paging(self):
+        for i in range(5):
+            make_creator(f"poet{i}", bio="poet")
+
+        seen = []
+        result = CreatorSearchService.search("poet", limit=2)
+        while True:
+            seen.extend(usernames(result))
+            if result["next"] is None:
+                break
+            result = CreatorSearchService.search(
+                "poet", cursor=result["next"], limit=2)
+        assert sorted(seen) == [f"poet{i}" for i in range(5)]
+        assert len(seen) == 5
+
+    def test_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            CreatorSearchService.search("poet", cursor="not-a-cursor")
+
+
+@pytest.mark.django_db
+class TestCreatorSearchView:
+    def test_search(self, api_client):
+        music = CreatorCategoryFactory(name="Music", slug="music")
+        make_creator("chanda", bio="poet", categories=[music])
+        make_creator("mwila", bio="poet")
+
+        response = api_client.get(SEARCH_URL, {"q": "poet", "category": "music"})
+        assert response.status_code == 200
+        assert response.data["status"] == "success"
+        assert [item["user"]["username"] for item in response.data["data"]] == ["chanda"]
+        assert response.data["next"] is None
+
+    def test_next_cursor(self, api_client):
+        for i in range(3):
+            make_creator(f"poet{i}")
+
+        response = api_client.get(SEARCH_URL, {"q": "poet", "limit": 2})
+        assert len(response.data["data"]) == 2
+        response = api_client.get(
+            SEARCH_URL, {"q": "poet", "limit": 2, "cursor": response.data["next"]})
+        assert len(response.data["data"]) == 1
+
+    def test_invalid_cursor(self, api_client):
+        response = api_client.get(SEARCH_URL, {"q": "poet", "cursor": "bad"})
+        assert response.status_code == 400
@@ -160,6 +160,7 @@ class TestCreatorPublicSerializer:
 
         expected_fields = {
             'user', 'bio', 'profile_image', 'cover_image', 'website',
+            'profile_image_variants', 'cover_image_variants',
             'followers_count', 'rating', 'verified', 'status',
             'created_at', 'updated_at', "wallet_id", "categories",
             "x_profile",
@@ -174,8 +175,8 @@ class TestCreatorPublicSerializer:
     def test_creator_public_serializer_contains_categories(self, user_factory):
         """Test serialization of creator profile public data."""
         CreatorCategoryFactory.create_batch(2)
-        c1 = CreatorCategory.objects.order_by('id').first()
-        c2 = CreatorCategory.objects.order_by('id').last()
+        c1 = CreatorCategory.objects.first()
+        c2 = CreatorCategory.objects.last()
         profile = user_factory.creator_profile
         profile.categories.set([c1, c2])
 
@@ -0,0 +1,170 @@
+"""
+Tests for trending creators: decayed scores in the shared sorted set and
+the in-process fallback, compaction, the CASH_IN feed and the endpoint.
+"""
+import time
+import pytest
+from decimal import Decimal
+from django.urls import reverse
+from apps.creators.services.trending_service import TrendingService
+from apps.wallets.services.wallet_services import WalletTransactionService
+from tests.factories import PaymentFactory, UserFactory
+
+DAY = TrendingService.HALF_LIFE.total_seconds()
+NOW = 1_800_000_000.0
+TRENDING_URL = reverse("creators:creator_trending")
+
+
+@pytest.fixture(autouse=True)
+def clear_trending():
+    TrendingService.clear()
+    yield
+    TrendingService.clear()
+
+
+@pytest.fixture
+def no_redis(mocker):
+    mocker.patch.object(
+        TrendingService, "_client", side_effect=ConnectionError("down"))
+
+
+def scores(count=10, now=NOW):
+    return {creator: round(score, 6)
+            for creator, score in TrendingService.top(count, now=now)}
+
+
+def listed_creator():
+    profile = UserFactory().creator_profile
+    profile.verified = True
+    profile.save()
+    return profile
+
+
+class TestTrendingScores:
+    def test_weight(self):
+        assert TrendingService.weight(0) == 1
+        assert TrendingService.weight(9) == 2
+        assert TrendingService.weight(Decimal("99")) == 3
+
+    @pytest.mark.parametrize("redis", [True, False])
+    def test_scores_decay(self, redis, request):
+        if not redis:
+            request.getfixturevalue("no_redis")
+        TrendingService.record([(1, 0, NOW), (2, 0, NOW - DAY)])
+
+        assert scores() == {1: 1.0, 2: 0.5}
+        assert scores(now=NOW + DAY) == {1: 0.5, 2: 0.25}
+
+    @pytest.mark.parametrize("redis", [True, False])
+    def test_velocity_ranking(self, redis, request):
+        if not redis:
+            request.getfixturevalue("no_redis")
+        # Three tips two days ago lose to two tips now
+        TrendingService.record([(1, 0, NOW - 2 * DAY)] * 3)
+        TrendingService.record([(2, 0, NOW), (2, 0, NOW - 60)])
+        TrendingService.record([(3, 0, NOW - 3 * DAY)])
+
+        assert [creator for creator, _ in TrendingService.top(2, now=NOW)] == [2, 1]
+
+    @pytest.mark.parametrize("redis", [True, False])
+    def test_compaction_keeps_scores(self, redis, request):
+        if not redis:
+            request.getfixturevalue("no_redis")
+        TrendingService.record([(1, 0, NOW - 20 * DAY), (2, 0, NOW - DAY)])
+        TrendingService.record([(1, 0, NOW), (3, 0, NOW - 2 * DAY)])
+        before = scores()
+
+        removed = TrendingService.compact(now=NOW)
+
+        assert removed == 0
+        assert scores() == before
+        TrendingService.record([(3, 0, NOW)])
+        assert scores()[3] == 1.25
+
+    def test_compaction_drops_decayed_creators(self):
+        TrendingService.record([(1, 0, NOW - 10 * DAY), (2, 0, NOW)])
+
+        assert TrendingService.compact(now=NOW) == 1
+        assert list(scores()) == [2]
+
+    def test_compaction_caps_members(self, monkeypatch):
+        monkeypatch.setattr(TrendingService, "MAX_MEMBERS", 2)
+        TrendingService.record([(1, 0, NOW), (2, 9, NOW), (3, 99, NOW)])
+
+        TrendingService.compact(now=NOW)
+        assert list(scores()) == [3, 2]
+
+
+@pytest.mark.django_db
+class TestTrendingFeed:
+    def test_cash_in_records_tip(
+        self, user_factory, django_capture_on_commit_callbacks,
+    ):
+        profile = user_factory.creator_profile
+        with django_capture_on_commit_callbacks(execute=True):
+            tx = WalletTransactionService.cash_in(
+                wallet=profile.wallet, amount=Decimal("10.00"),
+                payment=None, reference="TIP-1")
+
+        [(creator_id, score)] = TrendingService.top(5)
+        assert creator_id == profile.pk
+        # Net of fees, as recorded in the ledger
+        assert score == pytest.approx(
+            TrendingService.weight(tx.amount), rel=0.01)
+
+    def test_cash_in_many_records_tips(
+        self, user_factory, django_capture_on_commit_callbacks,
+    ):
+        wallet = user_factory.creator_profile.wallet
+        payments = PaymentFactory.create_batch(
+            3, wallet=wallet, amount=Decimal("10.00"))
+        with django_capture_on_commit_callbacks(execute=True):
+            WalletTransactionService.cash_in_many(payments)
+
+        [(creator_id, score)] = TrendingService.top(5)
+        assert creator_id == user_factory.creator_profile.pk
+        assert score > 2 * TrendingService.weight(Decimal("5"))
+
+    def test_rebuild_from_ledger(self, user_factory):
+        profile = user_factory.creator_profile
+        WalletTransactionService.cash_in(
+            wallet=profile.wallet, amount=Decimal("10.00"),
+            payment=None, reference="TIP-1")
+        TrendingService.clear()
+
+        assert TrendingService.rebuild() == 1
+        assert [creator for creator, _ in TrendingService.top(5)] == [profile.pk]
+
+
+@pytest.mark.django_db
+class TestTrendingView:
+    def test_trending(self, api_client):
+        first, second = listed_creator(), listed_creator()
+        unverified = UserFactory().creator_profile
+        now = time.time()
+        TrendingService.record([
+            (second.pk, 0, now), (first.pk, 0, now), (first.pk, 0, now),
+            (unverified.pk, 0, now), (unverified.pk, 0, now),
+            (unverified.pk, 0, now),
+        ])
+
+        response = api_client.get(TRENDING_URL)
+
+        assert response.status_code == 200
+        data = response.data["data"]
+        assert [item["user"]["id"] for item in data] == [
+            first.user.id, second.user.id]
+        assert data[0]["trending_score"] == pytest.approx(2, rel=0.01)
+
+    def test_limit(self, api_client):
+        now = time.time()
+        creators = [listed_creator() for _ in range(3)]
+        TrendingService.record([(c.pk, 0, now) for c in creators])
+
+        response = api_client.get(TRENDING_URL, {"limit": 2})
+        assert len(response.data["data"]) == 2
+        assert api_client.get(TRENDING_URL, {"limit": "x"}).status_code == 400
+
+    def test_empty(self, api_client):
+        response = api_client.get(TRENDING_URL)
+        assert response.data["data"] == []
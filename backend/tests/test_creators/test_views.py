@@ -423,3 +423,131 @@ class TestPublicCreatorProfile:
         assert creator_profile.user.first_name in response.content.decode()
         assert creator_profile.user.last_name in response.content.decode()
         assert "bio" in response.content.decode()
+
+
+@pytest.fixture
+def clear_creator_cache():
+    from django.core.cache import cache
+    from apps.creators.services.cache_service import CreatorCacheService
+    cache.delete_pattern(f"{CreatorCacheService.KEY_PREFIX}:*")
+    yield
+    cache.delete_pattern(f"{CreatorCacheService.KEY_PREFIX}:*")
+
+
+def listed_creators(count):
+    profiles = [user.creator_profile for user in UserFactory.create_batch(count)]
+    for followers, profile in enumerate(profiles):
+        profile.verified = True
+        profile.followers_count = followers
+        profile.save()
+    return profiles
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("clear_creator_cache")
+class TestCreatorCache:
+    def test_profile_is_served_from_cache(
+        self, api_client, user_factory, django_assert_num_queries
+    ):
+        url = reverse("creators:creator_public_view", args=[user_factory.slug])
+        first = api_client.get(url)
+
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+
+        assert second.status_code == 200
+        assert second.data == first.data
+
+    def test_profile_update_invalidates_only_that_creator(
+        self, api_client, user_factory
+    ):
+        other = UserFactory()
+        url = reverse("creators:creator_public_view", args=[user_factory.slug])
+        other_url = reverse("creators:creator_public_view", args=[other.slug])
+        api_client.get(url)
+        other_before = api_client.get(other_url).data
+
+        profile = user_factory.creator_profile
+        profile.bio = "Fresh bio"
+        profile.save()
+
+        assert api_client.get(url).data["data"]["bio"] == "Fresh bio"
+        assert api_client.get(other_url).data == other_before
+
+    def test_profile_update_keeps_other_cache_entries(self, user_factory):
+        from django.core.cache import cache
+        cache.set("unrelated:key", "kept")
+
+        profile = user_factory.creator_profile
+        profile.bio = "Updated"
+        profile.save()
+
+        assert cache.get("unrelated:key") == "kept"
+        cache.delete("unrelated:key")
+
+    def test_edit_refreshes_listing_page_showing_creator(self, api_client):
+        profile = listed_creators(2)[0]
+        url = reverse("creators:creator_profiles_list")
+        api_client.get(url)
+
+        profile.bio = "New listing bio"
+        profile.save()
+
+        assert "New listing bio" in api_client.get(url).content.decode()
+
+    def test_edit_keeps_pages_not_showing_creator(self, api_client):
+        profiles = listed_creators(3)
+        url = reverse("creators:creator_profiles_list")
+        # Most followed first: page 1 holds profiles[2] only
+        page_one = api_client.get(url, {"page_size": 1})
+        api_client.get(url, {"page_size": 1, "page": 3})
+
+        profile = profiles[0]
+        profile.bio = "Only on page three"
+        profile.save()
+        from apps.creators.services.cache_service import CreatorCacheService
+        before = CreatorCacheService.metrics()["list"]["hits"]
+
+        assert api_client.get(url, {"page_size": 1}).data == page_one.data
+        assert CreatorCacheService.metrics()["list"]["hits"] == before + 1
+        page_three = api_client.get(url, {"page_size": 1, "page": 3})
+        assert "Only on page three" in page_three.content.decode()
+
+    def test_verification_adds_creator_to_listing(self, api_client):
+        listed_creators(1)
+        url = reverse("creators:creator_profiles_list")
+        assert api_client.get(url).data["count"] == 1
+
+        newcomer = UserFactory().creator_profile
+        newcomer.verified = True
+        newcomer.save()
+
+        assert api_client.get(url).data["count"] == 2
+
+    def test_category_change_invalidates_profile(self, api_client, user_factory):
+        url = reverse("creators:creator_public_view", args=[user_factory.slug])
+        api_client.get(url)
+
+        user_factory.creator_profile.categories.add(
+            CreatorCategoryFactory(name="Music"))
+
+        categories = api_client.get(url).data["data"]["categories"]
+        assert [category["name"] for category in categories] == ["Music"]
+
+    def test_hit_rate_metrics(self, api_client, user_factory, admin_user):
+        url = reverse("creators:creator_public_view", args=[user_factory.slug])
+        api_client.get(url)
+        api_client.get(url)
+        api_client.get(url)
+
+        api_client.force_authenticate(user=admin_user)
+        response = api_client.get(reverse("creators:creator_cache_metrics"))
+
+        assert response.status_code == 200
+        assert response.data["data"]["profile"] == {
+            "hits": 2, "misses": 1, "hit_rate": 0.6667}
+
+    def test_metrics_require_admin(self, api_client):
+        response = api_client.get(reverse("creators:creator_cache_metrics"))
+
+        assert response.status_code in (401, 403)
@@ -0,0 +1,68 @@
+"""
+Benchmark for keeping the bulky payment data in PaymentPayload. Run with
+``pytest -m slow -s`` to see the row sizes and timings.
+"""
+import json
+import time
+import pytest
+from django.db import connection
+from apps.payments.models import Payment
+from tests.factories import PaymentFactory
+
+PAYMENTS = 300
+ROUNDS = 5
+LIST_FIELDS = ["id", "reference", "amount", "currency", "status", "created_at"]
+
+
+def best_of(rounds, query):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        rows = list(query())
+        timings.append(time.perf_counter() - started)
+    return min(timings), rows
+
+
+def row_bytes(rows):
+    return sum(len(json.dumps(row, default=str)) for row in rows) / len(rows)
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestPaymentPayloadBenchmark:
+    def test_narrow_rows(self, payment_factory):
+        provider_data = {"events": [{"status": "ACCEPTED", "raw": "x" * 200}] * 10}
+        for _ in range(PAYMENTS):
+            PaymentFactory(
+                wallet=payment_factory.wallet,
+                metadata={"status": "ACCEPTED", "raw": "y" * 500},
+                provider_data=provider_data,
+                callback_data={"raw": "z" * 500},
+            )
+        payload_fields = [
+            f"payload__{field}" for field in
+            ("metadata", "provider_data", "provider_metadata",
+             "callback_data", "user_agent")
+        ]
+        payment_fields = [
+            f.attname for f in Payment._meta.concrete_fields]
+
+        # The payment row as it was with the blobs inline
+        wide_time, wide_rows = best_of(ROUNDS, lambda: Payment.objects.values(
+            *payment_fields, *payload_fields))
+        row_time, rows = best_of(ROUNDS, lambda: Payment.objects.values(
+            *payment_fields))
+        list_time, list_rows = best_of(ROUNDS, lambda: Payment.objects.values(
+            *LIST_FIELDS))
+
+        print(
+            f"\n{connection.vendor}, {len(rows)} payments"
+            f"\nwith payload:  {row_bytes(wide_rows):.0f} B/row "
+            f"{wide_time * 1000:.2f}ms"
+            f"\npayment row:   {row_bytes(rows):.0f} B/row "
+            f"{row_time * 1000:.2f}ms"
+            f"\nlist columns:  {row_bytes(list_rows):.0f} B/row "
+            f"{list_time * 1000:.2f}ms"
+        )
+        assert row_bytes(rows) * 4 < row_bytes(wide_rows)
+        assert list_time < wide_time
@@ -41,3 +41,16 @@ class TestCheckFinalStatus:
         assert WebHook.objects.filter(
             payment=payment, event_type='deposit.completed').exists()
         mock_resend.assert_not_called()
+
+    def test_check_final_statuses_batches_resends(self, payment_factory, mocker):
+        from apps.payments.helpers import check_final_statuses
+        from tests.factories import PaymentFactory
+        final = PaymentFactory(wallet=payment_factory.wallet, status='failed')
+        mock_resend = mocker.patch(
+            'apps.payments.helpers.resend_callbacks',
+            return_value={str(payment_factory.id): ({'status': 'ACCEPTED'}, 200)})
+
+        results = check_final_statuses([payment_factory, final])
+
+        assert results == [(payment_factory, 'ACCEPTED'), (final, 'failed')]
+        mock_resend.assert_called_once_with([payment_factory.id])
@@ -0,0 +1,67 @@
+"""
+Tests for Payment model storage
+"""
+import pytest
+from apps.payments.models import Payment, PaymentPayload
+from tests.factories import PaymentFactory
+
+
+@pytest.mark.django_db
+class TestPaymentPayload:
+    def test_payload_fields_are_stored_off_the_payment_row(self, payment_factory):
+        payment = PaymentFactory(
+            wallet=payment_factory.wallet,
+            metadata={"status": "ACCEPTED"},
+            user_agent="pytest",
+        )
+
+        payload = PaymentPayload.objects.get(payment=payment)
+        assert payload.metadata == {"status": "ACCEPTED"}
+        assert payload.user_agent == "pytest"
+        assert "metadata" not in [f.name for f in Payment._meta.concrete_fields]
+
+    def test_payload_is_loaded_on_demand(
+        self, payment_factory, django_assert_num_queries
+    ):
+        payment_factory.metadata = {"depositId": "abc"}
+        payment_factory.save()
+
+        with django_assert_num_queries(1):
+            payment = Payment.objects.get(id=payment_factory.id)
+        with django_assert_num_queries(1):
+            assert payment.metadata == {"depositId": "abc"}
+            assert payment.provider_data == {}
+
+    def test_select_related_payload(
+        self, payment_factory, django_assert_num_queries
+    ):
+        payment_factory.metadata = {"depositId": "abc"}
+        payment_factory.save()
+
+        with django_assert_num_queries(1):
+            payment = Payment.objects.select_related("payload").get(
+                id=payment_factory.id)
+            assert payment.metadata == {"depositId": "abc"}
+
+    def test_missing_payload_reads_defaults(self, payment_factory):
+        PaymentPayload.objects.filter(payment=payment_factory).delete()
+        payment = Payment.objects.get(id=payment_factory.id)
+
+        assert payment.metadata == {}
+        assert payment.user_agent == ""
+        payment.save()
+        assert not PaymentPayload.objects.filter(payment=payment).exists()
+
+    def test_update_status_records_change_in_payload(self, payment_factory):
+        payment_factory.update_status("completed", metadata={"by": "admin"})
+
+        payload = PaymentPayload.objects.get(payment=payment_factory)
+        assert payload.metadata["status_changes"][0]["to"] == "completed"
+
+    def test_payload_is_deleted_with_payment(self, payment_factory):
+        payment_factory.metadata = {"a": 1}
+        payment_factory.save()
+
+        Payment.objects.filter(id=payment_factory.id).delete()
+
+        assert not PaymentPayload.objects.exists()
@@ -0,0 +1,178 @@
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+from apps.payments.models import Payment
+from apps.payments.services.payment_reconciler import PaymentReconciler
+from apps.wallets.models import WalletTransaction
+from tests.factories import PaymentFactory
+
+
+def provider_returns(mocker, status_for):
+    """Patch PawaPay to answer with status_for(deposit_id)"""
+    def response(deposit_id):
+        status = status_for(deposit_id)
+        if status is None:
+            return {"status": "EXTERNAL_ERROR"}, 500
+        return {"data": {"depositId": deposit_id, "status": status}}, 200
+
+    def fetch(ids, **kwargs):
+        return {str(i): response(str(i)) for i in ids}
+    return mocker.patch(
+        "apps.payments.services.payment_reconciler.fetch_deposit_statuses",
+        side_effect=fetch,
+    )
+
+
+@pytest.mark.django_db
+class TestPaymentReconciler:
+    def test_only_recent_non_terminal_payments_are_polled(
+        self, user_factory, mocker
+    ):
+        wallet = user_factory.creator_profile.wallet
+        recent = PaymentFactory(wallet=wallet, status="pending")
+        PaymentFactory(wallet=wallet, status="failed")
+        PaymentFactory(wallet=wallet, status="completed")
+        old = PaymentFactory(wallet=wallet, status="pending")
+        Payment.objects.filter(id=old.id).update(
+            created_at=timezone.now() - timedelta(days=30))
+        mock_request = provider_returns(mocker, lambda _id: "PROCESSING")
+
+        result = PaymentReconciler.reconcile()
+
+        assert result == {"checked": 1, "resolved": 0, "pending": 1}
+        mock_request.assert_called_once()
+        assert mock_request.call_args[0][0] == [recent.id]
+
+    def test_completed_payment_credits_wallet_once(self, user_factory, mocker):
+        wallet = user_factory.creator_profile.wallet
+        payment = PaymentFactory(
+            wallet=wallet, status="pending", amount=Decimal("100.00"))
+        provider_returns(mocker, lambda _id: "COMPLETED")
+
+        assert PaymentReconciler.reconcile()["resolved"] == 1
+        assert PaymentReconciler.reconcile()["checked"] == 0
+
+        payment.refresh_from_db()
+        wallet.refresh_from_db()
+        assert payment.status == "completed"
+        assert wallet.balance == Decimal("90.00")
+        assert WalletTransaction.objects.filter(
+            payment=payment, transaction_type="CASH_IN").count() == 1
+
+    def test_unresolved_payment_backs_off(self, user_factory, mocker):
+        wallet = user_factory.creator_profile.wallet
+        PaymentFactory(wallet=wallet, status="pending")
+        mock_request = provider_returns(mocker, lambda _id: None)
+        now = timezone.now()
+
+        PaymentReconciler.reconcile(now=now)
+        # Still inside the first backoff window
+        PaymentReconciler.reconcile(
+            now=now + timedelta(seconds=PaymentReconciler.BASE_BACKOFF_SECONDS - 1))
+        assert mock_request.call_count == 1
+
+        PaymentReconciler.reconcile(
+            now=now + timedelta(seconds=PaymentReconciler.BASE_BACKOFF_SECONDS + 1))
+        assert mock_request.call_count == 2
+
+    def test_backoff_is_stored_on_the_payment(self, user_factory, mocker):
+        payment = PaymentFactory(
+            wallet=user_factory.creator_profile.wallet, status="pending")
+        provider_returns(mocker, lambda _id: None)
+        now = timezone.now()
+
+        PaymentReconciler.reconcile(now=now)
+        PaymentReconciler.reconcile(now=now + timedelta(hours=1))
+
+        payment.refresh_from_db()
+        assert payment.reconcile_attempts == 2
+        assert payment.reconcile_at == now + timedelta(
+            hours=1, seconds=PaymentReconciler.backoff_seconds(2))
+        # The resend scheduler's columns are left alone
+        assert payment.check_attempts == 0
+        assert payment.next_check_at is None
+
+    def test_rate_limited_check_does_not_grow_backoff(self, user_factory, mocker):
+        payment = PaymentFactory(
+            wallet=user_factory.creator_profile.wallet, status="pending",
+            reconcile_attempts=3)
+        mocker.patch(
+            "apps.payments.services.payment_reconciler.fetch_deposit_statuses",
+            side_effect=lambda ids, **kwargs: {
+                str(i): ({"status": "RATE_LIMITED"}, 429) for i in ids},
+        )
+        now = timezone.now()
+
+        result = PaymentReconciler.reconcile(now=now)
+
+        assert result == {"checked": 1, "resolved": 0, "pending": 1}
+        payment.refresh_from_db()
+        assert payment.reconcile_attempts == 3
+        assert payment.reconcile_at == now + timedelta(
+            seconds=PaymentReconciler.backoff_seconds(3))
+
+    def test_backoff_doubles_up_to_cap(self):
+        assert PaymentReconciler.backoff_seconds(1) == 60
+        assert PaymentReconciler.backoff_seconds(2) == 120
+        assert PaymentReconciler.backoff_seconds(3) == 240
+        assert PaymentReconciler.backoff_seconds(50) == (
+            PaymentReconciler.MAX_BACKOFF_SECONDS)
+
+    def test_failed_provider_status_is_stored(self, user_factory, mocker):
+        wallet = user_factory.creator_profile.wallet
+        payments = PaymentFactory.create_batch(3, wallet=wallet, status="accepted")
+        provider_returns(mocker, lambda _id: "FAILED")
+
+        result = PaymentReconciler.reconcile()
+
+        assert result == {"checked": 3, "resolved": 3, "pending": 0}
+        for payment in payments:
+            payment.refresh_from_db()
+            assert payment.status == "failed"
+        wallet.refresh_from_db()
+        assert wallet.balance == Decimal("0.00")
+
+    def test_status_and_credit_are_applied_under_the_payment_lock(
+        self, user_factory, mocker
+    ):
+        payment = PaymentFactory(
+            wallet=user_factory.creator_profile.wallet, status="pending")
+        spy = mocker.spy(type(Payment.objects), "select_for_update")
+
+        assert PaymentReconciler.apply_status(payment, "completed")
+
+        spy.assert_called_once()
+        assert WalletTransaction.objects.filter(
+            payment=payment, transaction_type="CASH_IN").count() == 1
+
+    def test_failed_credit_keeps_payment_pending(self, user_factory, mocker):
+        payment = PaymentFactory(
+            wallet=user_factory.creator_profile.wallet, status="pending")
+        provider_returns(mocker, lambda _id: "COMPLETED")
+        mocker.patch(
+            "apps.payments.services.payment_reconciler."
+            "WalletTransactionService.cash_in",
+            side_effect=Exception("ledger unavailable"),
+        )
+        now = timezone.now()
+
+        result = PaymentReconciler.reconcile(now=now)
+
+        assert result == {"checked": 1, "resolved": 0, "pending": 1}
+        payment.refresh_from_db()
+        assert payment.status == "pending"
+        # Picked up again once the backoff elapsed
+        mocker.stopall()
+        provider_returns(mocker, lambda _id: "COMPLETED")
+        later = now + timedelta(seconds=PaymentReconciler.BASE_BACKOFF_SECONDS + 1)
+        assert PaymentReconciler.reconcile(now=later)["resolved"] == 1
+        assert WalletTransaction.objects.filter(
+            payment=payment, transaction_type="CASH_IN").count() == 1
+
+    def test_parse_status(self):
+        assert PaymentReconciler.parse_status(
+            {"data": {"status": "COMPLETED"}}, 200) == "completed"
+        assert PaymentReconciler.parse_status({"status": "NOT_FOUND"}, 200) is None
+        assert PaymentReconciler.parse_status("gateway timeout", 200) is None
+        assert PaymentReconciler.parse_status({"status": "EXTERNAL_ERROR"}, 500) is None
@@ -0,0 +1,87 @@
+import pytest
+from datetime import timedelta
+from django.core.cache import cache
+from django.utils import timezone
+from apps.payments.models import Payment
+from apps.payments.services.resend_scheduler import DepositResendScheduler
+from tests.factories import PaymentFactory
+
+
+@pytest.fixture(autouse=True)
+def clear_in_flight():
+    cache.delete_pattern(f"{DepositResendScheduler.IN_FLIGHT_PREFIX}:*")
+    yield
+
+
+@pytest.mark.django_db
+class TestDepositResendScheduler:
+    def test_claims_only_due_pending_payments(self, user_factory):
+        wallet = user_factory.creator_profile.wallet
+        now = timezone.now()
+        new = PaymentFactory(wallet=wallet, status="pending")
+        due = PaymentFactory(
+            wallet=wallet, status="accepted", next_check_at=now - timedelta(minutes=1))
+        PaymentFactory(
+            wallet=wallet, status="pending", next_check_at=now + timedelta(minutes=1))
+        PaymentFactory(wallet=wallet, status="completed")
+
+        claimed = DepositResendScheduler.claim_due(now=now)
+
+        assert set(claimed) == {new.id, due.id}
+
+    def test_claim_backs_off_exponentially(self, user_factory):
+        payment = PaymentFactory(
+            wallet=user_factory.creator_profile.wallet, status="pending")
+        now = timezone.now()
+
+        for attempt in range(3):
+            DepositResendScheduler.release(payment.id)
+            assert DepositResendScheduler.claim_due(now=now) == [payment.id]
+            payment.refresh_from_db()
+            assert payment.check_attempts == attempt + 1
+            assert payment.next_check_at == (
+                now + DepositResendScheduler.BASE_DELAY * 2 ** attempt)
+            # Not due again until the backoff elapses
+            DepositResendScheduler.release(payment.id)
+            assert DepositResendScheduler.claim_due(now=now) == []
+            now = payment.next_check_at
+
+    def test_delay_is_capped(self):
+        assert DepositResendScheduler.delay_for(0) == timedelta(minutes=5)
+        assert DepositResendScheduler.delay_for(100) == (
+            DepositResendScheduler.MAX_DELAY)
+
+    def test_in_flight_resends_are_not_enqueued_twice(self, user_factory):
+        payment = PaymentFactory(
+            wallet=user_factory.creator_profile.wallet, status="pending")
+        Payment.objects.filter(id=payment.id).update(next_check_at=None)
+        cache.add(DepositResendScheduler.in_flight_key(payment.id), 1)
+
+        assert DepositResendScheduler.claim_due() == []
+
+    def test_claims_are_limited_per_run(self, user_factory, monkeypatch):
+        monkeypatch.setattr(DepositResendScheduler, "MAX_PER_RUN", 3)
+        monkeypatch.setattr(DepositResendScheduler, "CHUNK_SIZE", 2)
+        PaymentFactory.create_batch(
+            5, wallet=user_factory.creator_profile.wallet, status="pending")
+
+        assert len(DepositResendScheduler.claim_due()) == 3
+        assert Payment.objects.filter(check_attempts=1).count() == 3
+
+    def test_payments_past_horizon_are_expired(self, user_factory, settings):
+        settings.PAYMENT_RESEND_HORIZON_HOURS = 24
+        wallet = user_factory.creator_profile.wallet
+        stale = PaymentFactory(wallet=wallet, status="pending")
+        recent = PaymentFactory(wallet=wallet, status="pending")
+        failed = PaymentFactory(wallet=wallet, status="failed")
+        Payment.objects.filter(id__in=[stale.id, failed.id]).update(
+            created_at=timezone.now() - timedelta(hours=25))
+
+        assert DepositResendScheduler.expire_stale() == 1
+
+        stale.refresh_from_db()
+        recent.refresh_from_db()
+        failed.refresh_from_db()
+        assert stale.status == "expired"
+        assert recent.status == "pending"
+        assert failed.status == "failed"
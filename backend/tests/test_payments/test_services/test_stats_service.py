@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+import pytest
+from django.core.cache import cache
+from apps.payments.models import Payment, PaymentStatsBucket
+from apps.payments.services.stats_service import PaymentStatsService
+from apps.payments.tasks import build_payment_stats_buckets
+from tests.factories import PaymentFactory
+
+NOW = datetime(2026, 3, 10, 12, 30, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def clear_stats_cache():
+    cache.delete_pattern(f"{PaymentStatsService.KEY_PREFIX}:*")
+    yield
+    cache.delete_pattern(f"{PaymentStatsService.KEY_PREFIX}:*")
+
+
+@pytest.fixture
+def make_payment(payment_factory):
+    def make(created_at, status="completed", amount="100.00", currency="ZMW"):
+        payment = PaymentFactory(
+            wallet=payment_factory.wallet, status=status,
+            amount=Decimal(amount), currency=currency,
+            provider_fee=Decimal("0"),
+        )
+        Payment.objects.filter(id=payment.id).update(created_at=created_at)
+        return payment
+    # Keep the fixture's own payment out of the ranges under test
+    Payment.objects.filter(id=payment_factory.id).update(is_deleted=True)
+    return make
+
+
+@pytest.mark.django_db
+class TestGetPaymentStats:
+    def test_single_query(self, make_payment, django_assert_num_queries):
+        make_payment(NOW, status="completed", amount="100.00")
+        make_payment(NOW, status="failed", amount="40.00")
+        make_payment(NOW, status="refunded", amount="10.00")
+
+        with django_assert_num_queries(1):
+            stats = Payment.objects.get_payment_stats(
+                NOW - timedelta(hours=1), NOW + timedelta(hours=1))
+
+        assert stats["total_payments"] == 3
+        assert stats["successful_payments"] == 1
+        assert stats["failed_payments"] == 1
+        assert stats["refunded_payments"] == 1
+        assert stats["total_amount"] == Decimal("150.00")
+        assert stats["success_rate"] == pytest.approx(100 / 3)
+
+    def test_empty_range(self, make_payment):
+        stats = Payment.objects.get_payment_stats(NOW, NOW + timedelta(hours=1))
+
+        assert stats["total_payments"] == 0
+        assert stats["total_amount"] == Decimal("0")
+        assert stats["success_rate"] == 0
+
+
+@pytest.mark.django_db
+class TestPaymentStatsService:
+    def test_builds_only_settled_hours(self, make_payment):
+        settled = NOW - timedelta(days=5)
+        make_payment(settled)
+        make_payment(settled + timedelta(minutes=10), currency="EUR")
+        make_payment(NOW - timedelta(hours=1))
+
+        built = PaymentStatsService.build_buckets(now=NOW)
+
+        assert built == 2
+        assert PaymentStatsService.watermark() == datetime(
+            2026, 3, 8, 12, tzinfo=dt_timezone.utc)
+        bucket = PaymentStatsBucket.objects.get(currency="ZMW")
+        assert bucket.hour == datetime(2026, 3, 5, 12, tzinfo=dt_timezone.utc)
+        assert bucket.successful_amount == Decimal("100.00")
+
+    def test_rebuild_picks_up_late_status_changes(self, make_payment):
+        payment = make_payment(NOW - timedelta(days=3), status="pending")
+        PaymentStatsService.build_buckets(now=NOW)
+        Payment.objects.filter(id=payment.id).update(status="completed")
+
+        PaymentStatsService.build_buckets(now=NOW + timedelta(hours=1))
+
+        bucket = PaymentStatsBucket.objects.get()
+        assert bucket.successful_payments == 1
+        assert bucket.pending_payments == 0
+
+    def test_combines_buckets_and_live_rows(self, make_payment):
+        make_payment(NOW - timedelta(days=5, minutes=20), amount="10.00")
+        make_payment(NOW - timedelta(days=4), amount="20.00")
+        make_payment(NOW - timedelta(hours=2), amount="30.00", status="failed")
+        PaymentStatsService.build_buckets(now=NOW)
+        # Marks which hours are read from buckets
+        PaymentStatsBucket.objects.update(successful_amount=Decimal("999"))
+
+        stats = PaymentStatsService.get(
+            start=NOW - timedelta(days=5, minutes=25), end=NOW)
+
+        totals = stats["totals"]
+        assert totals["total_payments"] == 3
+        # The partial first hour is read live, the full day 4 hour from
+        # its bucket
+        assert totals["successful_amount"] == Decimal("1009.00")
+        assert totals["failed_amount"] == Decimal("30.00")
+
+    def test_matches_live_aggregation(self, make_payment):
+        for hours in (100, 75, 60, 30, 5, 1):
+            make_payment(NOW - timedelta(hours=hours, minutes=hours % 7))
+        make_payment(NOW - timedelta(hours=80), status="failed")
+        start, end = NOW - timedelta(days=6), NOW
+        expected = Payment.objects.get_payment_stats(start, end)
+        PaymentStatsService.build_buckets(now=NOW)
+
+        totals = PaymentStatsService.get(start=start, end=end)["totals"]
+
+        for field in ("total_payments", "successful_payments",
+                      "failed_payments", "total_amount", "success_rate"):
+            assert totals[field] == expected[field]
+
+    def test_series_and_currencies(self, make_payment):
+        make_payment(NOW - timedelta(hours=3), amount="10.00")
+        make_payment(NOW - timedelta(hours=1), amount="20.00")
+        make_payment(NOW - timedelta(hours=1), amount="5.00", currency="EUR")
+
+        stats = PaymentStatsService.get(
+            start=NOW - timedelta(hours=4), end=NOW, granularity="hour")
+
+        assert [row["period"] for row in stats["series"]] == [
+            "2026-03-10T09:00:00+00:00", "2026-03-10T11:00:00+00:00"]
+        assert stats["series"][1]["total_payments"] == 2
+        assert [row["currency"] for row in stats["by_currency"]] == [
+            "ZMW", "EUR"]
+
+        daily = PaymentStatsService.get(
+            start=NOW - timedelta(hours=4), end=NOW, granularity="day")
+        assert daily["series"][0]["period"] == "2026-03-10"
+
+    def test_results_are_cached(self, make_payment, django_assert_num_queries):
+        make_payment(NOW - timedelta(hours=1))
+        start, end = NOW - timedelta(hours=2), NOW
+        PaymentStatsService.get(start=start, end=end)
+
+        with django_assert_num_queries(0):
+            stats = PaymentStatsService.get(start=start, end=end)
+
+        assert stats["totals"]["total_payments"] == 1
+
+    def test_unknown_granularity(self):
+        with pytest.raises(ValueError):
+            PaymentStatsService.get(granularity="week")
+
+    def test_build_task(self, make_payment):
+        make_payment(NOW - timedelta(days=5))
+
+        assert build_payment_stats_buckets() == "Built 1 payment stats buckets"
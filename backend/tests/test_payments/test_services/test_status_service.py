@@ -0,0 +1,71 @@
+import threading
+import uuid
+import pytest
+from apps.payments.services.status_service import PaymentStatusService
+from apps.payments.services.webhook_service import WebhookProcessingService
+from apps.payments.models import PaymentWebhookLog
+
+
+def publish_later(payment_id, status, delay=0.2):
+    timer = threading.Timer(
+        delay, PaymentStatusService.publish, args=(payment_id, status))
+    timer.start()
+    return timer
+
+
+class TestPaymentStatusService:
+    def test_waiter_receives_published_status(self):
+        payment_id = uuid.uuid4()
+        timer = publish_later(payment_id, "failed")
+
+        assert PaymentStatusService.wait_for_status(payment_id, 5) == "failed"
+        timer.join()
+
+    def test_wait_times_out(self):
+        assert PaymentStatusService.wait_for_status(uuid.uuid4(), 0.2) is None
+
+    def test_terminal_status_is_cached(self):
+        payment_id = uuid.uuid4()
+        PaymentStatusService.publish(payment_id, "accepted")
+        assert PaymentStatusService.cached_status(payment_id) is None
+
+        PaymentStatusService.publish(payment_id, "completed")
+
+        assert PaymentStatusService.cached_status(payment_id) == "completed"
+        # Late waiters get the cached terminal status straight away
+        assert PaymentStatusService.wait_for_status(payment_id, 5) == "completed"
+
+    def test_upstream_check_is_single_flight(self):
+        payment_id = uuid.uuid4()
+        assert PaymentStatusService.claim_upstream_check(payment_id)
+        assert not PaymentStatusService.claim_upstream_check(payment_id)
+
+    def test_local_broker_when_redis_is_down(self, mocker):
+        mocker.patch(
+            "django_redis.get_redis_connection",
+            side_effect=ConnectionError("redis down"))
+        payment_id = uuid.uuid4()
+        timer = publish_later(payment_id, "accepted")
+
+        assert PaymentStatusService.wait_for_status(payment_id, 5) == "accepted"
+        timer.join()
+
+
+@pytest.mark.django_db
+class TestWebhookProcessingPublishes:
+    def test_processed_callback_publishes_status(
+        self, payment_factory, django_capture_on_commit_callbacks
+    ):
+        PaymentWebhookLog.objects.create(
+            raw_payload="{}",
+            parsed_payload={"status": "FAILED"},
+            payment=payment_factory,
+            provider=payment_factory.provider,
+            external_id="PUB-1",
+            status="received",
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            WebhookProcessingService.process_payment(payment_factory.id)
+
+        assert PaymentStatusService.cached_status(payment_factory.id) == "failed"
@@ -0,0 +1,190 @@
+import json
+import pytest
+from datetime import timedelta
+from decimal import Decimal
+from django.utils import timezone
+from apps.payments.models import PaymentWebhookLog
+from apps.payments.services.webhook_service import WebhookProcessingService
+from apps.wallets.models import WalletTransaction
+
+
+def receive(payment, status, external_id, created_at=None):
+    """Store a callback the way the webhook endpoint does"""
+    payload = {
+        "depositId": str(payment.id),
+        "status": status,
+        "providerTransactionId": external_id,
+    }
+    log = PaymentWebhookLog.objects.create(
+        raw_payload=json.dumps(payload),
+        parsed_payload=payload,
+        event_type=f"deposit.{status.lower()}",
+        payment=payment,
+        provider=payment.provider,
+        external_id=external_id,
+        status="received",
+    )
+    if created_at is not None:
+        PaymentWebhookLog.objects.filter(id=log.id).update(created_at=created_at)
+    return log
+
+
+@pytest.mark.django_db
+class TestWebhookProcessingService:
+    def test_completed_callback_credits_wallet(self, payment_factory):
+        log = receive(payment_factory, "COMPLETED", "PROC-1")
+
+        assert WebhookProcessingService.process_payment(payment_factory.id) == 1
+
+        log.refresh_from_db()
+        payment_factory.refresh_from_db()
+        assert log.status == "processed"
+        assert log.processed_at is not None
+        assert log.processing_time_ms >= 0
+        assert payment_factory.status == "completed"
+        payment_factory.wallet.refresh_from_db()
+        assert payment_factory.wallet.balance == Decimal("90.00")
+
+    def test_callbacks_are_applied_in_arrival_order(self, payment_factory):
+        now = timezone.now()
+        # Stored out of order: the later COMPLETED must win over FAILED
+        receive(payment_factory, "COMPLETED", "ORDER-2", created_at=now)
+        receive(payment_factory, "FAILED", "ORDER-1",
+                created_at=now - timedelta(seconds=5))
+
+        assert WebhookProcessingService.process_payment(payment_factory.id) == 2
+
+        payment_factory.refresh_from_db()
+        assert payment_factory.status == "completed"
+        logs = PaymentWebhookLog.objects.order_by("processed_at")
+        assert [log.external_id for log in logs] == ["ORDER-1", "ORDER-2"]
+
+    def test_non_final_callback_keeps_payment_status(self, payment_factory):
+        payment_factory.status = "accepted"
+        payment_factory.save()
+        log = receive(payment_factory, "PENDING", "KEEP-1")
+
+        WebhookProcessingService.process_payment(payment_factory.id)
+
+        log.refresh_from_db()
+        payment_factory.refresh_from_db()
+        assert payment_factory.status == "accepted"
+        assert log.event_type == "deposit.accepted"
+
+    def test_duplicate_external_id_is_ignored(self, payment_factory):
+        receive(payment_factory, "COMPLETED", "DUP-1")
+        WebhookProcessingService.process_payment(payment_factory.id)
+        duplicate = receive(payment_factory, "COMPLETED", "DUP-1")
+
+        WebhookProcessingService.process_payment(payment_factory.id)
+
+        duplicate.refresh_from_db()
+        assert duplicate.status == "ignored"
+        assert WalletTransaction.objects.filter(
+            transaction_type="CASH_IN").count() == 1
+
+    def test_credit_uses_payment_reference(self, payment_factory):
+        log = receive(payment_factory, "COMPLETED", "PROV-1")
+
+        WebhookProcessingService.process_payment(payment_factory.id)
+
+        log.refresh_from_db()
+        assert log.status == "processed"
+        cash_in = WalletTransaction.objects.get(transaction_type="CASH_IN")
+        assert cash_in.reference == payment_factory.reference
+
+    def test_already_credited_reference_is_logged(self, payment_factory, caplog):
+        from apps.wallets.services.wallet_services import (
+            WalletTransactionService)
+        # Credited by another path, e.g. cash_in_many
+        WalletTransactionService.cash_in(
+            wallet=payment_factory.wallet, amount=payment_factory.amount,
+            payment=payment_factory, reference=payment_factory.reference)
+        retry = receive(payment_factory, "COMPLETED", "PROV-2")
+
+        with caplog.at_level("INFO"):
+            WebhookProcessingService.process_payment(payment_factory.id)
+
+        retry.refresh_from_db()
+        assert retry.status == "processed"
+        assert WalletTransaction.objects.filter(
+            transaction_type="CASH_IN").count() == 1
+        assert f"webhook {retry.id} skipped the cash-in" in caplog.text
+
+    def test_callback_without_provider_id_is_credited(self, payment_factory):
+        receive(payment_factory, "COMPLETED", "")
+
+        WebhookProcessingService.process_payment(payment_factory.id)
+
+        assert WalletTransaction.objects.get(
+            transaction_type="CASH_IN").reference == payment_factory.reference
+
+    def test_payment_credited_by_reconciler_is_not_credited_again(
+        self, payment_factory
+    ):
+        from apps.payments.services.payment_reconciler import PaymentReconciler
+        PaymentReconciler.apply_status(payment_factory, "completed")
+        receive(payment_factory, "COMPLETED", "LATE-1")
+
+        WebhookProcessingService.process_payment(payment_factory.id)
+
+        assert WalletTransaction.objects.filter(
+            transaction_type="CASH_IN").count() == 1
+
+    def test_credit_runs_inside_the_payment_transaction(
+        self, payment_factory, mocker
+    ):
+        from django.db import connection
+        from apps.wallets.services.wallet_locks import WalletLockManager
+        locked = WalletLockManager.locked
+        depths = []
+
+        def spy(*wallet_ids):
+            depths.append(len(connection.savepoint_ids))
+            return locked(*wallet_ids)
+
+        mocker.patch.object(WalletLockManager, "locked", side_effect=spy)
+        receive(payment_factory, "COMPLETED", "SCOPE-1")
+        baseline = len(connection.savepoint_ids)
+
+        WebhookProcessingService.process_payment(payment_factory.id)
+
+        # Taken under process_payment's and process_log's blocks, so the
+        # wallet lock lives as long as the payment row lock
+        assert depths == [baseline + 2]
+
+    def test_failure_after_credit_rolls_the_credit_back(
+        self, payment_factory, mocker
+    ):
+        mocker.patch(
+            "apps.payments.services.webhook_service."
+            "PaymentStatusService.publish_on_commit",
+            side_effect=Exception("broker unavailable"),
+        )
+        log = receive(payment_factory, "COMPLETED", "SCOPE-2")
+
+        WebhookProcessingService.process_payment(payment_factory.id)
+
+        log.refresh_from_db()
+        payment_factory.wallet.refresh_from_db()
+        assert log.status == "failed"
+        assert not WalletTransaction.objects.exists()
+        assert payment_factory.wallet.balance == Decimal("0.00")
+
+    def test_failure_is_recorded_on_the_log(self, payment_factory, mocker):
+        mocker.patch(
+            "apps.payments.services.webhook_service."
+            "WalletTransactionService.cash_in",
+            side_effect=Exception("ledger unavailable"),
+        )
+        log = receive(payment_factory, "COMPLETED", "FAIL-1")
+
+        WebhookProcessingService.process_payment(payment_factory.id)
+
+        log.refresh_from_db()
+        payment_factory.refresh_from_db()
+        assert log.status == "failed"
+        assert log.error_message == "ledger unavailable"
+        assert log.processed_at is not None
+        # The payment update was rolled back with the failed callback
+        assert payment_factory.status == "pending"
@@ -1,10 +1,17 @@
 import pytest
 from celery.exceptions import Retry
+from datetime import timedelta
+from django.utils import timezone
+from apps.payments.models import PaymentWebhookLog
 from apps.payments.tasks import (
     resend_deposit_callback,
     resend_pending_deposits,
+    process_payment_webhooks,
+    process_stale_webhooks,
+    reconcile_payment_statuses,
 )
 from tests.factories import PaymentFactory
+from utils.external_requests import PawaPayClient
 @pytest.mark.django_db
 class TestResendDepositCallbackTask:
 
@@ -17,7 +24,8 @@ class TestResendDepositCallbackTask:
         result = resend_deposit_callback.run(str(payment.id))
 
         assert result == "Callback resent"
-        mock_resend.assert_called_once_with(str(payment.id))
+        mock_resend.assert_called_once_with(
+            str(payment.id), priority=PawaPayClient.BACKGROUND)
 
     def test_resend_callback_retries_on_failure(self, payment_factory, mocker):
         mock_resend = mocker.patch("apps.payments.tasks.resend_callback")
@@ -61,5 +69,64 @@ class TestResendPendingDepositsBatchTask:
 
     def test_resend_pending_deposits_no_pending(self, mocker):
         mock_delay = mocker.patch("apps.payments.tasks.resend_deposit_callback.delay")
+        result = resend_pending_deposits.run()
+        mock_delay.assert_not_called()
+        assert result == "Enqueued 0 callback resends, expired 0 payments"
+
+    def test_resend_pending_deposits_skips_payments_not_due(
+            self, payment_factory, mocker):
+        mock_delay = mocker.patch("apps.payments.tasks.resend_deposit_callback.delay")
+        payment = payment_factory
+
         resend_pending_deposits.run()
-        mock_delay.assert_not_called()
\ No newline at end of file
+        resend_pending_deposits.run()
+
+        mock_delay.assert_called_once_with(payment.id)
+        payment.refresh_from_db()
+        assert payment.check_attempts == 1
+        assert payment.next_check_at is not None
+
+@pytest.mark.django_db
+class TestProcessWebhooksTasks:
+    def _log(self, payment, external_id):
+        return PaymentWebhookLog.objects.create(
+            raw_payload="{}",
+            parsed_payload={"status": "FAILED"},
+            payment=payment,
+            provider=payment.provider,
+            external_id=external_id,
+            status="received",
+        )
+
+    def test_process_payment_webhooks(self, payment_factory):
+        self._log(payment_factory, "TASK-1")
+
+        result = process_payment_webhooks.run(str(payment_factory.id))
+
+        assert result == "Processed 1 webhooks"
+        payment_factory.refresh_from_db()
+        assert payment_factory.status == "failed"
+
+    def test_stale_webhooks_are_re_enqueued(self, payment_factory, mocker):
+        mock_delay = mocker.patch(
+            "apps.payments.tasks.process_payment_webhooks.delay")
+        stale = self._log(payment_factory, "STALE-1")
+        PaymentWebhookLog.objects.filter(id=stale.id).update(
+            created_at=timezone.now() - timedelta(minutes=10))
+        self._log(PaymentFactory(wallet=payment_factory.wallet), "FRESH-1")
+
+        result = process_stale_webhooks.run()
+
+        assert result == "Re-enqueued webhooks for 1 payments"
+        mock_delay.assert_called_once_with(str(payment_factory.id))
+
+
+class TestReconcilePaymentStatusesTask:
+    def test_reports_reconciler_counts(self, mocker):
+        mocker.patch(
+            "apps.payments.tasks.PaymentReconciler.reconcile",
+            return_value={"checked": 3, "resolved": 2, "pending": 1},
+        )
+
+        assert reconcile_payment_statuses.run() == (
+            "Reconciled 3 payments, 2 resolved")
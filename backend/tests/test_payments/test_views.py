@@ -305,3 +305,164 @@ class TestCashinViews:
         
         mock_request.call_count == 3
         
+
+
+@pytest.mark.django_db
+class TestDepositIdempotency:
+    payload = {
+        "patronPhone": "7655555556",
+        "provider": "MTN_MOMO_ZMB",
+        "amount": "10",
+    }
+
+    def _post(self, client, wallet, key, data=None):
+        return client.post(
+            f"/api/v1/payments/deposits/{wallet.id}/",
+            data or self.payload,
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    @staticmethod
+    def _scope():
+        """The scope the deposit view stores the test client's keys under"""
+        from django.contrib.auth.models import AnonymousUser
+        from django.test import RequestFactory
+        from apps.customauth.models import APIClient
+        from utils.idempotency import IdempotencyStore
+        request = RequestFactory().post("/")
+        request.client = APIClient.objects.get()
+        request.user = AnonymousUser()
+        return IdempotencyStore.scope("deposit", request)
+
+    def _mock_pawapay(self, mocker):
+        mock_request = mocker.patch("apps.payments.views.pawapay_request")
+        mock_request.return_value = (
+            {"depositId": "1234", "status": "ACCEPTED"}, 200)
+        return mock_request
+
+    def test_repeat_replays_first_response(
+        self, auth_api_client, wallet_factory, mocker
+    ):
+        import uuid
+        mock_request = self._mock_pawapay(mocker)
+        key = str(uuid.uuid4())
+
+        first = self._post(auth_api_client, wallet_factory, key)
+        second = self._post(auth_api_client, wallet_factory, key)
+
+        assert first.status_code == second.status_code == 201
+        assert second.data == first.data
+        assert second["Idempotent-Replayed"] == "true"
+        assert Payment.objects.count() == 1
+        mock_request.assert_called_once()
+
+    def test_keys_are_scoped_to_the_caller(
+        self, auth_api_client, wallet_factory, mocker
+    ):
+        import uuid
+        mock_request = self._mock_pawapay(mocker)
+        key = str(uuid.uuid4())
+
+        first = self._post(auth_api_client, wallet_factory, key)
+        # Another patron behind the same frontend picks the same key
+        other = auth_api_client.post(
+            f"/api/v1/payments/deposits/{wallet_factory.id}/",
+            self.payload, format="json",
+            HTTP_IDEMPOTENCY_KEY=key, REMOTE_ADDR="10.0.0.2")
+
+        assert first.status_code == other.status_code == 201
+        assert "Idempotent-Replayed" not in other
+        assert Payment.objects.count() == 2
+        assert mock_request.call_count == 2
+
+    def test_key_reused_with_other_body_is_rejected(
+        self, auth_api_client, wallet_factory, mocker
+    ):
+        import uuid
+        self._mock_pawapay(mocker)
+        key = str(uuid.uuid4())
+
+        self._post(auth_api_client, wallet_factory, key)
+        response = self._post(
+            auth_api_client, wallet_factory, key,
+            data={**self.payload, "amount": "20"})
+
+        assert response.status_code == 422
+        assert Payment.objects.count() == 1
+
+    def test_requests_without_key_are_not_deduplicated(
+        self, auth_api_client, wallet_factory, mocker
+    ):
+        self._mock_pawapay(mocker)
+        for _ in range(2):
+            auth_api_client.post(
+                f"/api/v1/payments/deposits/{wallet_factory.id}/",
+                self.payload, format="json")
+
+        assert Payment.objects.count() == 2
+
+    def test_server_errors_are_not_stored(
+        self, auth_api_client, wallet_factory, mocker
+    ):
+        import uuid
+        mock_request = mocker.patch("apps.payments.views.pawapay_request")
+        mock_request.side_effect = [
+            ({"status": "EXTERNAL_ERROR"}, 500),
+            ({"depositId": "1234", "status": "ACCEPTED"}, 200),
+        ]
+        key = str(uuid.uuid4())
+
+        assert self._post(auth_api_client, wallet_factory, key).status_code == 500
+        assert self._post(auth_api_client, wallet_factory, key).status_code == 201
+
+    def test_concurrent_duplicate_waits_for_first_response(
+        self, auth_api_client, wallet_factory, mocker
+    ):
+        import threading
+        import uuid
+        from rest_framework.response import Response
+        from utils.idempotency import IdempotencyStore
+        mock_request = self._mock_pawapay(mocker)
+        key = str(uuid.uuid4())
+        # The view sees the body after camelCase parsing
+        request = mocker.Mock(
+            path=f"/api/v1/payments/deposits/{wallet_factory.id}/",
+            data={"patron_phone": "7655555556", "provider": "MTN_MOMO_ZMB",
+                  "amount": "10"})
+        fingerprint = IdempotencyStore.fingerprint(
+            request, wallet_id=wallet_factory.id)
+        scope = self._scope()
+        # Another worker is processing the same key
+        assert IdempotencyStore.lock(scope, key)
+
+        def finish_first_request():
+            IdempotencyStore.save(
+                scope, key, fingerprint,
+                Response({"status": "accepted"}, status=201))
+            IdempotencyStore.unlock(scope, key)
+        timer = threading.Timer(0.3, finish_first_request)
+        timer.start()
+
+        response = self._post(auth_api_client, wallet_factory, key)
+        timer.join()
+
+        assert response.status_code == 201
+        assert response.data == {"status": "accepted"}
+        mock_request.assert_not_called()
+        assert Payment.objects.count() == 0
+
+    def test_duplicate_gives_up_while_first_is_in_flight(
+        self, auth_api_client, wallet_factory, mocker
+    ):
+        import uuid
+        from utils.idempotency import IdempotencyStore
+        mocker.patch.object(IdempotencyStore, "WAIT_SECONDS", 0.2)
+        mock_request = self._mock_pawapay(mocker)
+        key = str(uuid.uuid4())
+        IdempotencyStore.lock(self._scope(), key)
+
+        response = self._post(auth_api_client, wallet_factory, key)
+
+        assert response.status_code == 409
+        mock_request.assert_not_called()
@@ -10,6 +10,16 @@ from apps.wallets.models import WalletTransaction
 User = get_user_model()
 
 
+@pytest.fixture
+def process_webhooks_inline(mocker):
+    """Run the webhooks worker task in-process when the view enqueues it"""
+    from apps.payments.tasks import process_payment_webhooks
+    return mocker.patch(
+        "apps.payments.webhooks.process_payment_webhooks.delay",
+        side_effect=process_payment_webhooks.run,
+    )
+
+
 @pytest.mark.django_db
 class TestPaymentStatusAPIView:
     def test_get_payment_status_pending(
@@ -162,6 +172,101 @@ class TestPaymentStatusAPIView:
 
 
 @pytest.mark.django_db
+class TestPaymentStatusLongPoll:
+    def test_long_poll_returns_published_status(
+        self, auth_api_client, payment_factory, mocker
+    ):
+        import threading
+        from apps.payments.services.status_service import PaymentStatusService
+        mock_resend = mocker.patch(
+            "apps.payments.webhooks.resend_callback",
+            return_value=({"status": "ACCEPTED"}, 200),
+        )
+        timer = threading.Timer(
+            0.3, PaymentStatusService.publish,
+            args=(payment_factory.id, "completed"))
+        timer.start()
+
+        response = auth_api_client.get(
+            reverse("payments:payment_status", args=[payment_factory.id]),
+            {"wait": 5},
+        )
+        timer.join()
+
+        assert response.status_code == 200
+        assert response.data["status"] == "completed"
+        mock_resend.assert_called_once_with(str(payment_factory.id))
+
+    def test_long_poll_timeout_returns_current_status(
+        self, auth_api_client, payment_factory, mocker
+    ):
+        from apps.payments.services.status_service import PaymentStatusService
+        mocker.patch.object(PaymentStatusService, "MAX_WAIT_SECONDS", 0.2)
+        mocker.patch(
+            "apps.payments.webhooks.resend_callback",
+            return_value=({"status": "ACCEPTED"}, 200),
+        )
+
+        response = auth_api_client.get(
+            reverse("payments:payment_status", args=[payment_factory.id]),
+            {"wait": 30},
+        )
+
+        assert response.status_code == 200
+        assert response.data["status"] == "pending"
+
+    def test_wait_is_capped_to_keep_workers_free(self, mocker):
+        from apps.payments.services.status_service import PaymentStatusService
+        pubsub = mocker.Mock()
+        pubsub.get_message.return_value = None
+        mocker.patch(
+            "django_redis.get_redis_connection"
+        ).return_value.pubsub.return_value = pubsub
+        clock = mocker.patch(
+            "apps.payments.services.status_service.time.monotonic")
+        # Time runs out once the first wait returns empty
+        clock.side_effect = lambda: (
+            200.0 if pubsub.get_message.called else 100.0)
+
+        assert PaymentStatusService.wait_for_status("payment-1", 30) is None
+
+        assert PaymentStatusService.MAX_WAIT_SECONDS <= 5
+        pubsub.get_message.assert_called_once_with(
+            timeout=PaymentStatusService.MAX_WAIT_SECONDS)
+
+    def test_concurrent_pollers_share_one_upstream_check(
+        self, auth_api_client, payment_factory, mocker
+    ):
+        mock_resend = mocker.patch(
+            "apps.payments.webhooks.resend_callback",
+            return_value=({"status": "ACCEPTED"}, 200),
+        )
+        url = reverse("payments:payment_status", args=[payment_factory.id])
+
+        first = auth_api_client.get(url)
+        second = auth_api_client.get(url)
+
+        assert first.data["status"] == "accepted"
+        assert second.data["status"] == "pending"
+        mock_resend.assert_called_once()
+
+    def test_terminal_status_is_served_from_cache(
+        self, auth_api_client, payment_factory, mocker
+    ):
+        payment_factory.status = "failed"
+        payment_factory.save()
+        url = reverse("payments:payment_status", args=[payment_factory.id])
+        auth_api_client.get(url)
+        spy = mocker.patch("apps.payments.webhooks.Payment.objects.only")
+
+        response = auth_api_client.get(url)
+
+        assert response.data["status"] == "failed"
+        spy.assert_not_called()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("process_webhooks_inline")
 class TestPaymentWebhookView:
 
     def test_webhook_credits_wallet_when_payment_is_completed(
@@ -548,3 +653,57 @@ class TestPaymentWebhookView:
         assert "Payment to creator #123" in webhook.parsed_payload.get(
             "customerMessage", ""
         )
+
+
+@pytest.mark.django_db
+class TestWebhookAcknowledgement:
+    def test_callback_is_persisted_and_enqueued(
+        self, api_client, payment_factory, mocker
+    ):
+        """The endpoint only stores the callback and enqueues processing"""
+        mock_delay = mocker.patch(
+            "apps.payments.webhooks.process_payment_webhooks.delay")
+        wallet = payment_factory.wallet
+        payload = {
+            "depositId": str(payment_factory.id),
+            "status": "COMPLETED",
+            "providerTransactionId": "ACK-123",
+        }
+
+        response = api_client.post(
+            reverse("payments:webhook"),
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        assert response.data["message"] == "Callback received"
+        mock_delay.assert_called_once_with(str(payment_factory.id))
+
+        log = PaymentWebhookLog.objects.get(external_id="ACK-123")
+        assert log.status == "received"
+        assert log.raw_payload == json.dumps(payload)
+        assert log.processed_at is None
+
+        # Nothing applied until the worker runs
+        payment_factory.refresh_from_db()
+        assert payment_factory.status != "completed"
+        assert not WalletTransaction.objects.filter(wallet=wallet).exists()
+
+    def test_invalid_deposit_id_is_rejected(self, api_client, mocker):
+        mock_delay = mocker.patch(
+            "apps.payments.webhooks.process_payment_webhooks.delay")
+        payload = {
+            "depositId": "not-a-uuid",
+            "status": "COMPLETED",
+            "providerTransactionId": "BAD-ID",
+        }
+
+        response = api_client.post(
+            reverse("payments:webhook"), payload,
+            content_type="application/json",
+        )
+
+        assert response.status_code == 400
+        mock_delay.assert_not_called()
+        assert not PaymentWebhookLog.objects.exists()
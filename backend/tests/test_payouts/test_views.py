@@ -414,3 +414,29 @@ class TestFinaliseWalletPayout:
 
         with pytest.raises(InvalidTransaction, match="Only pending payouts can be finalized"):
             PayoutOrchestrator.finalize(payout_tx=payout_tx, success=True)
+
+
+@pytest.mark.django_db
+class TestStatsView:
+    """Tests for the platform stats view"""
+
+    def test_payment_statistics(self):
+        """Test that payment figures come from the payment stats service"""
+        from django.core.cache import cache
+        from tests.factories import PaymentFactory
+        cache.delete_pattern("payments:stats:*")
+        client = Client()
+        user = UserFactory(is_staff=True, is_superuser=True)
+        wallet = user.creator_profile.wallet
+        PaymentFactory(wallet=wallet, status="completed", amount=Decimal("50.00"))
+        PaymentFactory(wallet=wallet, status="failed", amount=Decimal("20.00"))
+
+        client.force_login(user)
+        response = client.get(reverse("payouts:stats"))
+
+        assert response.status_code == 200
+        assert response.context["total_payments"] == 2
+        assert response.context["successful_payments"] == 1
+        assert response.context["total_payment_amount"] == Decimal("50.00")
+        assert response.context["total_failed_amount"] == Decimal("20.00")
+        cache.delete_pattern("payments:stats:*")
@@ -0,0 +1,124 @@
+"""
+Benchmark for the pooled PawaPay client against a local stub server. Run
+with ``pytest -m slow -s`` to see the timings.
+"""
+import threading
+import time
+import pytest
+import requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.external_requests import PawaPayClient
+
+CALLS = 200
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = b'{"data": {"status": "COMPLETED"}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+@pytest.fixture
+def stub_server():
+    server = CountingServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.slow
+class TestPawaPayClientBenchmark:
+    def test_pooled_session_reuses_connections(self, stub_server):
+        base_url = f"http://127.0.0.1:{stub_server.server_address[1]}"
+        endpoint = "/v2/deposits/7f1c6a8e-9d1b-4c3e-8a5f-2b7d9e0c1a23"
+
+        started = time.perf_counter()
+        for _ in range(CALLS):
+            requests.request("GET", f"{base_url}{endpoint}", timeout=10)
+        unpooled = time.perf_counter() - started
+        unpooled_connections = stub_server.connections
+
+        client = PawaPayClient(base_url=base_url, api_key="bench")
+        stub_server.connections = 0
+        started = time.perf_counter()
+        for _ in range(CALLS):
+            client.request("GET", endpoint)
+        pooled = time.perf_counter() - started
+
+        print(
+            f"\nper-call requests: {unpooled * 1000 / CALLS:.3f}ms/call "
+            f"connections={unpooled_connections}"
+            f"\npooled session:    {pooled * 1000 / CALLS:.3f}ms/call "
+            f"connections={stub_server.connections}"
+            f"\nstats: {client.stats()}"
+        )
+        assert unpooled_connections == CALLS
+        assert stub_server.connections == 1
+        assert client.stats()["GET /v2/deposits/{id}"]["count"] == CALLS
+
+
+
+INSERTS = 100000
+BATCH = 1000
+
+
+def insert_keys(path, make_key):
+    """
+    Inserts INSERTS rows in BATCH-sized transactions into a table clustered
+    on its key, with a cache much smaller than the table as under load.
+    """
+    import sqlite3
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA cache_size = -256")
+    db.execute(
+        "CREATE TABLE rows (id BLOB PRIMARY KEY, body TEXT) WITHOUT ROWID")
+    started = time.perf_counter()
+    for _ in range(INSERTS // BATCH):
+        with db:
+            db.executemany(
+                "INSERT INTO rows VALUES (?, ?)",
+                ((make_key().bytes, "x" * 64) for _ in range(BATCH)),
+            )
+    elapsed = time.perf_counter() - started
+    pages = db.execute("PRAGMA page_count").fetchone()[0]
+    db.close()
+    return elapsed, pages
+
+
+@pytest.mark.slow
+class TestPrimaryKeyInsertBenchmark:
+    def test_uuid7_vs_uuid4_inserts(self, tmp_path):
+        import uuid
+        from utils.ids import uuid7
+
+        random_time, random_pages = insert_keys(tmp_path / "uuid4.db", uuid.uuid4)
+        ordered_time, ordered_pages = insert_keys(tmp_path / "uuid7.db", uuid7)
+
+        print(
+            f"\n{INSERTS} inserts into a clustered primary key"
+            f"\nuuid4: {INSERTS / random_time:,.0f} rows/s {random_pages} pages"
+            f"\nuuid7: {INSERTS / ordered_time:,.0f} rows/s {ordered_pages} pages"
+        )
+        # Appends touch the rightmost leaf instead of a random, uncached one
+        assert ordered_time < random_time
@@ -0,0 +1,197 @@
+import time
+import pytest
+from django.urls import reverse
+from utils.circuit_breaker import CircuitBreaker, TokenBucket
+from utils.exceptions import CircuitOpenError, RateLimitExceeded
+from utils.external_requests import (
+    PawaPayClient, pawapay_client, pawapay_request)
+
+
+def make_breaker(**kwargs):
+    options = {"failure_threshold": 3, "cooldown_seconds": 30}
+    options.update(kwargs)
+    return CircuitBreaker("test:endpoint", **options)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_failure_threshold(self):
+        breaker = make_breaker()
+        for _ in range(2):
+            breaker.record(10, failed=True)
+        assert breaker.state() == CircuitBreaker.CLOSED
+
+        breaker.record(10, failed=True)
+
+        assert breaker.state() == CircuitBreaker.OPEN
+        assert not breaker.allow()
+        with pytest.raises(CircuitOpenError):
+            breaker.guard()
+        assert breaker.metrics()["trips"] == 1
+
+    def test_slow_calls_count_as_failures(self):
+        breaker = make_breaker(slow_call_ms=100)
+        for _ in range(3):
+            breaker.record(150)
+        assert breaker.state() == CircuitBreaker.OPEN
+
+    def test_half_open_allows_one_probe_then_closes(self, mocker):
+        breaker = make_breaker()
+        for _ in range(3):
+            breaker.record(10, failed=True)
+        reopen_at = time.time() + 31
+        clock = mocker.patch("utils.circuit_breaker.time.time")
+        clock.return_value = reopen_at
+
+        assert breaker.state() == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record(10)
+        assert breaker.state() == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self, mocker):
+        breaker = make_breaker()
+        for _ in range(3):
+            breaker.record(10, failed=True)
+        reopen_at = time.time() + 31
+        clock = mocker.patch("utils.circuit_breaker.time.time")
+        clock.return_value = reopen_at
+        assert breaker.allow()
+
+        breaker.record(10, failed=True)
+
+        clock.return_value = clock.return_value + 1
+        assert breaker.state() == CircuitBreaker.OPEN
+        assert breaker.metrics()["trips"] == 2
+
+    def test_falls_back_to_local_state_without_cache(self, mocker):
+        for method in ("get", "set", "add", "incr", "delete_many"):
+            mocker.patch(
+                f"utils.circuit_breaker.cache.{method}",
+                side_effect=ConnectionError("redis down"))
+        breaker = make_breaker()
+
+        for _ in range(3):
+            breaker.record(10, failed=True)
+
+        assert breaker.state() == CircuitBreaker.OPEN
+
+
+class TestTokenBucket:
+    def test_rejects_past_capacity(self):
+        bucket = TokenBucket("test:bucket", rate=0.001, capacity=2)
+        taken = [bucket.try_acquire() for _ in range(3)]
+        assert taken == [True, True, False]
+        assert bucket.metrics()["rejected"] == 1
+        with pytest.raises(RateLimitExceeded):
+            bucket.acquire(timeout=0)
+
+
+class TestPawaPayClientProtection:
+    def _failing_session(self, mocker):
+        response = mocker.Mock(status_code=503)
+        response.json.return_value = {"status": "DOWN"}
+        return mocker.patch(
+            "utils.external_requests.pawapay_client.session.request",
+            return_value=response)
+
+    def test_open_breaker_fails_fast_with_503(self, mocker):
+        session = self._failing_session(mocker)
+        for _ in range(CircuitBreaker.FAILURE_THRESHOLD):
+            pawapay_request("GET", "/v2/deposits/1")
+
+        data, code = pawapay_request("GET", "/v2/deposits/2")
+
+        assert (data, code) == ({"status": "SERVICE_UNAVAILABLE"}, 503)
+        assert session.call_count == CircuitBreaker.FAILURE_THRESHOLD
+        assert not pawapay_client.is_available("GET", "/v2/deposits/3")
+        # Other endpoints keep their own breaker
+        assert pawapay_client.is_available("POST", "/v2/deposits/")
+        metrics = pawapay_client.metrics()
+        assert metrics["circuit_breakers"][
+            "pawapay:GET /v2/deposits/{id}"]["state"] == "open"
+
+    def test_background_calls_are_rate_limited(self, mocker):
+        response = mocker.Mock(status_code=200)
+        response.json.return_value = {}
+        mocker.patch(
+            "utils.external_requests.pawapay_client.session.request",
+            return_value=response)
+        mocker.patch.object(
+            pawapay_client.background_bucket, "try_acquire", return_value=False)
+        mocker.patch.object(PawaPayClient, "BACKGROUND_WAIT_SECONDS", 0)
+
+        background = pawapay_request(
+            "GET", "/v2/deposits/1", priority=PawaPayClient.BACKGROUND)
+        live = pawapay_request("GET", "/v2/deposits/1")
+
+        assert background == ({"status": "RATE_LIMITED"}, 429)
+        assert live == ({}, 200)
+
+
+@pytest.mark.django_db
+class TestDepositCircuitBreaker:
+    def test_deposit_fails_fast_while_breaker_is_open(
+        self, auth_api_client, wallet_factory, mocker
+    ):
+        from apps.payments.models import Payment
+        mock_request = mocker.patch("apps.payments.views.pawapay_request")
+        breaker = pawapay_client.breaker("POST", "/v2/deposits/")
+        for _ in range(CircuitBreaker.FAILURE_THRESHOLD):
+            breaker.record(10, failed=True)
+
+        response = auth_api_client.post(
+            f"/api/v1/payments/deposits/{wallet_factory.id}/",
+            {
+                "patronPhone": "0971234567",
+                "provider": "MTN_MOMO_ZMB",
+                "amount": "10",
+            },
+            format="json",
+        )
+
+        assert response.status_code == 503
+        mock_request.assert_not_called()
+        assert not Payment.objects.exists()
+
+    def test_deposit_probes_half_open_breaker(
+        self, auth_api_client, wallet_factory, mocker
+    ):
+        response = mocker.Mock(status_code=200)
+        response.json.return_value = {"status": "ACCEPTED"}
+        session = mocker.patch(
+            "utils.external_requests.pawapay_client.session.request",
+            return_value=response)
+        breaker = pawapay_client.breaker("POST", "/v2/deposits/")
+        for _ in range(CircuitBreaker.FAILURE_THRESHOLD):
+            breaker.record(10, failed=True)
+        reopen_at = time.time() + CircuitBreaker.COOLDOWN_SECONDS + 1
+        clock = mocker.patch("utils.circuit_breaker.time.time")
+        clock.return_value = reopen_at
+        assert breaker.state() == CircuitBreaker.HALF_OPEN
+
+        response = auth_api_client.post(
+            f"/api/v1/payments/deposits/{wallet_factory.id}/",
+            {
+                "patronPhone": "0971234567",
+                "provider": "MTN_MOMO_ZMB",
+                "amount": "10",
+            },
+            format="json",
+        )
+
+        assert response.status_code == 201
+        session.assert_called_once()
+        assert breaker.state() == CircuitBreaker.CLOSED
+
+    def test_metrics_endpoint_is_admin_only(self, api_client, admin_user, user_factory):
+        url = reverse("payments:pawapay_metrics")
+        api_client.force_authenticate(user=user_factory)
+        assert api_client.get(url).status_code == 403
+
+        api_client.force_authenticate(user=admin_user)
+        response = api_client.get(url)
+
+        assert response.status_code == 200
+        assert "circuit_breakers" in response.data["data"]
+        assert "background_limiter" in response.data["data"]
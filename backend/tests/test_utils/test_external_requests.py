@@ -1,4 +1,5 @@
-from utils.external_requests import pawapay_request, requests
+from utils.external_requests import (
+    pawapay_request, pawapay_client, PawaPayClient)
 
 class TestPawapayRequest:
     # ---------------------------------------------------------
@@ -8,12 +9,12 @@ class TestPawapayRequest:
         mock_response = mocker.Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"status": "OK"}
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mocker.patch(patch_path, return_value=mock_response)
         data, status = pawapay_request("GET", "/deposit/")
         assert status == 200
         assert data == {"status": "OK"}
-        requests.request.assert_called_once()
+        pawapay_client.session.request.assert_called_once()
 
     # ---------------------------------------------------------
     # Test successful non-JSON response (text fallback)
@@ -24,7 +25,7 @@ class TestPawapayRequest:
         mock_response.json.side_effect = ValueError("not json")
         mock_response.text = "raw-response"
         mock_response.status_code = 200
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mocker.patch(patch_path, return_value=mock_response)
         data, status = pawapay_request("GET", "/deposit/")
 
@@ -39,7 +40,7 @@ class TestPawapayRequest:
         mock_response = mocker.Mock()
         mock_response.json.side_effect = Exception("Network down")
         
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mocker.patch(patch_path, return_value=mock_response)
         payload = {"amount": 100}
         data, status = pawapay_request("POST", "/deposit/", payload=payload)
@@ -57,7 +58,7 @@ class TestPawapayRequest:
         mock_response.status_code = 201
         
         payload = {"amount": 100}
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mock_request = mocker.patch(patch_path, return_value=mock_response)
         pawapay_request("POST", "/deposits/", headers=None, payload=payload)
 
@@ -67,7 +68,8 @@ class TestPawapayRequest:
         assert call_args[0] == ("POST", "https://api.sandbox.pawapay.io/deposits/")
         assert "Authorization" in call_args[1]["headers"]
         assert call_args[1]["json"] == payload
-        assert call_args[1]["timeout"] == 10
+        assert call_args[1]["timeout"] == (
+            PawaPayClient.CONNECT_TIMEOUT, PawaPayClient.READ_TIMEOUT)
 
     # ---------------------------------------------------------
     # Test non-200 status response with JSON
@@ -77,7 +79,7 @@ class TestPawapayRequest:
         mock_response = mocker.Mock()
         mock_response.json.return_value = {"error": "bad request"}
         mock_response.status_code = 400
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mocker.patch(patch_path, return_value=mock_response)
         data, status = pawapay_request("GET", "/deposit/")
 
@@ -91,14 +93,14 @@ class TestPawapayRequest:
     def test_post_without_payload_raises_error(self, mocker):
         """POST requests without payload should raise AttributeError"""
         mock_response = mocker.Mock()
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mocker.patch(patch_path, return_value=mock_response)
         data, status = pawapay_request("POST", "/deposit/", payload=None)
 
         assert status == 400
         assert data is not None
-        # Should not call requests.request since it fails before that
-        requests.request.assert_not_called()
+        # Should not call the session since it fails before that
+        pawapay_client.session.request.assert_not_called()
 
     # ---------------------------------------------------------
     # Test GET request with payload (allowed)
@@ -109,7 +111,7 @@ class TestPawapayRequest:
         mock_response = mocker.Mock()
         mock_response.json.return_value = {"data": "retrieved"}
         mock_response.status_code = 200
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mocker.patch(patch_path, return_value=mock_response)
 
         payload = {"filter": "active"}
@@ -117,7 +119,7 @@ class TestPawapayRequest:
 
         assert status == 200
         assert data == {"data": "retrieved"}
-        requests.request.assert_called_once()
+        pawapay_client.session.request.assert_called_once()
 
     # ---------------------------------------------------------
     # Test requests.RequestException (network errors)
@@ -131,7 +133,7 @@ class TestPawapayRequest:
         mock_response.json.side_effect = requests.exceptions.ConnectionError(
             "Connection refused"
         )
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mocker.patch(patch_path, return_value=mock_response)
         data, status = pawapay_request("GET", "/deposit/")
         assert status == 500
@@ -148,7 +150,7 @@ class TestPawapayRequest:
 
         mock_response.json.side_effect = requests.exceptions.Timeout(
             "Request timed out")
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mocker.patch(patch_path, return_value=mock_response)
         data, status = pawapay_request("GET", "/deposit/")
 
@@ -164,7 +166,7 @@ class TestPawapayRequest:
         mock_response = mocker.Mock()
         mock_response.json.return_value = {"error": "Internal Server Error"}
         mock_response.status_code = 500
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mocker.patch(patch_path, return_value=mock_response)
 
         data, status = pawapay_request("GET", "/deposit/")
@@ -181,7 +183,7 @@ class TestPawapayRequest:
         mock_response = mocker.Mock()
         mock_response.json.return_value = {"error": "Unauthorized"}
         mock_response.status_code = 401
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mocker.patch(patch_path, return_value=mock_response)
 
         data, status = pawapay_request("GET", "/deposit/")
@@ -198,7 +200,7 @@ class TestPawapayRequest:
         mock_response = mocker.Mock()
         mock_response.json.return_value = {"error": "Not Found"}
         mock_response.status_code = 404
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mocker.patch(patch_path, return_value=mock_response)
 
         data, status = pawapay_request("GET", "/deposit/")
@@ -216,7 +218,7 @@ class TestPawapayRequest:
         mock_response = mocker.Mock()
         mock_response.json.return_value = {}
         mock_response.status_code = 200
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mock_request = mocker.patch(patch_path, return_value=mock_response)
 
         pawapay_request("GET", "/deposit/")
@@ -231,15 +233,15 @@ class TestPawapayRequest:
         assert "Bearer" in  headers["Authorization"]
 
     # ---------------------------------------------------------
-    # Test timeout parameter is always 10
+    # Test connect/read timeouts are always set
     # ---------------------------------------------------------
     
-    def test_timeout_always_10(self, mocker):
-        """Verify timeout is always set to 10 seconds"""
+    def test_timeout_always_set(self, mocker):
+        """Verify separate connect and read timeouts are always set"""
         mock_response = mocker.Mock()
         mock_response.json.return_value = {}
         mock_response.status_code = 200
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mock_request = mocker.patch(patch_path, return_value=mock_response)
 
         for method in ["GET", "POST", "PUT", "DELETE"]:
@@ -248,7 +250,8 @@ class TestPawapayRequest:
             pawapay_request(method, "/deposit/", payload=payload)
 
             call_kwargs = mock_request.call_args[1]
-            assert call_kwargs["timeout"] == 10
+            assert call_kwargs["timeout"] == (
+                PawaPayClient.CONNECT_TIMEOUT, PawaPayClient.READ_TIMEOUT)
 
     # ---------------------------------------------------------
     # Test empty JSON response
@@ -259,7 +262,7 @@ class TestPawapayRequest:
         mock_response = mocker.Mock()
         mock_response.json.return_value = {}
         mock_response.status_code = 200
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mocker.patch(patch_path, return_value=mock_response)
 
         data, status = pawapay_request("GET", "/deposit/")
@@ -276,7 +279,7 @@ class TestPawapayRequest:
         mock_response = mocker.Mock()
         mock_response.json.return_value = {"success": True}
         mock_response.status_code = 201
-        patch_path = "utils.external_requests.requests.request"
+        patch_path = "utils.external_requests.pawapay_client.session.request"
         mock_request = mocker.patch(patch_path, return_value=mock_response)
 
         # Create a large payload with multiple nested fields
@@ -289,4 +292,178 @@ class TestPawapayRequest:
         assert status == 201
         call_kwargs = mock_request.call_args[1]
         assert call_kwargs["json"] == large_payload
-        assert data is not None
\ No newline at end of file
+        assert data is not None
+
+class TestPawaPayClient:
+    def test_session_is_reused_across_calls(self, mocker):
+        client = PawaPayClient(base_url="https://pawapay.test", api_key="key")
+        mock_response = mocker.Mock(ok=True, status_code=200)
+        mock_response.json.return_value = {}
+        mock_request = mocker.patch.object(
+            client.session, "request", return_value=mock_response)
+
+        client.request("GET", "/v2/deposits/1")
+        client.request("GET", "/v2/deposits/2")
+
+        assert mock_request.call_count == 2
+        assert mock_request.call_args[1]["headers"]["Authorization"] == (
+            "Bearer key")
+
+    def test_only_idempotent_calls_are_retried(self):
+        client = PawaPayClient(base_url="https://pawapay.test", api_key="key")
+
+        default = client.session.get_adapter("https://pawapay.test/v2/deposits")
+        resend = client.session.get_adapter(
+            "https://pawapay.test/v2/deposits/resend-callback/abc")
+
+        assert default.max_retries.total == PawaPayClient.MAX_RETRIES
+        assert "GET" in default.max_retries.allowed_methods
+        assert "POST" not in default.max_retries.allowed_methods
+        assert "POST" in resend.max_retries.allowed_methods
+        assert default.poolmanager.connection_pool_kw["maxsize"] == (
+            PawaPayClient.POOL_MAXSIZE)
+
+    def test_latency_counters_per_endpoint(self, mocker):
+        client = PawaPayClient(base_url="https://pawapay.test", api_key="key")
+        ok = mocker.Mock(ok=True, status_code=200)
+        ok.json.return_value = {}
+        failed = mocker.Mock(ok=False, status_code=503)
+        failed.json.return_value = {}
+        mocker.patch.object(
+            client.session, "request", side_effect=[ok, failed, ok])
+
+        client.request("GET", "/v2/deposits/7f1c6a8e-9d1b-4c3e-8a5f-2b7d9e0c1a23")
+        client.request("GET", "/v2/deposits/0b2c3d4e-5f60-4718-89ab-cdef01234567")
+        client.request("POST", "/v2/deposits/", payload={"amount": "1"})
+
+        stats = client.stats()
+        assert stats["GET /v2/deposits/{id}"]["count"] == 2
+        assert stats["GET /v2/deposits/{id}"]["errors"] == 1
+        assert stats["POST /v2/deposits/"]["count"] == 1
+        assert stats["POST /v2/deposits/"]["avg_ms"] >= 0
+
+        client.reset_stats()
+        assert client.stats() == {}
+
+    def test_resend_callback_sends_empty_body(self, mocker):
+        from utils.external_requests import resend_callback
+        mock_response = mocker.Mock(ok=True, status_code=200)
+        mock_response.json.return_value = {"status": "ACCEPTED"}
+        mock_request = mocker.patch(
+            "utils.external_requests.pawapay_client.session.request",
+            return_value=mock_response,
+        )
+
+        data, code = resend_callback("abc")
+
+        assert code == 200
+        assert mock_request.call_args[1]["json"] == {}
+
+
+class PawaPayStub:
+    """In-process stand-in for PawaPay with latency and failure modes"""
+
+    def __init__(self, latency=0.05, failures=None):
+        import httpx
+        self.latency = latency
+        self.failures = failures or {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+        self.transport = httpx.MockTransport(self.handle)
+
+    async def handle(self, request):
+        import asyncio
+        import httpx
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+        deposit_id = request.url.path.rsplit("/", 1)[-1]
+        failure = self.failures.get(deposit_id)
+        if failure == "network":
+            raise httpx.ConnectError("Connection refused", request=request)
+        if failure == "text":
+            return httpx.Response(502, text="Bad Gateway")
+        if failure == "not_found":
+            return httpx.Response(404, json={"status": "NOT_FOUND"})
+        return httpx.Response(
+            200, json={"data": {"depositId": deposit_id, "status": "COMPLETED"}})
+
+
+class TestAsyncPawaPayClient:
+    def test_fetch_deposit_statuses_runs_concurrently(self):
+        import time
+        from utils.external_requests import fetch_deposit_statuses
+        stub = PawaPayStub(latency=0.05)
+        ids = [f"dep-{i}" for i in range(20)]
+
+        started = time.perf_counter()
+        results = fetch_deposit_statuses(
+            ids, transport=stub.transport, max_concurrency=5)
+        elapsed = time.perf_counter() - started
+
+        assert set(results) == set(ids)
+        assert all(code == 200 for _, code in results.values())
+        assert results["dep-3"][0]["data"]["depositId"] == "dep-3"
+        # Bounded by the limiter, but far faster than 20 sequential calls
+        assert stub.max_in_flight == 5
+        assert elapsed < 20 * stub.latency
+
+    def test_errors_are_mapped_like_pawapay_request(self):
+        from utils.external_requests import fetch_deposit_statuses
+        stub = PawaPayStub(latency=0, failures={
+            "down": "network", "html": "text", "gone": "not_found"})
+
+        results = fetch_deposit_statuses(
+            ["ok", "down", "html", "gone"], transport=stub.transport)
+
+        assert results["ok"][1] == 200
+        assert results["down"] == ({"status": "EXTERNAL_ERROR"}, 500)
+        assert results["html"] == ("Bad Gateway", 502)
+        assert results["gone"] == ({"status": "NOT_FOUND"}, 404)
+
+    def test_resend_callbacks(self):
+        from utils.external_requests import resend_callbacks
+        stub = PawaPayStub(latency=0)
+
+        results = resend_callbacks(["a", "b"], transport=stub.transport)
+
+        assert set(results) == {"a", "b"}
+        assert {r.method for r in stub.requests} == {"POST"}
+        assert {r.url.path for r in stub.requests} == {
+            "/v2/deposits/resend-callback/a", "/v2/deposits/resend-callback/b"}
+        assert stub.requests[0].headers["Authorization"].startswith("Bearer")
+
+    def test_breaker_and_limiter_run_off_the_event_loop(self, mocker):
+        import asyncio
+        from utils.circuit_breaker import CircuitBreaker, TokenBucket
+        from utils.external_requests import fetch_deposit_statuses
+        calls = []
+
+        def spy(original):
+            def call(*args, **kwargs):
+                try:
+                    asyncio.get_running_loop()
+                    calls.append((original.__name__, "loop"))
+                except RuntimeError:
+                    calls.append((original.__name__, "thread"))
+                return original(*args, **kwargs)
+            return call
+
+        for cls, name in [(CircuitBreaker, "guard"), (CircuitBreaker, "record"),
+                          (TokenBucket, "try_acquire")]:
+            mocker.patch.object(cls, name, spy(getattr(cls, name)))
+
+        fetch_deposit_statuses(["a", "b"], transport=PawaPayStub(latency=0).transport)
+
+        assert {name for name, _ in calls} == {"guard", "record", "try_acquire"}
+        assert {where for _, where in calls} == {"thread"}
+
+    def test_empty_batch_makes_no_calls(self):
+        from utils.external_requests import fetch_deposit_statuses
+        assert fetch_deposit_statuses([]) == {}
@@ -0,0 +1,74 @@
+"""
+Tests for time-ordered identifiers
+"""
+import re
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import pytest
+from utils import ids
+from utils.ids import monotonic_reference, uuid7, uuid7_time
+
+
+class TestUUID7:
+    def test_version_and_variant(self):
+        value = uuid7()
+
+        assert value.version == 7
+        assert value.variant == "specified in RFC 4122"
+
+    def test_encodes_creation_time(self):
+        before = datetime.now(timezone.utc) - timedelta(milliseconds=1)
+        value = uuid7()
+        after = datetime.now(timezone.utc) + timedelta(milliseconds=1)
+
+        assert before <= uuid7_time(value) <= after
+
+    def test_strictly_increasing(self):
+        values = [uuid7() for _ in range(20000)]
+
+        assert values == sorted(values)
+        assert len(set(values)) == len(values)
+
+    def test_monotonic_when_clock_moves_back(self):
+        first = uuid7()
+        with patch.object(ids.time, "time_ns", return_value=0):
+            second = uuid7()
+
+        assert second > first
+
+    def test_counter_overflow_borrows_next_millisecond(self):
+        with patch.object(ids.time, "time_ns", return_value=5 * 10**15):
+            values = [uuid7() for _ in range(5000)]
+
+        assert values == sorted(values)
+        assert uuid7_time(values[-1]) > uuid7_time(values[0])
+
+
+class TestMonotonicReference:
+    def test_format(self):
+        reference = monotonic_reference("PAY")
+
+        assert re.fullmatch(r"PAY-\d{14}-[0-9A-HJKMNP-TV-Z]{18}", reference)
+
+    def test_unique_and_sorted(self):
+        references = [monotonic_reference("PAY") for _ in range(20000)]
+
+        assert len(set(references)) == len(references)
+        assert references == sorted(references)
+
+
+@pytest.mark.django_db
+class TestModelPrimaryKeys:
+    def test_ledger_rows_use_uuid7(self, wallet_transaction_factory):
+        assert wallet_transaction_factory.id.version == 7
+
+    def test_payment_ids_stay_uuid4(self, payment_factory):
+        # PawaPay requires a UUIDv4 depositId
+        assert payment_factory.id.version == 4
+
+    def test_payment_reference(self):
+        from apps.payments.models import Payment
+        first = Payment.generate_reference()
+
+        assert first.startswith("PAY-")
+        assert Payment.generate_reference() > first
@@ -14,6 +14,7 @@ from utils.send_emails import (
     send_welcome_email,
     send_reminder_to_share_creator_link_email,
 )
+from apps.wallets.services.wallet_services import WalletRollupService
 from tests.factories import (
     UserFactory,
     WalletTransactionFactory,
@@ -306,6 +307,7 @@ class TestSendDailyWeeklySummaryEmail:
             amount=Decimal('50.00'),
             fee=Decimal('2.50'),
         )
+        WalletRollupService.rebuild(wallet_factory)
         mock_send_mail = mocker.patch('utils.send_emails.send_mail')
         
         # Act
@@ -338,6 +340,7 @@ class TestSendDailyWeeklySummaryEmail:
                 fee=Decimal('1.50'),
             )
         
+        WalletRollupService.rebuild(wallet_factory)
         mock_send_mail = mocker.patch('utils.send_emails.send_mail')
         
         # Act
@@ -370,7 +373,16 @@ class TestSendDailyWeeklySummaryEmail:
             amount=Decimal('50.00'),
             fee=Decimal('2.50'),
         )
+        # Fees are separate ledger rows linked to the cash-ins
+        for fee in (Decimal('-5.00'), Decimal('-2.50')):
+            WalletTransactionFactory(
+                wallet=wallet,
+                transaction_type='FEE',
+                status='COMPLETED',
+                amount=fee,
+            )
         
+        WalletRollupService.rebuild(wallet)
         mock_send_mail = mocker.patch('utils.send_emails.send_mail')
         
         # Act
@@ -411,6 +423,7 @@ class TestSendDailyWeeklySummaryEmail:
             amount=Decimal('50.00'),
         )
         
+        WalletRollupService.rebuild(wallet)
         mock_send_mail = mocker.patch('utils.send_emails.send_mail')
         
         # Act
@@ -452,6 +465,7 @@ class TestSendDailyWeeklySummaryEmail:
             amount=Decimal('500.00'),
         )
         
+        WalletRollupService.rebuild(wallet)
         mock_send_mail = mocker.patch('utils.send_emails.send_mail')
         
         # Act
@@ -487,6 +501,7 @@ class TestSendDailyWeeklySummaryEmail:
             fee=Decimal('0.00'),
         )
         
+        WalletRollupService.rebuild(wallet)
         mock_send_mail = mocker.patch('utils.send_emails.send_mail')
         
         # Act
@@ -579,6 +594,7 @@ class TestSendDailyWeeklySummaryEmail:
             status='COMPLETED',
             amount=Decimal('75.00'),
         )
+        WalletRollupService.rebuild(wallet)
         mock_send_mail = mocker.patch('utils.send_emails.send_mail')
         
         # Act
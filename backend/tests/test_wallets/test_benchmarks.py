@@ -0,0 +1,174 @@
+"""
+Benchmarks for wallet ledger writes. Run with ``pytest -m slow -s`` to see
+the timings.
+"""
+import time
+import uuid
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.wallets.models import WalletTransaction
+from apps.wallets.services.wallet_services import (
+    WalletService, WalletTransactionService as WalletTxnService)
+
+LEDGER_SIZES = [100, 10000]
+TIPS_PER_SIZE = 20
+
+
+def seed_ledger(wallet, size):
+    """Bulk insert completed CASH_IN rows to simulate ledger history."""
+    WalletTransaction.objects.bulk_create(
+        [
+            WalletTransaction(
+                wallet=wallet,
+                amount=Decimal("9.00"),
+                transaction_type="CASH_IN",
+                status="COMPLETED",
+                reference=f"SEED-{uuid.uuid4()}",
+                correlation_id=f"SEED-{i}",
+            )
+            for i in range(size)
+        ],
+        batch_size=1000,
+    )
+    WalletService.recalculate_wallet_balance(wallet)
+
+
+def time_tips(wallet):
+    """Average seconds per cash-in and the queries issued by the last one."""
+    started = time.perf_counter()
+    for _ in range(TIPS_PER_SIZE):
+        with CaptureQueriesContext(connection) as ctx:
+            WalletTxnService.cash_in(
+                wallet=wallet,
+                amount=Decimal("10.00"),
+                payment=None,
+                reference=f"BENCH-{uuid.uuid4()}",
+            )
+    return (time.perf_counter() - started) / TIPS_PER_SIZE, ctx.captured_queries
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestCashInBenchmark:
+    def test_tip_latency_is_flat_as_ledger_grows(self, user_factory):
+        from tests.factories import UserFactory
+        results = {}
+        for size in LEDGER_SIZES:
+            wallet = UserFactory().creator_profile.wallet
+            seed_ledger(wallet, size)
+
+            avg, queries = time_tips(wallet)
+
+            recalc_started = time.perf_counter()
+            WalletService.recalculate_wallet_balance(wallet)
+            recalc = time.perf_counter() - recalc_started
+
+            results[size] = (avg, len(queries))
+            print(
+                f"\nledger={size:>6} rows  cash_in={avg * 1000:.2f}ms "
+                f"queries={len(queries)}  full_recalculation={recalc * 1000:.2f}ms"
+            )
+            assert WalletService.verify_wallet_balance(wallet) == 0
+
+        # Same fixed number of queries regardless of ledger size
+        assert len({count for _, count in results.values()}) == 1
+
+
+BULK_PAYMENTS = 500
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestCashInManyBenchmark:
+    def test_bulk_cash_in_beats_per_row_path(self):
+        from tests.factories import UserFactory, PaymentFactory
+        results = {}
+        for path in ("per_row", "bulk"):
+            wallet = UserFactory().creator_profile.wallet
+            payments = PaymentFactory.create_batch(
+                BULK_PAYMENTS, wallet=wallet, amount=Decimal("10.00"),
+                status="completed")
+
+            started = time.perf_counter()
+            with CaptureQueriesContext(connection) as ctx:
+                if path == "bulk":
+                    WalletTxnService.cash_in_many(payments)
+                else:
+                    for payment in payments:
+                        WalletTxnService.cash_in(
+                            wallet=wallet, amount=payment.amount,
+                            payment=payment, reference=payment.reference)
+            elapsed = time.perf_counter() - started
+
+            results[path] = len(ctx.captured_queries)
+            print(
+                f"\n{path:>8}: payments={BULK_PAYMENTS} "
+                f"total={elapsed * 1000:.2f}ms queries={len(ctx.captured_queries)}"
+            )
+            assert WalletService.verify_wallet_balance(wallet) == 0
+
+        assert results["bulk"] < results["per_row"] / 10
+
+
+PARALLEL_WEBHOOKS = 40
+# Stand-in for the non-ledger part of a webhook (payment update, log row,
+# payload parsing) that used to run while the wallet row was locked
+WEBHOOK_WORK_SECONDS = 0.005
+
+
+def run_parallel_webhooks(wallet, hold_lock_for_whole_request):
+    """Deliver PARALLEL_WEBHOOKS cash-ins to one wallet from threads."""
+    from apps.wallets.services.wallet_locks import WalletLockManager
+
+    def webhook(i):
+        try:
+            reference = f"HOOK-{uuid.uuid4()}"
+            if hold_lock_for_whole_request:
+                with WalletLockManager.locked(wallet.pk):
+                    time.sleep(WEBHOOK_WORK_SECONDS)
+                    WalletTxnService.cash_in(
+                        wallet=wallet, amount=Decimal("10.00"),
+                        payment=None, reference=reference)
+            else:
+                time.sleep(WEBHOOK_WORK_SECONDS)
+                WalletTxnService.cash_in(
+                    wallet=wallet, amount=Decimal("10.00"),
+                    payment=None, reference=reference)
+        finally:
+            connection.close()
+
+    import threading
+    threads = [
+        threading.Thread(target=webhook, args=(i,))
+        for i in range(PARALLEL_WEBHOOKS)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return PARALLEL_WEBHOOKS / (time.perf_counter() - started)
+
+
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+class TestWalletLockBenchmark:
+    def test_short_critical_section_raises_throughput(self):
+        from tests.factories import UserFactory
+        results = {}
+        for mode in ("whole_request", "ledger_only"):
+            wallet = UserFactory().creator_profile.wallet
+            results[mode] = run_parallel_webhooks(
+                wallet, hold_lock_for_whole_request=mode == "whole_request")
+            print(
+                f"\n{mode:>13}: webhooks={PARALLEL_WEBHOOKS} "
+                f"throughput={results[mode]:.1f}/s"
+            )
+            wallet.refresh_from_db()
+            assert wallet.transactions.filter(
+                transaction_type="CASH_IN").count() == PARALLEL_WEBHOOKS
+            assert wallet.balance == Decimal("9.00") * PARALLEL_WEBHOOKS
+
+        assert results["ledger_only"] > results["whole_request"]
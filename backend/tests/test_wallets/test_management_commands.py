@@ -0,0 +1,84 @@
+import pytest
+from io import StringIO
+from decimal import Decimal
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestAuditWalletBalancesCommand:
+    """Test audit_wallet_balances management command"""
+
+    def test_reports_drifted_wallet(self, wallet_txn_factory):
+        wallet_txn = wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+        out = StringIO()
+
+        call_command("audit_wallet_balances", stdout=out)
+
+        assert "Total drifted wallets: 1" in out.getvalue()
+        wallet_txn.wallet.refresh_from_db()
+        assert wallet_txn.wallet.balance == Decimal("0")
+
+    def test_fix_repairs_drifted_wallet(self, wallet_txn_factory):
+        wallet_txn = wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+        out = StringIO()
+
+        call_command("audit_wallet_balances", "--fix", stdout=out)
+
+        assert "Fixed wallet" in out.getvalue()
+        wallet_txn.wallet.refresh_from_db()
+        assert wallet_txn.wallet.balance == Decimal("10")
+
+    def test_consistent_wallets_are_not_reported(self, user_factory):
+        out = StringIO()
+
+        call_command("audit_wallet_balances", stdout=out)
+
+        assert "Total drifted wallets: 0" in out.getvalue()
+
+    def test_full_audit_ignores_checkpoints(self, wallet_txn_factory):
+        from apps.wallets.models import WalletBalanceCheckpoint
+        from django.utils import timezone
+        wallet_txn = wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+        WalletBalanceCheckpoint.objects.create(
+            wallet=wallet_txn.wallet, as_of=timezone.now(), balance=Decimal("0"))
+        out = StringIO()
+
+        call_command("audit_wallet_balances", stdout=out)
+        assert "Total drifted wallets: 0" in out.getvalue()
+
+        call_command("audit_wallet_balances", "--full", stdout=out)
+        assert "Total drifted wallets: 1" in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestBackfillWalletRollupsCommand:
+    """Test backfill_wallet_rollups management command"""
+
+    def test_backfills_rollups_from_ledger(self, wallet_txn_factory):
+        wallet_txn = wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+        out = StringIO()
+
+        call_command("backfill_wallet_rollups", stdout=out)
+
+        assert "Rebuilt 1 rollup days" in out.getvalue()
+        rollup = wallet_txn.wallet.daily_rollups.get()
+        assert rollup.cash_in == Decimal("10")
+        assert rollup.tip_count == 1
+
+
+@pytest.mark.django_db
+class TestArchiveWalletTransactionsCommand:
+    """Test archive_wallet_transactions management command"""
+
+    def test_archives_rows_older_than_days(self, wallet_txn_factory):
+        from datetime import timedelta
+        from django.utils import timezone
+        wallet_txn = wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+        type(wallet_txn).objects.filter(pk=wallet_txn.pk).update(
+            created_at=timezone.now() - timedelta(days=10))
+        out = StringIO()
+
+        call_command("archive_wallet_transactions", "--days", "7", stdout=out)
+
+        assert "Archived 1 wallet transactions" in out.getvalue()
+        assert not wallet_txn.wallet.transactions.exists()
@@ -0,0 +1,51 @@
+import threading
+import time
+import uuid
+import pytest
+from django.db import connection
+from apps.wallets.services.wallet_locks import WalletLockManager
+
+
+class TestWalletLockManager:
+    """Test per-wallet write locks"""
+
+    def test_lock_key_is_stable_signed_64_bit(self):
+        wallet_id = uuid.uuid4()
+
+        key = WalletLockManager.lock_key(wallet_id)
+
+        assert key == WalletLockManager.lock_key(str(wallet_id))
+        assert -2**63 <= key < 2**63
+
+    @pytest.mark.django_db
+    def test_locked_opens_a_transaction(self):
+        with WalletLockManager.locked(uuid.uuid4()):
+            assert connection.in_atomic_block
+
+    @pytest.mark.django_db
+    def test_locked_is_reentrant(self):
+        wallet_id = uuid.uuid4()
+        with WalletLockManager.locked(wallet_id):
+            with WalletLockManager.locked(wallet_id, uuid.uuid4()):
+                pass
+
+    def test_fallback_serializes_writers_of_one_wallet(self, mocker):
+        mocker.patch("apps.wallets.services.wallet_locks.transaction.atomic")
+        wallet_id = uuid.uuid4()
+        inside = []
+        overlaps = []
+
+        def writer():
+            with WalletLockManager.locked(wallet_id):
+                inside.append(1)
+                overlaps.append(len(inside))
+                time.sleep(0.01)
+                inside.pop()
+
+        threads = [threading.Thread(target=writer) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert overlaps == [1] * 5
@@ -2,7 +2,8 @@ import pytest
 from decimal import Decimal
 from datetime import datetime, timedelta
 from apps.wallets.services.wallet_services import (
-    WalletService, PayoutScheduleService)
+    WalletService, PayoutScheduleService, LedgerCheckpointService,
+    WalletRollupService, LedgerArchiveService, WalletSummaryService)
 from apps.wallets.services.wallet_services import\
     WalletTransactionService as WalletTxnService
 from utils.exceptions import (
@@ -183,6 +184,27 @@ class TestWalletTransactionService:
                 correlation_id="PAYOUT-FAIL",
             )
 
+    def test_other_integrity_errors_are_not_duplicates(
+        self, user_factory, mocker,
+    ):
+        from django.db import IntegrityError
+        mocker.patch.object(
+            WalletRollupService, "record_many",
+            side_effect=IntegrityError("NOT NULL constraint failed"))
+
+        with pytest.raises(IntegrityError):
+            WalletTxnService.cash_in(
+                wallet=user_factory.creator_profile.wallet,
+                amount=Decimal("10.00"), payment=None, reference="NEW-1",
+            )
+
+    def test_cash_in_requires_reference(self, user_factory):
+        with pytest.raises(InvalidTransaction):
+            WalletTxnService.cash_in(
+                wallet=user_factory.creator_profile.wallet,
+                amount=Decimal("10.00"), payment=None, reference="",
+            )
+
     def test_duplicate_transaction_raises(self, user_factory):
         WalletTxnService.cash_in(
             wallet=user_factory.creator_profile.wallet,
@@ -355,6 +377,181 @@ class TestWalletTransactionService:
             WalletTxnService.finalize_payout(
                 payout_tx=tx, success=True)
 
+    def test_cash_in_updates_balance_without_ledger_scan(self, user_factory):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        wallet = user_factory.creator_profile.wallet
+
+        with CaptureQueriesContext(connection) as ctx:
+            WalletTxnService.cash_in(
+                wallet=wallet, amount=Decimal("20.00"),
+                payment=None, reference="CASHIN-DELTA",
+            )
+
+        assert not any("SUM(" in q["sql"].upper() for q in ctx.captured_queries)
+        wallet.refresh_from_db()
+        assert wallet.balance == Decimal("18.00")
+
+    def test_concurrent_finalize_applies_delta_once(self, user_factory):
+        from apps.wallets.models import WalletTransaction
+        wallet = user_factory.creator_profile.wallet
+        WalletTxnService.cash_in(
+            wallet=wallet, amount=Decimal("50.00"),
+            payment=None, reference="CASHIN-STALE",
+        )
+        payout_tx = WalletTxnService.payout(
+            wallet=wallet, amount=Decimal("20.00"), correlation_id="PAYOUT-STALE"
+        )
+        # A second, stale copy of the same pending payout
+        stale_tx = WalletTransaction.objects.get(pk=payout_tx.pk)
+
+        WalletTxnService.finalize_payout(payout_tx=payout_tx, success=True)
+        WalletTxnService.finalize_payout(payout_tx=stale_tx, success=True)
+
+        wallet.refresh_from_db()
+        assert wallet.balance == Decimal("25.00")
+        assert stale_tx.status == "COMPLETED"
+
+    def test_cash_in_does_not_check_for_existing_references(self, user_factory):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        wallet = user_factory.creator_profile.wallet
+        WalletTxnService.cash_in(
+            wallet=wallet, amount=Decimal("10.00"), payment=None,
+            reference="CASHIN-Q1")
+
+        with CaptureQueriesContext(connection) as ctx:
+            WalletTxnService.cash_in(
+                wallet=wallet, amount=Decimal("10.00"), payment=None,
+                reference="CASHIN-Q2")
+
+        statements = [
+            q["sql"] for q in ctx.captured_queries
+            if "SAVEPOINT" not in q["sql"].upper()
+        ]
+        # archive lookup, ledger insert, rollup update, balance update,
+        # balance refresh; the hot ledger is never read
+        assert len(statements) == 5
+        assert "archived" in statements[0]
+        assert not any(
+            sql.lstrip().upper().startswith("SELECT") and '"wallets_wallettransaction"' in sql
+            for sql in statements)
+
+    def test_duplicate_fee_reference_rolls_back_cash_in(self, wallet_txn_factory):
+        wallet_txn = wallet_txn_factory(reference="CASHIN-DUP-FEE")
+        wallet = wallet_txn.wallet
+
+        with pytest.raises(DuplicateTransaction):
+            WalletTxnService.cash_in(
+                wallet=wallet, amount=Decimal("10.00"), payment=None,
+                reference="CASHIN-DUP")
+
+        assert not wallet.transactions.filter(reference="CASHIN-DUP").exists()
+        wallet.refresh_from_db()
+        assert wallet.balance == Decimal("0")
+
+    def test_insert_ledger_rows_reports_conflicts(self, wallet_txn_factory):
+        from apps.wallets.models import WalletTransaction
+        wallet_txn = wallet_txn_factory(reference="LEDGER-1")
+        row = WalletTransaction(
+            wallet=wallet_txn.wallet, amount=Decimal("1"),
+            transaction_type="CASH_IN", reference="LEDGER-1",
+            correlation_id="LEDGER")
+
+        assert WalletTxnService.insert_ledger_rows([row]) is False
+        row.reference = "LEDGER-2"
+        assert WalletTxnService.insert_ledger_rows([row]) is True
+
+    def test_cash_in_many_creates_rows_and_updates_balance(self, user_factory):
+        from tests.factories import PaymentFactory
+        wallet = user_factory.creator_profile.wallet
+        payments = PaymentFactory.create_batch(
+            3, wallet=wallet, amount=Decimal("20.00"), status="completed")
+
+        txs = WalletTxnService.cash_in_many(payments)
+
+        assert len(txs) == 3
+        assert wallet.transactions.filter(transaction_type="FEE").count() == 3
+        wallet.refresh_from_db()
+        assert wallet.balance == Decimal("54.00")
+        assert WalletService.verify_wallet_balance(wallet) == 0
+        assert wallet.daily_rollups.get().tip_count == 3
+
+    def test_cash_in_many_skips_existing_references(self, user_factory):
+        from tests.factories import PaymentFactory
+        wallet = user_factory.creator_profile.wallet
+        payments = PaymentFactory.create_batch(
+            2, wallet=wallet, amount=Decimal("10.00"), status="completed")
+        WalletTxnService.cash_in(
+            wallet=wallet, amount=payments[0].amount, payment=payments[0],
+            reference=payments[0].reference)
+
+        txs = WalletTxnService.cash_in_many(payments + payments)
+
+        assert [tx.reference for tx in txs] == [payments[1].reference]
+        wallet.refresh_from_db()
+        assert wallet.balance == Decimal("18.00")
+        assert WalletTxnService.cash_in_many(payments) == []
+
+    def test_cash_in_many_skips_payments_credited_under_another_reference(
+        self, user_factory
+    ):
+        from tests.factories import PaymentFactory
+        wallet = user_factory.creator_profile.wallet
+        payment = PaymentFactory(
+            wallet=wallet, amount=Decimal("10.00"), status="completed")
+        # Credited by a callback under the provider transaction id
+        WalletTxnService.cash_in(
+            wallet=wallet, amount=payment.amount, payment=payment,
+            reference="PROVIDER-TX-1")
+
+        assert WalletTxnService.cash_in_many([payment]) == []
+        assert wallet.transactions.filter(transaction_type="CASH_IN").count() == 1
+
+    def test_cash_in_many_skips_rows_inserted_concurrently(
+        self, user_factory, mocker
+    ):
+        from tests.factories import PaymentFactory
+        wallet = user_factory.creator_profile.wallet
+        payments = PaymentFactory.create_batch(
+            2, wallet=wallet, amount=Decimal("10.00"), status="completed")
+        from apps.wallets.services.wallet_locks import WalletLockManager
+        lock = WalletLockManager.locked
+
+        def credit_first_then_lock(*wallet_ids):
+            # Another worker credits payments[0] after the existence checks
+            mocker.stopall()
+            WalletTxnService.cash_in(
+                wallet=wallet, amount=payments[0].amount, payment=payments[0],
+                reference=payments[0].reference)
+            return lock(*wallet_ids)
+
+        mocker.patch(
+            "apps.wallets.services.wallet_services.WalletLockManager.locked",
+            side_effect=credit_first_then_lock)
+
+        txs = WalletTxnService.cash_in_many(payments)
+
+        assert [tx.reference for tx in txs] == [payments[1].reference]
+        assert wallet.transactions.filter(transaction_type="CASH_IN").count() == 2
+        wallet.refresh_from_db()
+        assert wallet.balance == Decimal("18.00")
+        assert WalletService.verify_wallet_balance(wallet) == 0
+
+    def test_cash_in_many_spans_wallets(self, db):
+        from tests.factories import PaymentFactory
+        wallets = [UserFactory().creator_profile.wallet for _ in range(2)]
+        payments = [
+            PaymentFactory(wallet=wallet, amount=Decimal("10.00"))
+            for wallet in wallets
+        ]
+
+        WalletTxnService.cash_in_many(payments)
+
+        for wallet in wallets:
+            wallet.refresh_from_db()
+            assert wallet.balance == Decimal("9.00")
+
 
 @pytest.mark.django_db
 class TestWalletService:
@@ -415,4 +612,316 @@ class TestWalletService:
             amount=Decimal('10'), status="COMPLETED")
         with pytest.raises(WalletError):
             WalletService.recalculate_wallet_balance('not-wallet')
-        
\ No newline at end of file
+        
+
+    def test_verify_wallet_balance_reports_drift(self, wallet_txn_factory):
+        wallet_txn = wallet_txn_factory(
+            amount=Decimal('10'), status="COMPLETED")
+        wallet = wallet_txn.wallet
+        assert WalletService.verify_wallet_balance(wallet) == Decimal('-10')
+
+        WalletService.recalculate_wallet_balance(wallet)
+        assert WalletService.verify_wallet_balance(wallet) == Decimal('0')
+
+    def test_apply_balance_delta(self, user_factory):
+        wallet = user_factory.creator_profile.wallet
+        assert WalletService.apply_balance_delta(wallet, Decimal('7.50')) == Decimal('7.50')
+        assert WalletService.apply_balance_delta(wallet, Decimal('-2.50')) == Decimal('5.00')
+        wallet.refresh_from_db()
+        assert wallet.balance == Decimal('5.00')
+
+
+@pytest.mark.django_db
+class TestLedgerCheckpointService:
+    """Test wallet balance checkpoints"""
+
+    @staticmethod
+    def later(hours=1):
+        from django.utils import timezone
+        return timezone.now() + timedelta(hours=hours)
+
+    def test_checkpoint_records_ledger_balance(self, wallet_txn_factory):
+        wallet_txn = wallet_txn_factory(amount=Decimal('10'), status="COMPLETED")
+        wallet_txn_factory(amount=Decimal('-2'), status="COMPLETED",
+                           transaction_type="FEE", wallet=wallet_txn.wallet)
+
+        checkpoint = LedgerCheckpointService.create_checkpoint(
+            wallet_txn.wallet, now=self.later())
+
+        assert checkpoint.balance == Decimal('10')
+        assert checkpoint.last_tx is not None
+
+    def test_recalculation_only_sums_rows_after_checkpoint(self, wallet_txn_factory):
+        wallet_txn = wallet_txn_factory(amount=Decimal('10'), status="COMPLETED")
+        wallet = wallet_txn.wallet
+        checkpoint = LedgerCheckpointService.create_checkpoint(
+            wallet, now=self.later())
+        # Rows covered by the checkpoint are no longer summed
+        checkpoint.balance = Decimal('100')
+        checkpoint.save()
+
+        assert WalletService.recalculate_wallet_balance(wallet) == Decimal('100')
+        assert WalletService.compute_ledger_balance(
+            wallet, use_checkpoint=False) == Decimal('10')
+
+    def test_checkpoint_stops_before_pending_transaction(self, wallet_txn_factory):
+        wallet_txn = wallet_txn_factory(amount=Decimal('10'), status="COMPLETED")
+        pending = wallet_txn_factory(
+            amount=Decimal('-5'), wallet=wallet_txn.wallet,
+            transaction_type="PAYOUT", status="PENDING")
+
+        checkpoint = LedgerCheckpointService.create_checkpoint(
+            wallet_txn.wallet, now=self.later())
+
+        assert checkpoint.as_of == pending.created_at
+        assert checkpoint.balance == Decimal('10')
+
+        # Completing the payout later is still picked up by recalculation
+        pending.status = "COMPLETED"
+        pending.save()
+        assert WalletService.recalculate_wallet_balance(
+            wallet_txn.wallet) == Decimal('5')
+
+    def test_checkpoints_chain_from_previous(self, wallet_txn_factory):
+        wallet_txn = wallet_txn_factory(amount=Decimal('10'), status="COMPLETED")
+        wallet = wallet_txn.wallet
+        LedgerCheckpointService.create_checkpoint(wallet, now=self.later(1))
+        assert LedgerCheckpointService.create_checkpoint(
+            wallet, now=self.later(2)) is None
+
+        new_txn = wallet_txn_factory(
+            amount=Decimal('4'), status="COMPLETED", wallet=wallet)
+        type(new_txn).objects.filter(pk=new_txn.pk).update(
+            created_at=self.later(2))
+        checkpoint = LedgerCheckpointService.create_checkpoint(
+            wallet, now=self.later(3))
+
+        assert checkpoint.balance == Decimal('14')
+        assert wallet.balance_checkpoints.count() == 2
+
+    def test_no_checkpoint_for_recent_rows(self, wallet_txn_factory):
+        wallet_txn = wallet_txn_factory(amount=Decimal('10'), status="COMPLETED")
+
+        assert LedgerCheckpointService.create_checkpoint(wallet_txn.wallet) is None
+
+
+@pytest.mark.django_db
+class TestWalletRollupService:
+    """Test per-day wallet rollups"""
+
+    def test_ledger_writes_update_rollup(self, user_factory):
+        wallet = user_factory.creator_profile.wallet
+        WalletTxnService.cash_in(
+            wallet=wallet, amount=Decimal("50.00"), payment=None,
+            reference="ROLLUP-1")
+        WalletTxnService.cash_in(
+            wallet=wallet, amount=Decimal("20.00"), payment=None,
+            reference="ROLLUP-2")
+        payout_tx = WalletTxnService.payout(
+            wallet=wallet, amount=Decimal("30.00"), correlation_id="ROLLUP-P")
+        WalletTxnService.finalize_payout(payout_tx=payout_tx, success=True)
+
+        rollup = wallet.daily_rollups.get()
+        assert rollup.cash_in == Decimal("63.00")
+        assert rollup.fees == Decimal("7.00")
+        assert rollup.tip_count == 2
+        assert rollup.payouts == Decimal("30.00")
+        assert rollup.payout_count == 1
+
+    def test_pending_and_failed_payouts_are_not_rolled_up(self, user_factory):
+        wallet = user_factory.creator_profile.wallet
+        WalletTxnService.cash_in(
+            wallet=wallet, amount=Decimal("50.00"), payment=None,
+            reference="ROLLUP-3")
+        payout_tx = WalletTxnService.payout(
+            wallet=wallet, amount=Decimal("30.00"), correlation_id="ROLLUP-F")
+        WalletTxnService.finalize_payout(payout_tx=payout_tx, success=False)
+
+        totals = WalletRollupService.get_totals(wallet)
+        assert totals["payouts"] == Decimal("0.00")
+        assert totals["payout_count"] == 0
+
+    def test_rebuild_matches_incremental_rollup(self, user_factory):
+        wallet = user_factory.creator_profile.wallet
+        for i in range(3):
+            WalletTxnService.cash_in(
+                wallet=wallet, amount=Decimal("10.00"), payment=None,
+                reference=f"ROLLUP-R{i}")
+        incremental = WalletRollupService.get_totals(wallet)
+        wallet.daily_rollups.all().delete()
+
+        assert WalletRollupService.rebuild(wallet) == 1
+        assert WalletRollupService.get_totals(wallet) == incremental
+
+    def test_get_totals_since_skips_older_days(self, wallet_txn_factory):
+        from django.utils import timezone
+        wallet_txn = wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+        wallet = wallet_txn.wallet
+        old_txn = wallet_txn_factory(
+            amount=Decimal("5"), status="COMPLETED", wallet=wallet)
+        type(old_txn).objects.filter(pk=old_txn.pk).update(
+            created_at=timezone.now() - timedelta(days=10))
+        WalletRollupService.rebuild(wallet)
+
+        today = timezone.localdate()
+        assert WalletRollupService.get_totals(wallet)["cash_in"] == Decimal("15")
+        assert WalletRollupService.get_totals(
+            wallet, since=today)["cash_in"] == Decimal("10")
+
+
+@pytest.mark.django_db
+class TestLedgerArchiveService:
+    """Test archival of closed-period ledger rows"""
+
+    @staticmethod
+    def backdate(tx, days=100):
+        from django.utils import timezone
+        type(tx).objects.filter(pk=tx.pk).update(
+            created_at=timezone.now() - timedelta(days=days))
+
+    def test_archives_old_rows_and_keeps_balance(self, wallet_txn_factory):
+        old_txn = wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+        wallet = old_txn.wallet
+        self.backdate(old_txn)
+        wallet_txn_factory(amount=Decimal("5"), status="COMPLETED", wallet=wallet)
+        WalletService.recalculate_wallet_balance(wallet, use_checkpoint=False)
+
+        assert LedgerArchiveService.archive_wallet(wallet) == 1
+
+        assert wallet.transactions.count() == 1
+        assert wallet.archived_transactions.get().reference == old_txn.reference
+        assert WalletService.verify_wallet_balance(wallet) == 0
+        assert WalletService.verify_wallet_balance(
+            wallet, use_checkpoint=False) == 0
+        WalletRollupService.rebuild(wallet)
+        assert WalletRollupService.get_totals(wallet)["cash_in"] == Decimal("15")
+
+    def test_keeps_rows_referenced_by_recent_rows(self, wallet_txn_factory):
+        fee_txn = wallet_txn_factory(
+            amount=Decimal("-1"), status="COMPLETED", transaction_type="FEE")
+        self.backdate(fee_txn)
+        wallet_txn_factory(
+            amount=Decimal("1"), status="COMPLETED",
+            transaction_type="FEE_REVERSAL", wallet=fee_txn.wallet,
+            related_transaction=fee_txn)
+
+        assert LedgerArchiveService.archive_wallet(fee_txn.wallet) == 0
+
+    def test_fee_moves_with_its_cash_in(self, user_factory, monkeypatch):
+        wallet = user_factory.creator_profile.wallet
+        cash_in = WalletTxnService.cash_in(
+            wallet=wallet, amount=Decimal("100.00"), payment=None,
+            reference="ARCHIVE-FEE")
+        fee = wallet.transactions.get(transaction_type="FEE")
+        self.backdate(cash_in, days=101)
+        self.backdate(fee)
+        # The cash-in ends a batch and its fee would start the next one
+        monkeypatch.setattr(LedgerArchiveService, "BATCH_SIZE", 1)
+
+        assert LedgerArchiveService.archive_wallet(wallet) == 2
+
+        archived_fee = wallet.archived_transactions.get(transaction_type="FEE")
+        assert archived_fee.related_transaction_id == cash_in.pk
+
+    def test_cash_in_rejects_archived_reference(self, user_factory):
+        wallet = user_factory.creator_profile.wallet
+        cash_in = WalletTxnService.cash_in(
+            wallet=wallet, amount=Decimal("100.00"), payment=None,
+            reference="ARCHIVED-1")
+        for tx in wallet.transactions.all():
+            self.backdate(tx)
+        LedgerArchiveService.archive_wallet(wallet)
+        assert not wallet.transactions.exists()
+
+        with pytest.raises(DuplicateTransaction):
+            WalletTxnService.cash_in(
+                wallet=wallet, amount=Decimal("100.00"), payment=None,
+                reference=cash_in.reference)
+        assert not wallet.transactions.exists()
+
+    def test_range_reaching_archive_unions_both_tables(self, wallet_txn_factory):
+        from django.utils import timezone
+        old_txn = wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+        wallet = old_txn.wallet
+        self.backdate(old_txn)
+        new_txn = wallet_txn_factory(
+            amount=Decimal("5"), status="COMPLETED", wallet=wallet)
+        LedgerArchiveService.archive_wallet(wallet)
+
+        recent = LedgerArchiveService.transactions_for_range(
+            wallet, start=timezone.now() - timedelta(days=1))
+        everything = LedgerArchiveService.transactions_for_range(
+            wallet, start=timezone.now() - timedelta(days=365))
+
+        assert recent.query.combinator is None
+        assert [tx.reference for tx in recent] == [new_txn.reference]
+        assert {
+            tx.reference for tx in everything.order_by("-created_at")
+        } == {old_txn.reference, new_txn.reference}
+
+    def test_open_start_ranges_include_archive(self, wallet_txn_factory):
+        from django.utils import timezone
+        old_txn = wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+        wallet = old_txn.wallet
+        self.backdate(old_txn)
+        new_txn = wallet_txn_factory(
+            amount=Decimal("5"), status="COMPLETED", wallet=wallet)
+        LedgerArchiveService.archive_wallet(wallet)
+
+        all_time = LedgerArchiveService.transactions_for_range(wallet)
+        until_now = LedgerArchiveService.transactions_for_range(
+            wallet, end=timezone.now())
+        until_last_month = LedgerArchiveService.transactions_for_range(
+            wallet, end=timezone.now() - timedelta(days=30))
+
+        for queryset in (all_time, until_now):
+            assert {tx.reference for tx in queryset} == {
+                old_txn.reference, new_txn.reference}
+        assert [tx.reference for tx in until_last_month] == [old_txn.reference]
+
+
+@pytest.mark.django_db
+class TestWalletSummaryService:
+    """Test the single-query wallet summary projection"""
+
+    def test_summary_figures(self, user_factory):
+        wallet = user_factory.creator_profile.wallet
+        WalletTxnService.cash_in(
+            wallet=wallet, amount=Decimal("50.00"), payment=None,
+            reference="SUMMARY-1")
+        payout_tx = WalletTxnService.payout(
+            wallet=wallet, amount=Decimal("20.00"), correlation_id="SUMMARY-P")
+        WalletTxnService.finalize_payout(payout_tx=payout_tx, success=True)
+
+        summary = WalletSummaryService.get_for_user(user_factory)
+
+        assert summary.summary_transaction_count == 3
+        assert summary.summary_total_outgoing == Decimal("-20.00")
+        assert summary.summary_cash_in == Decimal("45.00")
+        assert summary.summary_fees == Decimal("5.00")
+        assert summary.summary_payouts == Decimal("20.00")
+        assert WalletSummaryService.last_payout_at(summary) == payout_tx.created_at
+
+    def test_summary_counts_archived_rows(self, wallet_txn_factory):
+        from django.utils import timezone
+        old_txn = wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+        type(old_txn).objects.filter(pk=old_txn.pk).update(
+            created_at=timezone.now() - timedelta(days=100))
+        wallet_txn_factory(
+            amount=Decimal("5"), status="COMPLETED", wallet=old_txn.wallet)
+        LedgerArchiveService.archive_wallet(old_txn.wallet)
+
+        summary = WalletSummaryService.get(old_txn.wallet.pk)
+
+        assert summary.summary_transaction_count == 2
+
+    def test_summary_is_a_single_query(self, user_factory, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            summary = WalletSummaryService.get_for_user(user_factory)
+            assert summary.creator.user == user_factory
+
+    def test_missing_wallet_raises(self):
+        user = UserFactory(user_type="admin")
+
+        with pytest.raises(WalletNotFound, match="User does not have a wallet"):
+            WalletSummaryService.get_for_user(user)
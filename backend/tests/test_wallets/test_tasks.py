@@ -0,0 +1,65 @@
+"""
+Tests for Celery tasks in the wallets app.
+"""
+import pytest
+from decimal import Decimal
+from datetime import timedelta
+from apps.wallets.models import WalletBalanceCheckpoint
+from apps.wallets.services.wallet_services import LedgerCheckpointService
+from apps.wallets.tasks import (
+    checkpoint_wallet_balances, archive_wallet_transactions)
+
+
+@pytest.mark.django_db
+class TestCheckpointWalletBalancesTask:
+    """Tests for checkpoint_wallet_balances Celery task."""
+
+    def test_creates_checkpoint_for_active_wallets(
+        self, wallet_txn_factory, mocker
+    ):
+        wallet_txn = wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+        mocker.patch.object(
+            LedgerCheckpointService, "CHECKPOINT_LAG", timedelta(hours=-1))
+
+        result = checkpoint_wallet_balances()
+
+        assert result == "Created 1 wallet balance checkpoints"
+        checkpoint = WalletBalanceCheckpoint.objects.get(wallet=wallet_txn.wallet)
+        assert checkpoint.balance == Decimal("10")
+
+    def test_skips_wallets_without_new_activity(self, user_factory):
+        result = checkpoint_wallet_balances()
+
+        assert result == "Created 0 wallet balance checkpoints"
+        assert not WalletBalanceCheckpoint.objects.exists()
+
+    def test_continues_after_wallet_error(self, wallet_txn_factory, mocker):
+        wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+        mocker.patch.object(
+            LedgerCheckpointService, "create_checkpoint",
+            side_effect=Exception("boom"))
+
+        result = checkpoint_wallet_balances()
+
+        assert result == "Created 0 wallet balance checkpoints"
+
+
+@pytest.mark.django_db
+class TestArchiveWalletTransactionsTask:
+    """Tests for archive_wallet_transactions Celery task."""
+
+    def test_archives_closed_period_rows(self, wallet_txn_factory):
+        from django.utils import timezone
+        wallet_txn = wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+        type(wallet_txn).objects.filter(pk=wallet_txn.pk).update(
+            created_at=timezone.now() - timedelta(days=100))
+
+        result = archive_wallet_transactions()
+
+        assert result == "Archived 1 wallet transactions"
+        assert wallet_txn.wallet.archived_transactions.count() == 1
+
+    def test_recent_rows_stay_hot(self, wallet_txn_factory):
+        wallet_txn_factory(amount=Decimal("10"), status="COMPLETED")
+
+        assert archive_wallet_transactions() == "Archived 0 wallet transactions"
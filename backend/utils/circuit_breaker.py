@@ -0,0 +1,317 @@
+"""
+Circuit breaker and token-bucket limiter for calls to external providers.
+State lives in the shared cache (Redis) so every gunicorn and Celery
+process sees the same breaker; when the cache is unreachable each process
+falls back to its own in-memory state.
+"""
+import logging
+import threading
+import time
+from django.core.cache import cache
+from utils.exceptions import CircuitOpenError, RateLimitExceeded
+
+logger = logging.getLogger(__name__)
+
+
+class _LocalStore:
+    """Process-local stand-in for the cache operations used here."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key):
+        value, expires = self._data.get(key, (None, None))
+        if expires is not None and expires <= time.time():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._live(key)
+        return default if value is None else value
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            self._data[key] = (
+                value, time.time() + timeout if timeout else None)
+
+    def add(self, key, value, timeout=None):
+        with self._lock:
+            if self._live(key) is not None:
+                return False
+            self._data[key] = (
+                value, time.time() + timeout if timeout else None)
+            return True
+
+    def incr_with_ttl(self, key, timeout=None):
+        with self._lock:
+            value = self._live(key)
+            if value is None:
+                self._data[key] = (
+                    1, time.time() + timeout if timeout else None)
+                return 1
+            _, expires = self._data[key]
+            self._data[key] = (value + 1, expires)
+            return value + 1
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data = {}
+
+
+_local_store = _LocalStore()
+
+
+def _shared(operation, *args, **kwargs):
+    """Runs a cache operation, falling back to the local store on errors."""
+    try:
+        if operation == "incr_with_ttl":
+            key, timeout = args[0], kwargs.get("timeout")
+            if cache.add(key, 1, timeout=timeout):
+                return 1
+            try:
+                return cache.incr(key)
+            except ValueError:
+                # Expired between add and incr
+                cache.set(key, 1, timeout=timeout)
+                return 1
+        return getattr(cache, operation)(*args, **kwargs)
+    except Exception as e:
+        logger.warning(f"Shared cache unavailable, using local state: {e}")
+        return getattr(_local_store, operation)(*args, **kwargs)
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint breaker. CLOSED passes calls through and counts failures
+    (errors and calls slower than slow_call_ms) in a sliding window. At
+    failure_threshold it OPENs and rejects calls for cooldown seconds,
+    then lets a single probe through (HALF_OPEN): success closes it, a
+    failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    FAILURE_THRESHOLD = 5
+    WINDOW_SECONDS = 60
+    SLOW_CALL_MS = 5000
+    COOLDOWN_SECONDS = 30
+    KEY_PREFIX = "circuit"
+
+    _registry = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, name, failure_threshold=None, window_seconds=None,
+                 slow_call_ms=None, cooldown_seconds=None):
+        self.name = name
+        self.failure_threshold = failure_threshold or self.FAILURE_THRESHOLD
+        self.window_seconds = window_seconds or self.WINDOW_SECONDS
+        self.slow_call_ms = slow_call_ms or self.SLOW_CALL_MS
+        self.cooldown_seconds = cooldown_seconds or self.COOLDOWN_SECONDS
+
+    @classmethod
+    def for_name(cls, name):
+        """Returns the process-wide breaker registered under name."""
+        with cls._registry_lock:
+            if name not in cls._registry:
+                cls._registry[name] = cls(name)
+            return cls._registry[name]
+
+    @classmethod
+    def all(cls):
+        with cls._registry_lock:
+            return list(cls._registry.values())
+
+    def _key(self, suffix):
+        return f"{self.KEY_PREFIX}:{self.name}:{suffix}"
+
+    def state(self) -> str:
+        opened_until = _shared("get", self._key("opened_until"))
+        if opened_until is None:
+            return self.CLOSED
+        if time.time() < opened_until:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may go out now."""
+        state = self.state()
+        if state == self.CLOSED:
+            return True
+        if state == self.OPEN:
+            return False
+        # Only one probe per cooldown while half open
+        return _shared(
+            "add", self._key("probe"), 1, timeout=self.cooldown_seconds)
+
+    def guard(self):
+        """
+        Raises CircuitOpenError if the breaker rejects the call.
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit open for {self.name}")
+
+    def record(self, elapsed_ms, failed=False):
+        """
+        Records the outcome of a call.
+        args:
+            elapsed_ms: how long the call took
+            failed: whether the call errored
+        """
+        if failed or elapsed_ms > self.slow_call_ms:
+            self._record_failure()
+        elif self.state() == self.HALF_OPEN:
+            self._close()
+
+    def _record_failure(self):
+        if self.state() == self.HALF_OPEN:
+            self._open()
+            return
+        failures = _shared(
+            "incr_with_ttl", self._key("failures"), timeout=self.window_seconds)
+        if failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        _shared(
+            "set", self._key("opened_until"),
+            time.time() + self.cooldown_seconds,
+            timeout=self.cooldown_seconds + self.window_seconds,
+        )
+        _shared("delete_many", [self._key("failures"), self._key("probe")])
+        _shared("incr_with_ttl", self._key("trips"), timeout=None)
+        logger.warning(f"Circuit opened for {self.name}")
+
+    def _close(self):
+        _shared("delete_many", [
+            self._key("opened_until"), self._key("failures"),
+            self._key("probe"),
+        ])
+        logger.info(f"Circuit closed for {self.name}")
+
+    def reset(self):
+        _shared("delete_many", [
+            self._key("opened_until"), self._key("failures"),
+            self._key("probe"), self._key("trips"),
+        ])
+
+    def metrics(self) -> dict:
+        return {
+            "state": self.state(),
+            "failures": _shared("get", self._key("failures"), 0),
+            "trips": _shared("get", self._key("trips"), 0),
+        }
+
+
+class TokenBucket:
+    """
+    Shared token bucket: ``rate`` tokens per second, bursts of up to
+    ``capacity``. The refill and take happen in one Redis script so
+    processes cannot overdraw the bucket.
+    """
+
+    KEY_PREFIX = "bucket"
+    _SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local capacity = tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - ts) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, name, rate, capacity):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _take_shared(self):
+        from django_redis import get_redis_connection
+        client = get_redis_connection("default")
+        allowed, _ = client.eval(
+            self._SCRIPT, 1, cache.make_key(f"{self.KEY_PREFIX}:{self.name}"),
+            time.time(), self.rate, self.capacity,
+        )
+        return bool(allowed)
+
+    def _take_local(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def reset(self):
+        """Refills the local fallback bucket and clears the counters."""
+        with self._lock:
+            self._tokens = float(self.capacity)
+            self._updated = time.monotonic()
+        self.rejected = 0
+
+    def try_acquire(self) -> bool:
+        """Takes a token if one is available."""
+        try:
+            allowed = self._take_shared()
+        except Exception:
+            allowed = self._take_local()
+        if not allowed:
+            self.rejected += 1
+        return allowed
+
+    def acquire(self, timeout=0):
+        """
+        Waits up to timeout seconds for a token.
+        raises: RateLimitExceeded if none became available
+        """
+        deadline = time.monotonic() + timeout
+        while not self.try_acquire():
+            if time.monotonic() >= deadline:
+                raise RateLimitExceeded(f"Rate limit reached for {self.name}")
+            time.sleep(min(1 / self.rate, max(deadline - time.monotonic(), 0)))
+
+    async def acquire_async(self, timeout=0):
+        """
+        Async variant of acquire. The Redis round trip of each attempt runs
+        in a worker thread so it does not block the event loop.
+        """
+        import asyncio
+        deadline = time.monotonic() + timeout
+        while not await asyncio.to_thread(self.try_acquire):
+            if time.monotonic() >= deadline:
+                raise RateLimitExceeded(f"Rate limit reached for {self.name}")
+            await asyncio.sleep(
+                min(1 / self.rate, max(deadline - time.monotonic(), 0)))
+
+    def metrics(self) -> dict:
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "rejected": self.rejected,
+        }
@@ -23,4 +23,11 @@ class InvalidAmount(Exception):
 
 
 class PayoutNotFound(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class RateLimitExceeded(Exception):
+    pass
@@ -1,6 +1,15 @@
+import asyncio
+import re
+import threading
+import time
+import httpx
 import requests
 import logging
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.circuit_breaker import CircuitBreaker, TokenBucket
+from utils.exceptions import CircuitOpenError, RateLimitExceeded
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +56,198 @@ if not logger.handlers:
 #         )
 #         return Response(data, status=code)
 
-def pawapay_request(method, endpoint, headers=None, payload=None):
+class PawaPayClient:
+    """
+    Keep-alive HTTP client for the PawaPay API. One pooled
+    ``requests.Session`` is shared by every call, so repeated requests
+    reuse open connections instead of paying a new TCP and TLS handshake.
+    Idempotent GETs and resend-callback calls are retried with backoff on
+    connection errors and gateway failures.
+    """
+
+    CONNECT_TIMEOUT = 3.05
+    READ_TIMEOUT = 10
+    POOL_CONNECTIONS = 4
+    POOL_MAXSIZE = 16
+    MAX_RETRIES = 3
+    BACKOFF_FACTOR = 0.3
+    RETRY_STATUSES = (429, 502, 503, 504)
+    RESEND_CALLBACK_PATH = "/v2/deposits/resend-callback/"
+    # Background sweeps share this budget so they cannot crowd out live
+    # deposits, which are never rate limited
+    BACKGROUND_RATE = 10
+    BACKGROUND_BURST = 20
+    BACKGROUND_WAIT_SECONDS = 5
+    LIVE = "live"
+    BACKGROUND = "background"
+    # Ids in paths are collapsed so counters are kept per endpoint
+    _ID_PATTERN = re.compile(
+        r"/[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}"
+        r"-[0-9a-fA-F]{12}|/\d+(?=/|$)"
+    )
+
+    def __init__(self, base_url=None, api_key=None):
+        self.base_url = base_url or settings.PAWAPAY_BASE_URL
+        self.headers = {
+            "Accept": "application/json",
+            "Authorization": f"Bearer {api_key or settings.PAWAPAY_API_KEY}",
+            "Content-Type": "application/json",
+        }
+        self.session = self._build_session()
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+        self.background_bucket = TokenBucket(
+            "pawapay:background", self.BACKGROUND_RATE, self.BACKGROUND_BURST)
+
+    def _retry(self, methods):
+        return Retry(
+            total=self.MAX_RETRIES,
+            connect=self.MAX_RETRIES,
+            read=self.MAX_RETRIES,
+            backoff_factor=self.BACKOFF_FACTOR,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset(methods),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+
+    def _build_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=self._retry(["GET", "HEAD"]),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # Resending a callback is safe to repeat, unlike creating a deposit
+        session.mount(
+            f"{self.base_url}{self.RESEND_CALLBACK_PATH}",
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=self.POOL_MAXSIZE,
+                max_retries=self._retry(["GET", "HEAD", "POST"]),
+            ),
+        )
+        return session
+
+    def endpoint_name(self, method, endpoint) -> str:
+        """Counter key of a call, e.g. ``GET /v2/deposits/{id}``."""
+        path = endpoint.split("?", 1)[0]
+        return f"{method} {self._ID_PATTERN.sub('/{id}', path)}"
+
+    def _record(self, name, elapsed_ms, failed):
+        with self._stats_lock:
+            stats = self._stats.setdefault(
+                name,
+                {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0},
+            )
+            stats["count"] += 1
+            stats["errors"] += int(failed)
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def stats(self) -> dict:
+        """
+        Latency counters per endpoint since start or the last reset.
+        Returns:
+            dict mapping endpoint to count, errors, avg_ms and max_ms
+        """
+        with self._stats_lock:
+            return {
+                name: {
+                    "count": s["count"],
+                    "errors": s["errors"],
+                    "avg_ms": round(s["total_ms"] / s["count"], 2),
+                    "max_ms": round(s["max_ms"], 2),
+                }
+                for name, s in self._stats.items()
+            }
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats = {}
+
+    def breaker(self, method, endpoint):
+        """The circuit breaker guarding an endpoint."""
+        return CircuitBreaker.for_name(
+            f"pawapay:{self.endpoint_name(method, endpoint)}")
+
+    def is_available(self, method, endpoint) -> bool:
+        """
+        Whether calls to an endpoint may go out: the breaker is closed, or
+        half open and waiting for its probe. Only the request's own guard
+        claims the probe, so this check never consumes it.
+        """
+        return self.breaker(method, endpoint).state() != CircuitBreaker.OPEN
+
+    def metrics(self) -> dict:
+        """
+        Latency counters, breaker state and trip counts, and limiter
+        rejections.
+        """
+        return {
+            "endpoints": self.stats(),
+            "circuit_breakers": {
+                breaker.name: breaker.metrics()
+                for breaker in CircuitBreaker.all()
+                if breaker.name.startswith("pawapay:")
+            },
+            "background_limiter": self.background_bucket.metrics(),
+        }
+
+    def request(self, method, endpoint, headers=None, payload=None,
+                priority=LIVE):
+        """
+        Sends a request to PawaPay over the pooled session.
+        Args:
+            method: HTTP method as a string (e.g., 'GET', 'POST').
+            endpoint: API endpoint string.
+            headers: Optional dictionary of extra headers.
+            payload: Optional dictionary for JSON payload.
+            priority: LIVE for patron-facing calls, BACKGROUND for sweeps
+        Returns:
+            Tuple of (response_data, status_code).
+        Raises:
+            CircuitOpenError if the endpoint's breaker is open.
+            RateLimitExceeded if a background call gets no token in time.
+            requests.exceptions.RequestException on network errors.
+        """
+        request_headers = self.headers
+        if headers:
+            request_headers = {**self.headers, **headers}
+        name = self.endpoint_name(method, endpoint)
+        breaker = self.breaker(method, endpoint)
+        breaker.guard()
+        if priority == self.BACKGROUND:
+            self.background_bucket.acquire(timeout=self.BACKGROUND_WAIT_SECONDS)
+
+        started = time.perf_counter()
+        failed = True
+        try:
+            response = self.session.request(
+                method,
+                f"{self.base_url}{endpoint}",
+                headers=request_headers,
+                json=payload,
+                timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUT),
+            )
+            failed = response.status_code >= 500
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._record(name, elapsed_ms, failed)
+            breaker.record(elapsed_ms, failed=failed)
+        try:
+            return response.json(), response.status_code
+        except ValueError:
+            return response.text, response.status_code
+
+
+pawapay_client = PawaPayClient()
+
+
+def pawapay_request(method, endpoint, headers=None, payload=None,
+                    priority=PawaPayClient.LIVE):
     """
     Utility function to make requests to PawaPay API.
     Args:
@@ -55,44 +255,175 @@ def pawapay_request(method, endpoint, headers=None, payload=None):
         endpoint: API endpoint string.
         headers: Optional dictionary of headers.
         payload: Optional dictionary for JSON payload.
+        priority: PawaPayClient.LIVE or PawaPayClient.BACKGROUND.
     Returns:
         Tuple of ({'data': response_data}, status_code).
     """
-    url = f"{settings.PAWAPAY_BASE_URL}{endpoint}"
-    headers = {
-        "Accept": "application/json",
-        "Authorization": f"Bearer {settings.PAWAPAY_API_KEY}",
-        "Content-Type": "application/json",
-    }
     try:
         if method == "POST" and payload is None:
             raise AttributeError("Payload missing")
-        response = requests.request(
-            method, url, headers=headers, json=payload, timeout=10
-        )
-        try:
-            return response.json(), response.status_code
-        except ValueError:
-            return response.text, response.status_code
+        return pawapay_client.request(
+            method, endpoint, headers=headers, payload=payload,
+            priority=priority)
     except AttributeError:
         return {"status": "BAD_REQUEST"}, 400
+    except CircuitOpenError:
+        return {"status": "SERVICE_UNAVAILABLE"}, 503
+    except RateLimitExceeded:
+        return {"status": "RATE_LIMITED"}, 429
     except requests.exceptions.RequestException as e:
         logger.error(f"PawaPay Request Error: {e}")
         return {"status": "EXTERNAL_ERROR"}, 500
-    except requests.exceptions.ConnectionError:
-        return {"status": "NETWORK_ERROR"}, 500
-
     except Exception as e:
         logger.error(f"Internal Error: {e}")
         return {"status": e}, 500
 
 
-def resend_callback(deposit_id):
+def resend_callback(deposit_id, priority=PawaPayClient.LIVE):
     """Helper function to resend callback for a given deposit id
     Args:
         deposit_id (str): ID of the deposit to resend callback for
+        priority: PawaPayClient.BACKGROUND when called from a sweep
     Returns:
         tuple: (response data, status code) from the callback resend request
     """
-    data, code = pawapay_request("POST", f"/v2/deposits/resend-callback/{deposit_id}")
-    return data, code
\ No newline at end of file
+    data, code = pawapay_request(
+        "POST", f"/v2/deposits/resend-callback/{deposit_id}", payload={},
+        priority=priority)
+    return data, code
+
+
+class AsyncPawaPayClient:
+    """
+    Asyncio counterpart of PawaPayClient for fanning out many calls at
+    once. A semaphore caps the number of requests in flight. Calls share
+    the circuit breakers and the background rate limit of pawapay_client. The
+    underlying ``httpx.AsyncClient`` is bound to the running event loop,
+    so use the client as an async context manager inside ``asyncio.run``.
+    Breaker and limiter state lives in Redis behind blocking calls, so
+    those run in worker threads instead of stalling the event loop.
+    """
+
+    MAX_CONCURRENCY = 10
+
+    def __init__(self, base_url=None, api_key=None,
+                 max_concurrency=None, transport=None):
+        self.base_url = base_url or settings.PAWAPAY_BASE_URL
+        self.headers = {
+            "Accept": "application/json",
+            "Authorization": f"Bearer {api_key or settings.PAWAPAY_API_KEY}",
+            "Content-Type": "application/json",
+        }
+        self.max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+        self.transport = transport
+        self._client = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        transport = self.transport or httpx.AsyncHTTPTransport(
+            retries=PawaPayClient.MAX_RETRIES)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            transport=transport,
+            timeout=httpx.Timeout(
+                PawaPayClient.READ_TIMEOUT,
+                connect=PawaPayClient.CONNECT_TIMEOUT,
+            ),
+            limits=httpx.Limits(max_connections=self.max_concurrency),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+        self._client = None
+
+    async def request(self, method, endpoint, headers=None, payload=None):
+        """
+        Async version of pawapay_request, with the same error mapping.
+        Args:
+            method: HTTP method as a string (e.g., 'GET', 'POST').
+            endpoint: API endpoint string.
+            headers: Optional dictionary of extra headers.
+            payload: Optional dictionary for JSON payload.
+        Returns:
+            Tuple of (response_data, status_code).
+        """
+        if method == "POST" and payload is None:
+            return {"status": "BAD_REQUEST"}, 400
+        breaker = pawapay_client.breaker(method, endpoint)
+        try:
+            await asyncio.to_thread(breaker.guard)
+            await pawapay_client.background_bucket.acquire_async(
+                timeout=PawaPayClient.BACKGROUND_WAIT_SECONDS)
+        except CircuitOpenError:
+            return {"status": "SERVICE_UNAVAILABLE"}, 503
+        except RateLimitExceeded:
+            return {"status": "RATE_LIMITED"}, 429
+
+        started = time.perf_counter()
+        failed = True
+        try:
+            async with self._semaphore:
+                response = await self._client.request(
+                    method, endpoint, headers=headers, json=payload)
+            failed = response.status_code >= 500
+        except httpx.HTTPError as e:
+            logger.error(f"PawaPay Request Error: {e}")
+            return {"status": "EXTERNAL_ERROR"}, 500
+        finally:
+            await asyncio.to_thread(
+                breaker.record,
+                (time.perf_counter() - started) * 1000, failed=failed)
+        try:
+            return response.json(), response.status_code
+        except ValueError:
+            return response.text, response.status_code
+
+    async def resend_callback(self, deposit_id):
+        """Async version of resend_callback."""
+        return await self.request(
+            "POST", f"/v2/deposits/resend-callback/{deposit_id}", payload={})
+
+    async def get_deposit(self, deposit_id):
+        """Fetch one deposit; returns (response_data, status_code)."""
+        return await self.request("GET", f"/v2/deposits/{deposit_id}")
+
+
+async def _gather(method_name, ids, **client_kwargs):
+    async with AsyncPawaPayClient(**client_kwargs) as client:
+        method = getattr(client, method_name)
+        results = await asyncio.gather(*(method(str(i)) for i in ids))
+    return dict(zip([str(i) for i in ids], results))
+
+
+def fetch_deposit_statuses(ids, **client_kwargs):
+    """
+    Fetch many deposits from PawaPay concurrently. Safe to call from
+    synchronous code such as Celery tasks and management commands.
+    Args:
+        ids: iterable of deposit ids
+        client_kwargs: optional AsyncPawaPayClient arguments
+    Returns:
+        dict: deposit id (str) -> (response data, status code)
+    """
+    ids = list(ids)
+    if not ids:
+        return {}
+    return asyncio.run(_gather("get_deposit", ids, **client_kwargs))
+
+
+def resend_callbacks(ids, **client_kwargs):
+    """
+    Ask PawaPay to resend the callbacks of many deposits concurrently.
+    Args:
+        ids: iterable of deposit ids
+        client_kwargs: optional AsyncPawaPayClient arguments
+    Returns:
+        dict: deposit id (str) -> (response data, status code)
+    """
+    ids = list(ids)
+    if not ids:
+        return {}
+    return asyncio.run(_gather("resend_callback", ids, **client_kwargs))
@@ -0,0 +1,170 @@
+"""
+Idempotency-Key support for unsafe API endpoints. The first request with a
+key runs the view and its final response is stored for 24h together with
+a fingerprint of the request; repeats with the same key from the same
+caller get that response back instead of running the view again.
+
+Responses live only in the cache. If one is evicted before the 24h are up,
+a retry with the same key runs the view again, which for deposits means a
+second payment.
+"""
+import functools
+import hashlib
+import json
+import time
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+IDEMPOTENCY_HEADER = "HTTP_IDEMPOTENCY_KEY"
+
+
+class IdempotencyStore:
+    TTL_SECONDS = 24 * 60 * 60
+    LOCK_SECONDS = 30
+    # How long a concurrent duplicate waits for the first request
+    WAIT_SECONDS = 10
+    POLL_SECONDS = 0.1
+    MAX_KEY_LENGTH = 255
+    KEY_PREFIX = "idempotency"
+
+    @staticmethod
+    def fingerprint(request, **kwargs) -> str:
+        """
+        Hash identifying the request body and URL arguments.
+        args:
+            request: the DRF request
+            kwargs: the view's URL arguments
+        returns: hex digest
+        """
+        body = json.dumps(
+            {"path": request.path, "kwargs": kwargs, "data": request.data},
+            sort_keys=True, default=str,
+        )
+        return hashlib.sha256(body.encode()).hexdigest()
+
+    @staticmethod
+    def scope(name, request) -> str:
+        """
+        Scopes keys to the caller, so clients sending the same key never
+        get each other's responses.
+        args:
+            name: namespace of the endpoint, e.g. "deposit"
+            request: the request, identified by its API client plus the
+            signed in user, or the client IP for guests
+        returns: the scope to store the key under
+        """
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            caller = f"user:{user.pk}"
+        else:
+            caller = f"ip:{BaseThrottle().get_ident(request)}"
+        client = getattr(request, "client", None)
+        raw = f"{getattr(client, 'pk', '')}|{caller}"
+        return f"{name}:{hashlib.sha256(raw.encode()).hexdigest()[:32]}"
+
+    @staticmethod
+    def _key(scope, key, suffix):
+        return f"{IdempotencyStore.KEY_PREFIX}:{scope}:{key}:{suffix}"
+
+    @staticmethod
+    def get(scope, key):
+        return cache.get(IdempotencyStore._key(scope, key, "response"))
+
+    @staticmethod
+    def save(scope, key, fingerprint, response):
+        cache.set(
+            IdempotencyStore._key(scope, key, "response"),
+            {
+                "fingerprint": fingerprint,
+                "status": response.status_code,
+                "data": response.data,
+            },
+            timeout=IdempotencyStore.TTL_SECONDS,
+        )
+
+    @staticmethod
+    def lock(scope, key) -> bool:
+        return cache.add(
+            IdempotencyStore._key(scope, key, "lock"), 1,
+            timeout=IdempotencyStore.LOCK_SECONDS)
+
+    @staticmethod
+    def unlock(scope, key):
+        cache.delete(IdempotencyStore._key(scope, key, "lock"))
+
+    @staticmethod
+    def wait(scope, key):
+        """
+        Waits for the in-flight request holding the key to finish.
+        returns: its stored response, or None if it did not finish in time
+        """
+        deadline = time.monotonic() + IdempotencyStore.WAIT_SECONDS
+        while time.monotonic() < deadline:
+            stored = IdempotencyStore.get(scope, key)
+            if stored is not None:
+                return stored
+            if IdempotencyStore.lock(scope, key):
+                # The first request gave up without a final response
+                IdempotencyStore.unlock(scope, key)
+                return None
+            time.sleep(IdempotencyStore.POLL_SECONDS)
+        return None
+
+
+def _error(error, code):
+    return Response({"status": "failed", "error": error}, status=code)
+
+
+def _replay(stored, fingerprint):
+    if stored["fingerprint"] != fingerprint:
+        return _error("idempotency_key_reused", status.HTTP_422_UNPROCESSABLE_ENTITY)
+    response = Response(stored["data"], status=stored["status"])
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(name):
+    """
+    Makes an APIView method honour the ``Idempotency-Key`` header.
+    Requests without the header run as before. Server errors (5xx) are
+    not stored, so the client can retry them with the same key.
+    args:
+        name: namespace for the keys, e.g. the endpoint name
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            key = request.META.get(IDEMPOTENCY_HEADER)
+            if not key:
+                return method(self, request, *args, **kwargs)
+            if len(key) > IdempotencyStore.MAX_KEY_LENGTH:
+                return _error(
+                    "invalid_idempotency_key", status.HTTP_400_BAD_REQUEST)
+            scope = IdempotencyStore.scope(name, request)
+
+            fingerprint = IdempotencyStore.fingerprint(request, **kwargs)
+            stored = IdempotencyStore.get(scope, key)
+            if stored is not None:
+                return _replay(stored, fingerprint)
+
+            if not IdempotencyStore.lock(scope, key):
+                stored = IdempotencyStore.wait(scope, key)
+                if stored is not None:
+                    return _replay(stored, fingerprint)
+                return _error("request_in_progress", status.HTTP_409_CONFLICT)
+
+            try:
+                # Stored between our check and taking the lock
+                stored = IdempotencyStore.get(scope, key)
+                if stored is not None:
+                    return _replay(stored, fingerprint)
+                response = method(self, request, *args, **kwargs)
+                if response.status_code < 500:
+                    IdempotencyStore.save(scope, key, fingerprint, response)
+                return response
+            finally:
+                IdempotencyStore.unlock(scope, key)
+        return wrapper
+    return decorator
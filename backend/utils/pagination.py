@@ -0,0 +1,140 @@
+"""
+Keyset (cursor) pagination for append-only tables such as the wallet
+ledger. Pages are located by the (created_at, id) of the last row seen,
+so deep pages cost the same as the first one and no OFFSET scan is needed.
+"""
+import base64
+import binascii
+import uuid
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Newest-first pagination keyed on (created_at, id), for UUID keyed
+    models.
+
+    Enabled per request with ``?cursor=`` (first page) or
+    ``?paginate=cursor``; other requests keep using the view's regular
+    paginator. Pass ``count=false`` to skip the COUNT(*) query.
+
+    Also accepts a list of querysets over tables sharing the key, such as
+    the hot and archived ledger: each is read with the same keyset filter
+    and LIMIT, and the pages are merged.
+    """
+
+    cursor_query_param = "cursor"
+    mode_query_param = "paginate"
+    count_query_param = "count"
+    limit_query_param = "limit"
+    default_limit = 10
+    max_limit = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    @classmethod
+    def is_requested(cls, request) -> bool:
+        """Whether the request asks for cursor pagination."""
+        params = request.query_params
+        return (
+            cls.cursor_query_param in params
+            or params.get(cls.mode_query_param) == "cursor"
+        )
+
+    def get_limit(self, request) -> int:
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def encode_cursor(self, obj, reverse=False) -> str:
+        raw = f"{'p' if reverse else 'n'}|{obj.created_at.isoformat()}|{obj.pk}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request):
+        """Returns (reverse, created_at, id) or None for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode()).decode()
+            direction, created_at, pk = raw.split("|")
+            created_at = parse_datetime(created_at)
+            pk = uuid.UUID(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if direction not in ("n", "p") or created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return direction == "p", created_at, pk
+
+    @staticmethod
+    def _seek(queryset, cursor):
+        """Filters and orders a queryset to the rows after the cursor."""
+        if cursor is None:
+            return queryset.order_by("-created_at", "-id")
+        reverse, created_at, pk = cursor
+        if reverse:
+            return queryset.filter(
+                Q(created_at__gt=created_at)
+                | Q(created_at=created_at, id__gt=pk)
+            ).order_by("created_at", "id")
+        return queryset.filter(
+            Q(created_at__lt=created_at)
+            | Q(created_at=created_at, id__lt=pk)
+        ).order_by("-created_at", "-id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        querysets = (
+            queryset if isinstance(queryset, (list, tuple)) else [queryset])
+        self.count = None
+        if request.query_params.get(self.count_query_param) != "false":
+            self.count = sum(qs.count() for qs in querysets)
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[0]
+
+        # One extra row tells whether there is another page
+        rows = []
+        for qs in querysets:
+            rows += self._seek(qs, cursor)[:self.limit + 1]
+        if len(querysets) > 1:
+            rows.sort(
+                key=lambda obj: (obj.created_at, obj.pk), reverse=not reverse)
+            rows = rows[:self.limit + 1]
+        has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+        if reverse:
+            rows.reverse()
+
+        self.next_cursor = None
+        self.previous_cursor = None
+        if rows:
+            if has_more or reverse:
+                self.next_cursor = self.encode_cursor(rows[-1])
+            if (has_more and reverse) or (cursor is not None and not reverse):
+                self.previous_cursor = self.encode_cursor(rows[0], reverse=True)
+        return rows
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        payload = {
+            "next": self.get_link(self.next_cursor),
+            "previous": self.get_link(self.previous_cursor),
+            "results": data,
+        }
+        if self.count is not None:
+            payload = {"count": self.count, **payload}
+        return Response(payload)
@@ -283,22 +283,13 @@ def send_daily_weekly_summary_email(wallet, period='daily'):
             start_date = now - timedelta(days=1)
             period_label = "Custom Period"
         
-        # Get transactions for the period
-        transactions = wallet.transactions.filter(
-            created_at__gte=start_date,
-            transaction_type='CASH_IN',
-            status='COMPLETED'
-        )
-        
-        # Calculate statistics
-        total_earnings = Decimal('0.00')
-        total_tips = 0
-        total_fees = Decimal('0.00')
-        
-        for transaction in transactions:
-            total_earnings += transaction.amount
-            total_fees += transaction.fee
-            total_tips += 1
+        # Sum the daily rollups covering the period
+        from apps.wallets.services.wallet_services import WalletRollupService
+        totals = WalletRollupService.get_totals(
+            wallet, since=timezone.localdate(start_date))
+        total_earnings = totals["cash_in"]
+        total_tips = totals["tip_count"]
+        total_fees = totals["fees"]
         
         average_tip = total_earnings / total_tips if total_tips > 0 else Decimal('0.00')
         
@@ -308,6 +299,8 @@ def send_daily_weekly_summary_email(wallet, period='daily'):
             wallet=wallet,
             created_at__gte=start_date,
             status__in=['completed', 'captured']
+        ).only(
+            'patron_name', 'amount', 'currency', 'created_at'
         ).order_by('-created_at')[:5]
         
         subject = f"TipZed Summary: Your {period_label} Earnings"